@@ -0,0 +1 @@
+"""Camada de serviços do Detective da Ajuda — Clínico (sem dependência de Streamlit)."""
@@ -0,0 +1,98 @@
+"""
+Evolução do paciente ao longo das sessões (seção "Evolução" dos Relatórios).
+
+Tudo vetorizado sobre o DataFrame de q.CLIENT_ATTEMPTS (df_att): um groupby
+por sessão, rolling sobre as sessões e um melt/groupby para as curvas de
+perguntas de condução — sem laço Python por tentativa. Os resultados ficam
+no clinic.report_cache na mesma chave (paciente, versão) do df_att.
+
+- session_trends:     médias por sessão (domínios em % do máximo, total,
+                      dicas, condução) + média móvel de ROLLING_WINDOW sessões;
+- domain_slopes:      inclinação (pontos percentuais por sessão) de cada domínio;
+- prompt_dependence:  total médio por nº de perguntas de condução usadas
+                      (🟢/🟡/🔴), de 0 a PROMPT_CAP+ usos.
+"""
+import numpy as np
+import pandas as pd
+
+from clinic.summary import DOMAINS
+from clinic.writer import SCORE_RANGES
+
+ROLLING_WINDOW = 5
+PROMPTS = ("prompts_green", "prompts_yellow", "prompts_red")
+PROMPT_LABELS = {"prompts_green": "🟢 neutras", "prompts_yellow": "🟡 direcionadoras", "prompts_red": "🔴 modelagem"}
+PROMPT_CAP = 3
+DOMAIN_LABELS = {
+    "detection": "Detecção", "clues": "Pistas", "cog_empathy": "Empatia cognitiva",
+    "action": "Ação", "communication": "Comunicação", "safety": "Segurança", "total": "Total",
+}
+
+# máximo de cada domínio (para comparar domínios de escalas diferentes)
+DOMAIN_MAX = pd.Series({d: SCORE_RANGES[d][1] for d in DOMAINS})
+TOTAL_MAX = int(DOMAIN_MAX.sum())
+
+
+def session_trends(df: pd.DataFrame, window: int = ROLLING_WINDOW) -> pd.DataFrame:
+    """
+    Uma linha por sessão, em ordem cronológica (created_at, empate por id;
+    índice 1..n). Domínios e total em % do máximo; "pct_conducao" = % das
+    tentativas com alguma pergunta de condução. Colunas "*_movel" = média móvel de `window` sessões.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    prompts = df[list(PROMPTS)].fillna(0)
+    work = pd.DataFrame({
+        "session_id": df["session_id"].to_numpy(),
+        **{d: df[d].to_numpy() / DOMAIN_MAX[d] * 100 for d in DOMAINS},
+        "total": df["total"].to_numpy() / TOTAL_MAX * 100,
+        "hint_level": df["hint_level"].to_numpy(),
+        "pct_conducao": (prompts.to_numpy().sum(axis=1) > 0) * 100.0,
+        "prompts_red": prompts["prompts_red"].to_numpy(),
+    })
+    g = work.groupby("session_id", sort=True)
+    per = g.mean()
+    per.insert(0, "n_tentativas", g.size())
+    meta = df.groupby("session_id", sort=True)[["created_at", "mode"]].first()
+    per.insert(0, "modo", meta["mode"])
+    per.insert(0, "data", meta["created_at"].str.slice(0, 10))
+    # ordem de created_at, não de id: sessões importadas (writer.bulk_import) são antigas com ids novos
+    order = meta.reset_index().sort_values(["created_at", "session_id"])["session_id"]
+    per = per.loc[order]
+
+    values = [*DOMAINS, "total", "pct_conducao"]
+    rolling = per[values].rolling(window, min_periods=1).mean().add_suffix("_movel")
+    out = pd.concat([per, rolling], axis=1).reset_index()
+    out.index = pd.RangeIndex(1, len(out) + 1, name="sessão")
+    return out
+
+
+def trend_chart(trends: pd.DataFrame) -> pd.DataFrame:
+    """Médias móveis dos domínios e do total, com rótulos em português (st.line_chart)."""
+    cols = [*DOMAINS, "total"]
+    return trends[[f"{c}_movel" for c in cols]].set_axis([DOMAIN_LABELS[c] for c in cols], axis=1)
+
+
+def domain_slopes(trends: pd.DataFrame) -> pd.DataFrame:
+    """Reta de mínimos quadrados por domínio (todas de uma vez: polyfit em matriz)."""
+    cols = [*DOMAINS, "total"]
+    if len(trends) < 2:
+        return pd.DataFrame({"domínio": [DOMAIN_LABELS[c] for c in cols], "pp_por_sessao": np.nan})
+    x = np.arange(len(trends), dtype=float)
+    slope, _ = np.polyfit(x, trends[cols].to_numpy(dtype=float), 1)
+    return pd.DataFrame({"domínio": [DOMAIN_LABELS[c] for c in cols], "pp_por_sessao": slope})
+
+
+def prompt_dependence(df: pd.DataFrame, cap: int = PROMPT_CAP) -> pd.DataFrame:
+    """
+    Total médio (% do máximo) por nº de usos de cada tipo de pergunta de
+    condução; índice = usos (0..cap, o último é "cap ou mais"), colunas = tipo.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    long = df[["total", *PROMPTS]].melt(id_vars="total", var_name="tipo", value_name="usos")
+    long["usos"] = long["usos"].fillna(0).clip(upper=cap).astype(int)
+    curve = long.groupby(["usos", "tipo"])["total"].mean().unstack("tipo") / TOTAL_MAX * 100
+    curve = curve.reindex(index=range(cap + 1), columns=list(PROMPTS)).rename(columns=PROMPT_LABELS)
+    curve.index = [str(i) if i < cap else f"{cap}+" for i in curve.index]
+    curve.index.name = "usos na tentativa"
+    return curve
@@ -0,0 +1,176 @@
+"""
+Calibração empírica das cartas a partir das tentativas de todos os pacientes.
+
+Modelo por carta (mínimos quadrados), com dicas e condução como covariáveis:
+
+    nota = b0 + b1·habilidade + b2·nível de dicas + b3·perguntas de condução
+
+- nota:        total da tentativa em fração do máximo (0–1);
+- habilidade:  média das notas do paciente ANTES desta tentativa, puxada para
+               PRIOR_MEAN com peso de PRIOR_WEIGHT tentativas (e centrada nele);
+- difficulty:      1 − nota esperada de um paciente de habilidade média da
+                   clínica, sem dicas nem condução;
+- discrimination:  b1 — o quanto a nota na carta acompanha a habilidade;
+- hint_effect / prompt_effect: b2 / b3 (fração do máximo por nível / pergunta).
+
+O ajuste só depende de X'X, X'y e y'y de cada carta — somas. card_calibration
+guarda essas somas (stats) e calibration_ability a contagem/soma de cada
+paciente; calibrate() lê só as tentativas com id acima da marca d'água
+(calibration_state), soma a contribuição delas com NumPy (sem laço por
+tentativa) e resolve os sistemas 4×4 de todas as cartas de uma vez. O custo
+acompanha o número de tentativas novas, não o histórico.
+
+calibrate() não faz commit (como clinic.summary): tools/calibrate_cards.py e
+o job periódico do app (ui.writes.get_calibrator) rodam um lote por transação.
+A Sessão só lê card_calibration pronta (ui.cards.get_calibration).
+"""
+from datetime import datetime
+
+import numpy as np
+
+from clinic import queries as q
+from clinic.summary import DOMAINS
+from clinic.writer import SCORE_RANGES
+
+TOTAL_MAX = sum(SCORE_RANGES[d][1] for d in DOMAINS)
+
+BATCH = 50_000          # tentativas por transação (o escritor único fica livre entre lotes)
+PRIOR_MEAN = 0.5        # habilidade de quem ainda não tem tentativas
+PRIOR_WEIGHT = 5.0
+RIDGE = 1e-3            # só para o sistema ser inversível (ex.: carta sempre jogada sem dicas)
+MIN_ATTEMPTS = 30       # abaixo disso os coeficientes ficam NULL ("poucos dados")
+_IN_CHUNK = 500
+
+N_FEATURES = 4                                  # 1, habilidade, dicas, condução
+_IU = np.triu_indices(N_FEATURES)
+N_STATS = len(_IU[0]) + N_FEATURES + 1          # X'X (triângulo superior) + X'y + y'y
+_STATS_DTYPE = "<f8"
+
+
+# =========================
+# Lote incremental (sem commit: transação de quem chama)
+# =========================
+def get_watermark(conn) -> int:
+    """Última tentativa já incorporada (versão da calibração para caches)."""
+    row = conn.execute(q.CALIBRATION_STATE).fetchone()
+    return row[0] if row else 0
+
+
+def calibrate(conn, batch: int = BATCH) -> int:
+    """Incorpora até `batch` tentativas novas. Retorna quantas (menos que batch = em dia)."""
+    rows = conn.execute(q.CALIBRATION_NEW_ATTEMPTS, (get_watermark(conn), batch)).fetchall()
+    if not rows:
+        return 0
+    data = np.array(rows, dtype=np.float64)
+    clients = data[:, 1].astype(np.int64)
+    cards = data[:, 2].astype(np.int64)
+    y = data[:, 3] / TOTAL_MAX
+
+    ability, per_client = _abilities(conn, clients, y)
+    x = np.column_stack([np.ones_like(y), ability, data[:, 4], data[:, 5]])
+    card_ids, stats = _card_stats(cards, x, y)
+
+    now = datetime.now().isoformat(timespec="seconds")
+    _store(conn, card_ids, stats, now)
+    conn.executemany(q.UPSERT_CALIBRATION_ABILITY, per_client)
+    conn.execute(q.SET_CALIBRATION_STATE, (int(data[-1, 0]), now))
+    return len(rows)
+
+
+def rebuild(conn):
+    """Zera a calibração; as próximas rodadas de calibrate() refazem tudo (reparo)."""
+    for table in ("card_calibration", "calibration_ability", "calibration_state"):
+        conn.execute(f"DELETE FROM {table}")
+
+
+def _abilities(conn, clients, y):
+    """
+    Habilidade de cada tentativa (média anterior do paciente, com prior) e as
+    linhas (paciente, n, soma) a somar em calibration_ability.
+    """
+    # ordenação estável: dentro do paciente as tentativas seguem a ordem dos ids
+    order = np.argsort(clients, kind="stable")
+    c, yy = clients[order], y[order]
+    start = np.r_[True, c[1:] != c[:-1]]
+    first = np.flatnonzero(start)
+    group = np.cumsum(start) - 1
+    csum = np.cumsum(yy)
+    before_sum = csum - yy - (csum[first] - yy[first])[group]
+    before_n = np.arange(len(c)) - first[group]
+
+    uniq = c[first]
+    prior_n, prior_sum = _prior(conn, uniq)
+    n = prior_n[group] + before_n
+    s = prior_sum[group] + before_sum
+    ability = np.empty_like(y)
+    ability[order] = (s + PRIOR_MEAN * PRIOR_WEIGHT) / (n + PRIOR_WEIGHT) - PRIOR_MEAN
+
+    counts = np.diff(np.r_[first, len(c)])
+    sums = np.add.reduceat(yy, first)
+    return ability, list(zip(uniq.tolist(), counts.tolist(), sums.tolist()))
+
+
+def _prior(conn, client_ids):
+    """(n, soma) já acumulados de cada paciente do lote; zeros para quem é novo."""
+    known = {}
+    ids = client_ids.tolist()
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i:i + _IN_CHUNK]
+        sql = q.CALIBRATION_ABILITY.format(marks=",".join("?" * len(chunk)))
+        known.update((cid, (n, s)) for cid, n, s in conn.execute(sql, chunk))
+    prior = np.array([known.get(cid, (0, 0.0)) for cid in ids], dtype=np.float64).reshape(-1, 2)
+    return prior[:, 0], prior[:, 1]
+
+
+def _card_stats(cards, x, y):
+    """Somas de X'X, X'y e y'y por carta: uma bincount por coluna."""
+    card_ids, inv = np.unique(cards, return_inverse=True)
+    cols = np.column_stack([x[:, _IU[0]] * x[:, _IU[1]], x * y[:, None], y * y])
+    stats = np.stack([np.bincount(inv, weights=col, minlength=len(card_ids)) for col in cols.T], axis=1)
+    return card_ids, stats
+
+
+# =========================
+# Ajuste (todas as cartas de uma vez)
+# =========================
+def _store(conn, card_ids, batch_stats, now: str):
+    """Soma o lote às estatísticas gravadas e reajusta todas as cartas."""
+    totals = {cid: np.frombuffer(blob, dtype=_STATS_DTYPE) for cid, blob in conn.execute(q.CALIBRATION_STATS)}
+    for cid, row in zip(card_ids.tolist(), batch_stats):
+        totals[cid] = totals[cid] + row if cid in totals else row
+    ids = sorted(totals)
+    stats = np.stack([totals[cid] for cid in ids])
+    fit = solve(stats)
+
+    rows = []
+    for i, cid in enumerate(ids):
+        n = int(round(fit["n"][i]))
+        coef = (None,) * 4 if n < MIN_ATTEMPTS else tuple(
+            float(fit[k][i]) for k in ("difficulty", "discrimination", "hint_effect", "prompt_effect"))
+        rows.append((cid, n, float(fit["mean_score"][i]), *coef,
+                     stats[i].astype(_STATS_DTYPE).tobytes(), now))
+    conn.executemany(q.REPLACE_CARD_CALIBRATION, rows)
+
+
+def solve(stats: np.ndarray) -> dict:
+    """stats (cartas × N_STATS) → arrays n, mean_score e coeficientes, por carta."""
+    k = len(stats)
+    xtx = np.zeros((k, N_FEATURES, N_FEATURES))
+    upper = stats[:, :len(_IU[0])]
+    xtx[:, _IU[0], _IU[1]] = upper
+    xtx[:, _IU[1], _IU[0]] = upper
+    xty = stats[:, len(_IU[0]):len(_IU[0]) + N_FEATURES]
+    n = xtx[:, 0, 0]
+
+    ridge = np.diag([0.0] + [RIDGE] * (N_FEATURES - 1))
+    beta = np.linalg.solve(xtx + ridge, xty[..., None])[..., 0]
+    # habilidade média da clínica (todas as tentativas de todas as cartas)
+    ability = xtx[:, 0, 1].sum() / n.sum()
+    return {
+        "n": n,
+        "mean_score": xty[:, 0] / n,
+        "difficulty": 1 - np.clip(beta[:, 0] + beta[:, 1] * ability, 0, 1),
+        "discrimination": beta[:, 1],
+        "hint_effect": beta[:, 2],
+        "prompt_effect": beta[:, 3],
+    }
@@ -0,0 +1,225 @@
+"""
+Conteúdo clínico por carta (1–50), mantido à mão: sobrepõe as pistas,
+ação-alvo e frase-alvo do cards.json e define as categorias de tag.
+Lido por clinic.catalog ao compilar o catálogo.
+"""
+
+# =========================
+# ✅ Overrides (1–50): pistas + ação-alvo + frase-alvo
+# =========================
+CARD_SUPPORT = {
+    1:  {"clues": ["poça no chão", "expressão preocupada", "pano faltando"],
+         "action": "Oferecer pano/papel e sinalizar o chão para evitar escorregões",
+         "phrase": "Caiu água. Quer ajuda pra limpar?"},
+    2:  {"clues": ["choro", "procura com olhos/mãos", "fala repetida"],
+         "action": "Acolher, perguntar o que houve e ajudar a buscar",
+         "phrase": "Você perdeu? Vamos procurar juntos?"},
+    3:  {"clues": ["sacolas grandes", "postura curvada", "passos lentos"],
+         "action": "Oferecer carregar uma sacola e abrir a porta",
+         "phrase": "Posso pegar essa sacola?"},
+    4:  {"clues": ["revira bolsos", "tensão", "fala “cadê?”"],
+         "action": "Organizar a busca (lugares prováveis) e ajudar a procurar",
+         "phrase": "Quer que eu procure também?"},
+    5:  {"clues": ["“ai”", "mão no local", "careta"],
+         "action": "Colocar em água corrente fria e chamar um adulto",
+         "phrase": "Vamos pôr na água. Vou chamar um adulto."},
+    6:  {"clues": ["estica braço", "sobe em cadeira", "risco de cair"],
+         "action": "Ajudar de forma segura para prevenir queda",
+         "phrase": "Quer que eu pegue pra você?"},
+    7:  {"clues": ["olhar baixo", "silêncio", "ombros caídos"],
+         "action": "Checar como está e oferecer presença/apoio",
+         "phrase": "Você tá triste? Quer um abraço ou ficar junto?"},
+    8:  {"clues": ["espirros", "desconforto", "procura lenço"],
+         "action": "Oferecer lenço/ajuda prática e avisar responsável se necessário",
+         "phrase": "Quer um lenço? Vou buscar."},
+    9:  {"clues": ["olhos fechados", "luz incomoda", "irritação"],
+         "action": "Reduzir estímulos e oferecer água/pausa",
+         "phrase": "Quer água e silêncio?"},
+    10: {"clues": ["coleira presa/enroscada", "animal agitado/assustado"],
+         "action": "Chamar um adulto/dono e soltar com cuidado, sem assustar",
+         "phrase": "Vou chamar um adulto pra ajudar o bichinho."},
+
+    11: {"clues": ["itens no chão", "pressa", "constrangimento"],
+         "action": "Ajudar a recolher e aliviar a vergonha (sinalizar se corredor cheio)",
+         "phrase": "Eu pego esses!"},
+    12: {"clues": ["olha mapa", "hesita", "pergunta"],
+         "action": "Orientar e acompanhar até a sala/local correto",
+         "phrase": "Você procura qual sala? Eu te mostro."},
+    13: {"clues": ["olhar confuso", "apaga muito", "trava"],
+         "action": "Ajudar por etapas (mostrar o primeiro passo) e/ou chamar professor",
+         "phrase": "Quer que eu mostre o primeiro passo?"},
+    14: {"clues": ["sozinho", "olhando grupo", "sem atividade"],
+         "action": "Convidar para algo simples com opção (sem pressionar)",
+         "phrase": "Quer brincar com a gente?"},
+    15: {"clues": ["pilha alta", "dificuldade de ver", "passos lentos"],
+         "action": "Segurar porta e levar parte dos livros",
+         "phrase": "Quer que eu segure a porta?"},
+    16: {"clues": ["cadarço arrastando"],
+         "action": "Avisar rapidamente para evitar queda (sem tocar)",
+         "phrase": "Seu cadarço soltou."},
+    17: {"clues": ["vítima recua", "cara triste", "grupo rindo"],
+         "action": "Proteger a vítima e chamar um adulto/professora com segurança",
+         "phrase": "Vem comigo. Vou chamar a professora."},
+    18: {"clues": ["olha comida", "vergonha", "fala baixa"],
+         "action": "Ajudar sem humilhar (compartilhar se possível e acionar adulto)",
+         "phrase": "Quer um pouco do meu? Vamos falar com a tia."},
+    19: {"clues": ["poça grande", "risco de escorregar"],
+         "action": "Sinalizar/avisar e buscar pano/limpeza (segurança primeiro)",
+         "phrase": "Cuidado! Vou chamar um adulto."},
+    20: {"clues": ["tensão", "respiração rápida", "mãos nos ouvidos"],
+         "action": "Co-regular e levar para ambiente mais calmo, chamando suporte se necessário",
+         "phrase": "Vamos pra um lugar quietinho?"},
+
+    21: {"clues": ["objeto no chão", "pessoa procura"],
+         "action": "Pegar e devolver imediatamente",
+         "phrase": "Caiu isso aqui!"},
+    22: {"clues": ["passos lentos", "bengala", "insegurança"],
+         "action": "Pedir consentimento e ajudar a atravessar com segurança",
+         "phrase": "Quer ajuda pra atravessar?"},
+    23: {"clues": ["obstáculo na rampa", "hesitação"],
+         "action": "Remover obstáculo/liberar rota acessível",
+         "phrase": "Tem coisa na rampa. Quer que eu tire?"},
+    24: {"clues": ["esforço", "degrau alto", "porta pesada"],
+         "action": "Oferecer ajuda seguindo instruções da pessoa responsável",
+         "phrase": "Quer que eu segure a porta?"},
+    25: {"clues": ["lágrimas", "encolhida", "isolada"],
+         "action": "Oferecer ajuda com cuidado e checar segurança",
+         "phrase": "Você quer ajuda? Quer que eu chame alguém?"},
+    26: {"clues": ["assustada", "procura adulto"],
+         "action": "Acionar segurança/funcionário e ficar junto (não levar sozinho)",
+         "phrase": "Vamos achar um adulto que trabalha aqui."},
+    27: {"clues": ["sem dono por perto", "perto da rua", "agitado"],
+         "action": "Evitar susto e buscar o dono/ajuda para afastar do perigo",
+         "phrase": "De quem é o cachorro? Cuidado!"},
+    28: {"clues": ["caixa tampa visão", "passos incertos"],
+         "action": "Abrir porta e orientar caminho removendo obstáculos",
+         "phrase": "Quer que eu abra a porta?"},
+    29: {"clues": ["sacola rasga", "itens rolam", "vergonha"],
+         "action": "Checar se machucou e ajudar a recolher",
+         "phrase": "Você tá bem? Eu ajudo a pegar."},
+    30: {"clues": ["franze testa", "aproxima o rosto"],
+         "action": "Ajudar a ler/interpretar com calma e apontar informação",
+         "phrase": "Quer que eu leia pra você?"},
+
+    31: {"clues": ["balança em pé", "idoso/gestante", "olhar cansado"],
+         "action": "Ceder lugar e facilitar segurança",
+         "phrase": "Quer sentar aqui?"},
+    32: {"clues": ["esforço", "paradas", "degraus"],
+         "action": "Ajudar com a mala de forma segura (um lado) ou chamar funcionário",
+         "phrase": "Quer ajuda com a mala?"},
+    33: {"clues": ["desequilíbrio", "bengala no chão"],
+         "action": "Pegar e devolver rapidamente, checando se está bem",
+         "phrase": "Sua bengala caiu!"},
+    34: {"clues": ["tenta repetidas vezes", "fila cresce"],
+         "action": "Chamar funcionário/suporte oficial para evitar constrangimento",
+         "phrase": "Quer que eu chame um moço?"},
+    35: {"clues": ["objeto no chão atrás", "pessoa não percebe"],
+         "action": "Avisar e devolver discretamente",
+         "phrase": "Caiu sua carteira!"},
+    36: {"clues": ["olha ao redor", "pausa", "vergonha"],
+         "action": "Resolver com discrição (chamar garçom/pegar outro)",
+         "phrase": "Quer outro talher?"},
+    37: {"clues": ["puxa repetido", "ansiedade"],
+         "action": "Orientar com calma e indicar outra cabine",
+         "phrase": "Tá ocupado. Tem outro ali."},
+    38: {"clues": ["bilhete na mão", "hesita", "atrapalha passagem"],
+         "action": "Ajudar com discrição a localizar fileira/assento",
+         "phrase": "Qual número? Eu ajudo."},
+    39: {"clues": ["estica braço", "risco de queda"],
+         "action": "Pegar o produto com segurança ou chamar funcionário",
+         "phrase": "Quer que eu pegue?"},
+    40: {"clues": ["papel tremendo", "preocupação"],
+         "action": "Encaminhar para farmacêutico (evitar “interpretar” sozinho)",
+         "phrase": "Vamos chamar o farmacêutico."},
+
+    41: {"clues": ["folhas voando", "tensão"],
+         "action": "Ajudar a recolher e organizar com discrição",
+         "phrase": "Eu ajudo a juntar."},
+    42: {"clues": ["silêncio", "olhar confuso", "notas vazias"],
+         "action": "Dar suporte sem expor (explicar depois / mandar resumo)",
+         "phrase": "Quer que eu explique depois?"},
+    43: {"clues": ["força", "frustração", "tenta repetidas"],
+         "action": "Oferecer ajuda para abrir (respeitando se não quiser)",
+         "phrase": "Quer que eu abra?"},
+    44: {"clues": ["tom alto", "desorientação", "pressa"],
+         "action": "Acolher e direcionar com calma, evitando escalada",
+         "phrase": "Eu te mostro onde é."},
+    45: {"clues": ["bocejos", "lentidão", "irritabilidade"],
+         "action": "Oferecer pausa e apoio, ajustando demanda",
+         "phrase": "Quer uma pausa?"},
+    46: {"clues": ["tremor", "olhar fixo", "hiperventila"],
+         "action": "Co-regular (respiração/água) e levar para lugar calmo, acionar suporte se necessário",
+         "phrase": "Quer água? Vamos pra um lugar calmo."},
+    47: {"clues": ["comida no chão", "vergonha", "pessoas olhando"],
+         "action": "Checar se está bem e acionar limpeza/guardanapo com discrição",
+         "phrase": "Você tá bem? Eu chamo alguém."},
+    48: {"clues": ["inclina cabeça", "“como?”", "leitura labial"],
+         "action": "Falar de frente, mais devagar, com apoio visual",
+         "phrase": "Eu falo de frente e devagar."},
+    49: {"clues": ["dor forte", "suor", "senta/colapsa"],
+         "action": "Acionar emergência e ficar junto (ação rápida e segura)",
+         "phrase": "Vou chamar ajuda agora. Fica comigo."},
+    50: {"clues": ["joelho ralado", "vergonha", "objeto no chão"],
+         "action": "Checar ferimento e oferecer cuidado/curativo, chamar responsável se menor",
+         "phrase": "Você tá bem? Quer curativo?"},
+}
+
+# =========================
+# ✅ Tags por carta (1–50): ⚠ Segurança / 👀 Atenção conjunta / 💬 Comunicação pragmática
+# =========================
+CARD_TAGS = {
+    1:  ["⚠ Segurança", "👀 Atenção conjunta"],
+    2:  ["👀 Atenção conjunta"],
+    3:  ["👀 Atenção conjunta"],
+    4:  ["👀 Atenção conjunta"],
+    5:  ["⚠ Segurança", "👀 Atenção conjunta"],
+    6:  ["⚠ Segurança", "👀 Atenção conjunta"],
+    7:  ["👀 Atenção conjunta", "💬 Comunicação pragmática"],
+    8:  ["👀 Atenção conjunta", "💬 Comunicação pragmática"],
+    9:  ["⚠ Segurança", "👀 Atenção conjunta", "💬 Comunicação pragmática"],
+    10: ["⚠ Segurança", "👀 Atenção conjunta"],
+
+    11: ["💬 Comunicação pragmática", "👀 Atenção conjunta"],
+    12: ["💬 Comunicação pragmática"],
+    13: ["👀 Atenção conjunta", "💬 Comunicação pragmática"],
+    14: ["👀 Atenção conjunta", "💬 Comunicação pragmática"],
+    15: ["⚠ Segurança", "👀 Atenção conjunta"],
+    16: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    17: ["⚠ Segurança", "💬 Comunicação pragmática", "👀 Atenção conjunta"],
+    18: ["💬 Comunicação pragmática", "👀 Atenção conjunta"],
+    19: ["⚠ Segurança", "👀 Atenção conjunta"],
+    20: ["⚠ Segurança", "👀 Atenção conjunta", "💬 Comunicação pragmática"],
+
+    21: ["💬 Comunicação pragmática"],
+    22: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    23: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    24: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    25: ["⚠ Segurança", "👀 Atenção conjunta", "💬 Comunicação pragmática"],
+    26: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    27: ["⚠ Segurança", "👀 Atenção conjunta"],
+    28: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    29: ["⚠ Segurança", "👀 Atenção conjunta", "💬 Comunicação pragmática"],
+    30: ["💬 Comunicação pragmática"],
+
+    31: ["⚠ Segurança", "💬 Comunicação pragmática", "👀 Atenção conjunta"],
+    32: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    33: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    34: ["💬 Comunicação pragmática"],
+    35: ["💬 Comunicação pragmática"],
+    36: ["💬 Comunicação pragmática"],
+    37: ["💬 Comunicação pragmática"],
+    38: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    39: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    40: ["⚠ Segurança", "💬 Comunicação pragmática"],
+
+    41: ["💬 Comunicação pragmática"],
+    42: ["💬 Comunicação pragmática"],
+    43: ["💬 Comunicação pragmática"],
+    44: ["⚠ Segurança", "💬 Comunicação pragmática"],
+    45: ["👀 Atenção conjunta", "💬 Comunicação pragmática"],
+    46: ["⚠ Segurança", "💬 Comunicação pragmática", "👀 Atenção conjunta"],
+    47: ["⚠ Segurança", "💬 Comunicação pragmática", "👀 Atenção conjunta"],
+    48: ["💬 Comunicação pragmática"],
+    49: ["⚠ Segurança", "👀 Atenção conjunta", "💬 Comunicação pragmática"],
+    50: ["⚠ Segurança", "👀 Atenção conjunta", "💬 Comunicação pragmática"],
+}
@@ -0,0 +1,159 @@
+"""
+Catálogo de cartas compilado uma vez por versão do cards.json.
+
+build_catalog() normaliza o JSON (que pode variar nos nomes de chave),
+aplica os overrides de clinic.card_support e as categorias de tag, e
+devolve registros imutáveis. Na renderização só há leituras de atributo.
+
+Erros estruturais (sem id, id repetido/não inteiro) levantam CatalogError
+na carga; problemas de conteúdo (imagem ausente, carta sem pistas) ficam
+em Catalog.warnings.
+"""
+import os
+from dataclasses import dataclass
+
+from clinic.card_support import CARD_SUPPORT, CARD_TAGS
+
+# CARDS_JSON aponta para outro baralho (ex.: baralhos sintéticos de tools/synth.py)
+CARDS_PATH = os.getenv("CARDS_JSON", os.path.join("data", "cards.json"))
+
+# chaves alternativas aceitas no cards.json, em ordem de preferência
+TITLE_KEYS = ("title", "titulo", "name", "nome", "scenario", "cenario", "heading")
+CLUE_KEYS = ("keyClues", "clues", "pistas", "hints", "keys", "key_clues")
+ACTION_KEYS = ("targetAction", "acaoAlvo", "acao_alvo", "action", "target_action")
+PHRASE_KEYS = ("targetPhrase", "fraseAlvo", "frase_alvo", "phrase", "target_phrase")
+
+
+class CatalogError(ValueError):
+    def __init__(self, errors: list[str]):
+        super().__init__("cards.json inválido:\n- " + "\n- ".join(errors))
+        self.errors = errors
+
+
+@dataclass(frozen=True, slots=True)
+class Card:
+    id: int
+    title: str
+    image: str
+    context: str
+    difficulty: int | None
+    tags: tuple[str, ...]          # tags do JSON (ex.: "seguranca", "emocao")
+    categories: tuple[str, ...]    # ⚠ Segurança / 👀 Atenção conjunta / 💬 Comunicação pragmática
+    clues: tuple[str, ...]
+    action: str
+    phrase: str
+    needs_adult: bool
+    adult_type: str
+
+    # Separação (MVP): no momento, avaliação e intervenção reutilizam as mesmas pistas.
+    # Se depois quiser diferenciar, basta criar campos próprios aqui.
+    @property
+    def eval_clues(self) -> tuple[str, ...]:
+        return self.clues
+
+    @property
+    def intervention_clues(self) -> tuple[str, ...]:
+        return self.clues
+
+
+@dataclass(frozen=True)
+class Catalog:
+    cards: tuple[Card, ...]
+    by_id: dict
+    warnings: tuple[str, ...] = ()
+
+    @property
+    def ids(self) -> list[int]:
+        return [c.id for c in self.cards]
+
+    def get(self, card_id) -> Card | None:
+        return self.by_id.get(card_id)
+
+
+# =========================
+# Leitura robusta (JSON pode variar)
+# =========================
+def _as_list(v) -> tuple[str, ...]:
+    if v is None:
+        return ()
+    if isinstance(v, list):
+        return tuple(str(x).strip() for x in v if str(x).strip())
+    if isinstance(v, str):
+        parts = []
+        for sep in ["•", "|", ";", "\n", ","]:
+            if sep in v:
+                parts = [p.strip() for p in v.split(sep)]
+                break
+        if not parts:
+            parts = [v.strip()]
+        return tuple(p for p in parts if p)
+    return ()
+
+
+def _first_str(raw: dict, keys) -> str:
+    for k in keys:
+        v = raw.get(k)
+        if isinstance(v, str) and v.strip():
+            return v.strip()
+    return ""
+
+
+def _clues(raw: dict) -> tuple[str, ...]:
+    for k in CLUE_KEYS:
+        if k in raw and raw.get(k) not in (None, ""):
+            return _as_list(raw.get(k))
+    return ()
+
+
+def _compile_card(raw: dict, cid: int) -> Card:
+    support = CARD_SUPPORT.get(cid)
+    difficulty = raw.get("difficulty")
+    return Card(
+        id=cid,
+        title=_first_str(raw, TITLE_KEYS) or f"Carta {cid}",
+        image=raw.get("image") or "",
+        context=raw.get("context") or "",
+        difficulty=int(difficulty) if isinstance(difficulty, (int, float)) else None,
+        tags=_as_list(raw.get("tags")),
+        categories=tuple(CARD_TAGS.get(cid, ())),
+        clues=tuple(support["clues"]) if support else _clues(raw),
+        action=support["action"] if support else _first_str(raw, ACTION_KEYS),
+        phrase=support["phrase"] if support else _first_str(raw, PHRASE_KEYS),
+        needs_adult=bool(raw.get("needsAdult")),
+        adult_type=raw.get("adultType") or "",
+    )
+
+
+def build_catalog(raw_cards, check_images: bool = True) -> Catalog:
+    errors, warnings = [], []
+    cards, by_id = [], {}
+
+    if not isinstance(raw_cards, list):
+        raise CatalogError(["a raiz do cards.json deve ser uma lista"])
+
+    for pos, raw in enumerate(raw_cards):
+        if not isinstance(raw, dict):
+            errors.append(f"item {pos}: esperado objeto, veio {type(raw).__name__}")
+            continue
+        cid = raw.get("id")
+        if cid is None:
+            errors.append(f"item {pos}: sem 'id'")
+            continue
+        if not isinstance(cid, int) or isinstance(cid, bool):
+            errors.append(f"item {pos}: id {cid!r} não é inteiro")
+            continue
+        if cid in by_id:
+            errors.append(f"item {pos}: id {cid} repetido")
+            continue
+
+        card = _compile_card(raw, cid)
+        if check_images and not (card.image and os.path.exists(card.image)):
+            warnings.append(f"carta {cid}: imagem não encontrada ({card.image or '—'})")
+        if not card.clues:
+            warnings.append(f"carta {cid}: sem pistas")
+        cards.append(card)
+        by_id[cid] = card
+
+    if errors:
+        raise CatalogError(errors)
+    return Catalog(cards=tuple(cards), by_id=by_id, warnings=tuple(warnings))
@@ -0,0 +1,68 @@
+"""
+Visão da clínica: agregados entre pacientes por faixa etária, modo, carta
+ou mês, com filtros por faixa/modo/carta/período.
+
+A agregação roda no SQLite (GROUP BY + funções de janela em q.COHORT_*):
+do banco saem só uma linha por grupo e uma por mês, nunca as tentativas.
+Os resultados ficam no clinic.report_cache sob a versão da clínica
+(report_cache.CLINIC), que sobe a cada sessão gravada.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import pandas as pd
+
+from clinic import queries as q
+
+AGE_GROUPS = ("crianca", "adolescente", "adulto")
+MODES = ("treino_guiado", "treino_independente", "avaliacao")
+
+# nome -> (rótulo, expressão SQL). Só expressões fixas daqui entram no SQL.
+DIMENSIONS = {
+    "age_group": ("Faixa etária", "c.age_group"),
+    "mode": ("Modo", "s.mode"),
+    "card_id": ("Carta", "a.card_id"),
+    "month": ("Mês", "substr(s.created_at, 1, 7)"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CohortFilter:
+    age_groups: tuple = ()
+    modes: tuple = ()
+    card_ids: tuple = ()
+    date_from: date | None = None   # inclusivos (data da sessão), como em clinic.export
+    date_to: date | None = None
+
+    def where(self) -> tuple[str, list]:
+        clauses, params = [], []
+        for column, values in (("c.age_group", self.age_groups), ("s.mode", self.modes),
+                               ("a.card_id", self.card_ids)):
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if self.date_from is not None:
+            clauses.append("s.created_at >= ?")
+            params.append(self.date_from.isoformat())
+        if self.date_to is not None:
+            clauses.append("s.created_at < ?")
+            params.append((self.date_to + timedelta(days=1)).isoformat())
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def cache_name(self, kind: str) -> str:
+        """Nome estável (e seguro como nome de arquivo) para o report_cache."""
+        return f"cohort_{kind}_{hashlib.md5(repr(self).encode()).hexdigest()[:12]}"
+
+
+def by_group(conn, dim: str, flt: CohortFilter) -> pd.DataFrame:
+    """Uma linha por valor de `dim` (ver DIMENSIONS)."""
+    where, params = flt.where()
+    sql = q.COHORT_GROUPS.format(dim=DIMENSIONS[dim][1], where=where)
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def by_month(conn, flt: CohortFilter) -> pd.DataFrame:
+    """Série mensal com médias móveis de 3 meses e tentativas acumuladas."""
+    where, params = flt.where()
+    return pd.read_sql_query(q.COHORT_MONTHS.format(where=where), conn, params=params)
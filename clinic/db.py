@@ -0,0 +1,116 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from clinic.migrations import migrate
+from clinic.profiling import stage
+
+# =========================
+# Pragmas aplicados a cada conexão nova
+# =========================
+BUSY_TIMEOUT_MS = 5000
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL",       # leitores não bloqueiam o escritor
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA synchronous = NORMAL",     # seguro com WAL; evita fsync a cada commit
+    "PRAGMA cache_size = -8000",       # ~8 MB de page cache por conexão
+    "PRAGMA temp_store = MEMORY",
+]
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """
+    Pool de conexões SQLite compartilhado por todas as sessões do processo.
+    Uso: `with pool.connection() as conn: ...` — a conexão volta ao pool ao sair.
+    """
+
+    def __init__(self, path: str, size: int = 8, timeout: float = 10.0):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return connect(self.path)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("pool de conexões esgotado") from None
+
+    def release(self, conn: sqlite3.Connection):
+        # ✅ nunca devolve ao pool uma transação pendente (ex.: st.stop() no meio)
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+@contextmanager
+def transaction(conn):
+    """
+    Transação explícita de escrita: BEGIN IMMEDIATE já pega o lock de escrita
+    (evita "database is locked" ao promover leitura→escrita), commit no fim,
+    rollback em qualquer erro.
+    """
+    with stage("db: espera do lock de escrita"):
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    with stage("db: commit"):
+        conn.commit()
+
+
+def open_pool(path: str, size: int = 8) -> ConnectionPool:
+    """Cria o pool e aplica as migrações pendentes uma única vez."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    pool = ConnectionPool(path, size=size)
+    with pool.connection() as conn:
+        migrate(conn)
+    return pool
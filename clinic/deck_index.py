@@ -0,0 +1,115 @@
+"""
+Índice invertido do catálogo para montar baralhos por filtros.
+
+Cada valor de faceta (categoria, tag, contexto, dificuldade, precisa de
+adulto) e cada palavra de título/pistas guarda um bitset — um int do Python
+em que o bit i representa catalog.cards[i]. Filtrar é OR dentro da mesma
+faceta, AND entre facetas e com a busca textual: operações inteiras, sem
+percorrer as cartas.
+"""
+import re
+import unicodedata
+from bisect import bisect_left
+
+# faceta -> rótulo exibido
+FACETS = {
+    "categories": "Categoria",
+    "tags": "Tags",
+    "context": "Contexto",
+    "difficulty": "Dificuldade",
+    "needs_adult": "Precisa de adulto",
+}
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """minúsculas e sem acentos ("Segurança" → "seguranca")."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def tokens(text: str) -> list[str]:
+    return _WORD.findall(normalize(text))
+
+
+def _facet_values(card, facet: str) -> tuple:
+    v = getattr(card, facet)
+    if isinstance(v, tuple):
+        return v
+    if v in (None, ""):
+        return ()
+    return (v,)
+
+
+class DeckIndex:
+    def __init__(self, catalog):
+        self.ids = [c.id for c in catalog.cards]
+        self.all = (1 << len(self.ids)) - 1
+        self.facets = {f: {} for f in FACETS}
+        postings = {}
+
+        for pos, card in enumerate(catalog.cards):
+            bit = 1 << pos
+            for facet, values in self.facets.items():
+                for v in _facet_values(card, facet):
+                    values[v] = values.get(v, 0) | bit
+            for word in tokens(" ".join((card.title, *card.clues))):
+                postings[word] = postings.get(word, 0) | bit
+
+        self._vocab = sorted(postings)
+        self._postings = postings
+
+    # =========================
+    # Consulta
+    # =========================
+    def _prefix(self, prefix: str) -> int:
+        bits = 0
+        i = bisect_left(self._vocab, prefix)
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            bits |= self._postings[self._vocab[i]]
+            i += 1
+        return bits
+
+    def text_bits(self, query: str) -> int:
+        """Cada palavra da busca casa por prefixo; todas precisam casar (AND)."""
+        bits = self.all
+        for word in tokens(query):
+            bits &= self._prefix(word)
+            if not bits:
+                break
+        return bits
+
+    def match_bits(self, filters: dict | None = None, text: str = "", skip: str | None = None) -> int:
+        bits = self.all
+        for facet, selected in (filters or {}).items():
+            if facet == skip or not selected:
+                continue
+            values = self.facets[facet]
+            facet_bits = 0
+            for v in selected:
+                facet_bits |= values.get(v, 0)
+            bits &= facet_bits
+        if text.strip():
+            bits &= self.text_bits(text)
+        return bits
+
+    def ids_for(self, bits: int) -> list[int]:
+        out = []
+        while bits:
+            low = bits & -bits
+            out.append(self.ids[low.bit_length() - 1])
+            bits ^= low
+        return out
+
+    def search(self, filters: dict | None = None, text: str = "") -> list[int]:
+        """IDs das cartas que passam nos filtros, na ordem do catálogo."""
+        return self.ids_for(self.match_bits(filters, text))
+
+    def counts(self, facet: str, filters: dict | None = None, text: str = "") -> dict:
+        """
+        Quantas cartas cada valor de `facet` teria, considerando os OUTROS filtros
+        (a própria faceta é ignorada, para que as opções não sumam ao marcar uma).
+        """
+        base = self.match_bits(filters, text, skip=facet)
+        return {v: (base & bits).bit_count() for v, bits in self.facets[facet].items()}
@@ -0,0 +1,54 @@
+"""
+Diretório de pacientes para os seletores de Pacientes e Relatórios.
+
+Em vez de carregar a tabela inteira, cada consulta traz uma página
+(PAGE_SIZE linhas) já como dict id → Client, em ordem: o rótulo de cada
+opção é uma busca no dict, e não um filtro sobre todos os pacientes.
+A busca por prefixo do apelido usa idx_clients_nickname (migração 6).
+Sem COUNT(*): uma linha a mais (PAGE_SIZE + 1) diz se existe próxima página,
+então o custo de cada render fica limitado à página, não ao cadastro.
+"""
+from dataclasses import dataclass
+
+from clinic import queries as q
+
+PAGE_SIZE = 50
+
+# maior code point: "abc" + _TOP fica acima de qualquer apelido que comece com "abc"
+_TOP = "\U0010ffff"
+
+
+@dataclass(frozen=True, slots=True)
+class Client:
+    id: int
+    nickname: str
+    age_group: str
+
+    @property
+    def label(self) -> str:
+        return f"#{self.id} — {self.nickname} ({self.age_group})"
+
+
+def prefix_bounds(prefix: str) -> tuple[str, str]:
+    """Faixa [lo, hi) de apelidos que começam com `prefix`."""
+    return prefix, prefix + _TOP
+
+
+def get_client(conn, client_id: int) -> Client | None:
+    row = conn.execute(q.CLIENT_ROW, (client_id,)).fetchone()
+    return Client(*row) if row else None
+
+
+def find_clients(conn, prefix: str = "", page: int = 0, page_size: int = PAGE_SIZE) -> tuple[dict, bool]:
+    """
+    ({id: Client} da página `page` (a partir de 0), se há uma página seguinte).
+    Sem prefixo: mais recentes primeiro; com prefixo: ordem alfabética do apelido.
+    """
+    prefix = prefix.strip()
+    offset = max(page, 0) * page_size
+    if prefix:
+        rows = conn.execute(q.CLIENTS_PREFIX_PAGE, (*prefix_bounds(prefix), page_size + 1, offset))
+    else:
+        rows = conn.execute(q.CLIENTS_PAGE, (page_size + 1, offset))
+    rows = rows.fetchall()
+    return {row[0]: Client(*row) for row in rows[:page_size]}, len(rows) > page_size
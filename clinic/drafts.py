@@ -0,0 +1,131 @@
+"""
+Rascunho da sessão gravado a cada passo (sobrevive a queda do navegador/servidor).
+
+A sessão em andamento é uma linha de `sessions` com status 'draft' e um
+diário append-only (`session_journal`): um INSERT pequeno por tentativa
+salva ('attempt') e por mudança de contador da carta ('meta'). Vale o
+último evento de cada carta.
+
+"Salvar sessão" (finalize) vira a troca de status 'draft' → 'final' mais a
+cópia das últimas tentativas do diário para `attempts` (+ resumos) — dezenas
+de linhas que já estão no banco. A tela só entra com o que o diário não tem
+(tentativa salva antes de o rascunho abrir, gravação que falhou): essas vão
+para o diário na mesma transação, antes da cópia. Enquanto é rascunho nada
+entra em `attempts`, então Relatórios/exportação/resumos não mudam.
+
+Funções sem commit: rodam como jobs da clinic.write_queue.
+"""
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from clinic import queries as q
+from clinic import report_cache
+from clinic import summary
+from clinic.writer import AttemptRecord
+
+ATTEMPT = "attempt"
+META = "meta"
+
+# campos da meta da carta que uma tentativa salva também registra
+META_FIELDS = ("prompts_green", "prompts_yellow", "prompts_red", "reformulations",
+               "response_class", "alt_logic", "alt_diff")
+
+
+@dataclass(frozen=True, slots=True)
+class Draft:
+    session_id: int
+    created_at: str
+    mode: str
+    attempts: dict    # card_id -> dict (formato de st.session_state.session_attempts)
+    metas: dict       # card_id -> dict (formato de ui.session.init_attempt_meta)
+    updated_at: str = ""
+
+
+# =========================
+# Gravação (jobs)
+# =========================
+def open_draft(conn, client_id: int, mode: str) -> int:
+    """Novo rascunho para o paciente; devolve o id da sessão."""
+    cur = conn.execute(q.INSERT_DRAFT, (client_id, datetime.now().isoformat(), mode))
+    return cur.lastrowid
+
+
+def _append(conn, session_id: int, card_id: int, kind: str, payload: dict):
+    conn.execute(q.INSERT_JOURNAL, (
+        session_id, card_id, kind, json.dumps(payload, ensure_ascii=False), datetime.now().isoformat()
+    ))
+
+
+def record_attempt(conn, session_id: int, attempt: AttemptRecord):
+    """Tentativa salva (já validada pelo AttemptRecord); substitui a anterior da mesma carta."""
+    _append(conn, session_id, attempt.card_id, ATTEMPT, asdict(attempt))
+
+
+def record_meta(conn, session_id: int, card_id: int, meta: dict):
+    """Retrato dos contadores da carta depois de um clique."""
+    _append(conn, session_id, card_id, META, meta)
+
+
+def reconcile(conn, session_id: int, attempts: dict) -> int:
+    """
+    Grava no diário as tentativas da tela (card_id -> dict) que faltam nele ou
+    que diferem da última gravada — a tela tem a versão mais nova. Retorna quantas.
+    """
+    journal = {cid: AttemptRecord.from_dict(a) for cid, a in load_draft(conn, session_id).attempts.items()}
+    missing = [r for r in map(AttemptRecord.from_dict, attempts.values()) if journal.get(r.card_id) != r]
+    for record in missing:
+        record_attempt(conn, session_id, record)
+    return len(missing)
+
+
+def finalize(conn, session_id: int, mode: str, session_notes: str = "", attempts: dict | None = None) -> int:
+    """
+    Rascunho → sessão final: tentativas + resumos na transação do job.
+    attempts: as da tela; o que faltar no diário entra antes (reconcile).
+    """
+    if attempts:
+        reconcile(conn, session_id, attempts)
+    draft = load_draft(conn, session_id)
+    attempts = [AttemptRecord.from_dict(a) for a in draft.attempts.values()]
+    if not attempts:
+        raise ValueError("sessão sem tentativas")
+    if conn.execute(q.FINALIZE_DRAFT, (mode, session_notes.strip(), session_id)).rowcount != 1:
+        raise ValueError(f"sessão {session_id} não é um rascunho aberto")
+    client_id = conn.execute(q.DRAFT_CLIENT, (session_id,)).fetchone()[0]
+    conn.executemany(q.INSERT_ATTEMPT, [a.row(session_id) for a in attempts])
+    summary.apply_attempts(conn, client_id, attempts)
+    report_cache.bump_versions(conn, [client_id])
+    return session_id
+
+
+def discard(conn, session_id: int):
+    """Descarta o rascunho (o diário fica, sem tentativas em `attempts`)."""
+    conn.execute(q.DISCARD_DRAFT, (session_id,))
+
+
+# =========================
+# Leitura (retomar depois de reconectar)
+# =========================
+def load_draft(conn, session_id: int, created_at: str = "", mode: str = "") -> Draft:
+    """Reaplica o diário em ordem: último evento de cada carta vence."""
+    attempts, metas = {}, {}
+    updated_at = created_at
+    for _, card_id, kind, payload, at in conn.execute(q.DRAFT_JOURNAL, (session_id,)):
+        data = json.loads(payload)
+        meta = metas.setdefault(card_id, {})
+        if kind == ATTEMPT:
+            attempts[card_id] = data
+            meta.update({k: data[k] for k in META_FIELDS})
+        else:
+            meta.update(data)
+        updated_at = at
+    return Draft(session_id, created_at, mode, attempts, metas, updated_at)
+
+
+def find_draft(conn, client_id: int) -> Draft | None:
+    """Rascunho aberto mais recente do paciente (idx_sessions_draft), ou None."""
+    row = conn.execute(q.OPEN_DRAFT, (client_id,)).fetchone()
+    if row is None:
+        return None
+    return load_draft(conn, row[0], row[1], row[2])
@@ -0,0 +1,115 @@
+"""
+Exportação em streaming (CSV/Parquet) das tentativas.
+
+As linhas saem do SQLite em blocos (cursor.fetchmany) e são gravadas no
+arquivo bloco a bloco, então o pico de memória é o de um bloco — não o do
+histórico inteiro — independente de quantas tentativas forem exportadas.
+"""
+import csv
+import io
+import os
+import tempfile
+from datetime import date, timedelta
+
+from clinic import queries as q
+
+CHUNK_SIZE = 5000
+
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+TEXT_COLUMNS = {
+    "age_group", "created_at", "mode", "notes", "response_class", "alt_logic", "alt_diff",
+}
+
+
+def iter_chunks(conn, sql: str, params=(), chunk_size: int = CHUNK_SIZE):
+    """Devolve (colunas, gerador de listas de linhas)."""
+    cur = conn.execute(sql, params)
+    columns = [d[0] for d in cur.description]
+
+    def chunks():
+        try:
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cur.close()
+
+    return columns, chunks()
+
+
+def client_attempts(conn, client_id: int, chunk_size: int = CHUNK_SIZE):
+    """Mesmas colunas/ordem da tabela de Relatórios."""
+    return iter_chunks(conn, q.CLIENT_ATTEMPTS, (client_id,), chunk_size)
+
+
+def clinic_attempts(conn, date_from: date | None = None, date_to: date | None = None,
+                    chunk_size: int = CHUNK_SIZE):
+    """Todos os pacientes; date_from/date_to inclusivos (data da sessão)."""
+    clauses, params = [], []
+    if date_from is not None:
+        clauses.append("s.created_at >= ?")
+        params.append(date_from.isoformat())
+    if date_to is not None:
+        clauses.append("s.created_at < ?")
+        params.append((date_to + timedelta(days=1)).isoformat())
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    return iter_chunks(conn, q.CLINIC_ATTEMPTS.format(where=where), params, chunk_size)
+
+
+# =========================
+# Escrita
+# =========================
+def write_csv(columns, chunks, f) -> int:
+    """`f` é um arquivo texto. Retorna o número de linhas gravadas."""
+    writer = csv.writer(f, lineterminator="\n")
+    writer.writerow(columns)
+    n = 0
+    for rows in chunks:
+        writer.writerows(rows)
+        n += len(rows)
+    return n
+
+
+def _arrow_schema(columns):
+    import pyarrow as pa
+    return pa.schema([
+        (c, pa.string() if c in TEXT_COLUMNS else pa.int64()) for c in columns
+    ])
+
+
+def write_parquet(columns, chunks, path: str) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(columns)
+    n = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            arrays = [pa.array([r[i] for r in rows], type=schema.field(i).type) for i in range(len(columns))]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            n += len(rows)
+    return n
+
+
+def write_file(columns, chunks, path: str, fmt: str = "csv") -> int:
+    """Grava em `path` de forma atômica (arquivo temporário + os.replace)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"formato de exportação desconhecido: {fmt}")
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".part")
+    os.close(fd)
+    try:
+        if fmt == "csv":
+            with io.open(tmp, "w", encoding="utf-8", newline="") as f:
+                n = write_csv(columns, chunks, f)
+        else:
+            n = write_parquet(columns, chunks, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return n
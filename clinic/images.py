@@ -0,0 +1,79 @@
+"""
+Derivados redimensionados/recomprimidos das imagens das cartas.
+
+Cada PNG original (1536×1024, 1–3 MB) vira variantes JPEG progressivas em
+VARIANT_WIDTHS, gravadas em CACHE_DIR com nome derivado do hash do conteúdo —
+trocar a imagem gera um novo nome e o derivado antigo deixa de ser usado.
+
+JPEG (e não WebP) porque st.image só repassa JPEG/PNG sem decodificar e
+recomprimir a cada chamada.
+
+O Pillow só é importado quando falta gerar um derivado: com o cache já
+montado (tools/build_card_images.py), o processo nem carrega o PIL.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+
+VARIANT_WIDTHS = (480, 960, 1536)
+CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(".cache", "images"))
+
+FORMAT, EXT = "JPEG", "jpg"
+SAVE_OPTS = {"quality": 82, "optimize": True, "progressive": True}
+
+_hash_cache = {}          # (path, mtime, size) -> sha256[:16]
+_build_lock = threading.Lock()
+
+
+def content_hash(path: str) -> str:
+    """Hash do conteúdo, memorizado por (mtime, tamanho) para não reler o PNG a cada rerun."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    h = _hash_cache.get(key)
+    if h is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        h = _hash_cache[key] = digest.hexdigest()[:16]
+    return h
+
+
+def pick_width(display_width: int) -> int:
+    """Menor variante que cobre a largura de exibição (ou a maior disponível)."""
+    for w in VARIANT_WIDTHS:
+        if w >= display_width:
+            return w
+    return VARIANT_WIDTHS[-1]
+
+
+def variant_path(path: str, width: int) -> str:
+    return os.path.join(CACHE_DIR, f"{content_hash(path)}_{width}.{EXT}")
+
+
+def build_variant(path: str, width: int) -> str:
+    """Gera (se faltar) e devolve o caminho do derivado de `path` com largura `width`."""
+    out = variant_path(path, width)
+    if os.path.exists(out):
+        return out
+
+    with _build_lock:
+        if os.path.exists(out):
+            return out
+        from PIL import Image  # import tardio: ver docstring do módulo
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with Image.open(path) as im:
+            im = im.convert("RGB")
+            if im.width > width:
+                im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+            fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".part")
+            os.close(fd)
+            try:
+                im.save(tmp, FORMAT, **SAVE_OPTS)
+                os.replace(tmp, out)
+            except BaseException:
+                os.remove(tmp)
+                raise
+    return out
@@ -0,0 +1,286 @@
+"""
+Migrações versionadas do schema (PRAGMA user_version).
+
+Cada passo em MIGRATIONS leva o banco da versão N para N+1. Para evoluir o
+schema basta acrescentar um passo ao final da lista — nunca editar/reordenar
+os existentes, pois bancos em produção já registraram a versão.
+"""
+
+
+def sql(*statements):
+    """Passo de migração feito só de comandos SQL (um por string)."""
+    def step(conn):
+        for stmt in statements:
+            conn.execute(stmt)
+    return step
+
+
+def ensure_columns(conn, table: str, columns: dict):
+    """
+    columns: {col_name: sql_type}
+    Ex.: {"prompts_green": "INTEGER DEFAULT 0"}
+    """
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for col, sql_type in columns.items():
+        if col not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {sql_type}")
+
+
+# =========================
+# Passos
+# =========================
+_create_base_tables = sql(
+    """
+    CREATE TABLE IF NOT EXISTS clients (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nickname TEXT NOT NULL,
+        age_group TEXT NOT NULL,
+        notes TEXT,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        client_id INTEGER NOT NULL,
+        created_at TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        session_notes TEXT,
+        FOREIGN KEY(client_id) REFERENCES clients(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attempts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id INTEGER NOT NULL,
+        card_id INTEGER NOT NULL,
+        hint_level INTEGER NOT NULL,
+        detection INTEGER NOT NULL,
+        clues INTEGER NOT NULL,
+        cog_empathy INTEGER NOT NULL,
+        action INTEGER NOT NULL,
+        communication INTEGER NOT NULL,
+        safety INTEGER NOT NULL,
+        total INTEGER NOT NULL,
+        notes TEXT,
+        FOREIGN KEY(session_id) REFERENCES sessions(id)
+    )
+    """,
+)
+
+
+def _add_attempt_meta_columns(conn):
+    # ✅ campos para padronização/UX; bancos antigos (pré-user_version) podem já ter parte deles
+    ensure_columns(conn, "attempts", {
+        "prompts_green": "INTEGER DEFAULT 0",
+        "prompts_yellow": "INTEGER DEFAULT 0",
+        "prompts_red": "INTEGER DEFAULT 0",
+        "reformulations": "INTEGER DEFAULT 0",
+        "response_class": "TEXT DEFAULT 'Alvo'",
+        "alt_logic": "TEXT DEFAULT ''",
+        "alt_diff": "TEXT DEFAULT ''"
+    })
+
+
+# ✅ caminho paciente → sessões → tentativas (Relatórios) e buscas por carta
+_add_report_indexes = sql(
+    "CREATE INDEX IF NOT EXISTS idx_sessions_client ON sessions(client_id, id)",
+    "CREATE INDEX IF NOT EXISTS idx_attempts_session ON attempts(session_id, id)",
+    "CREATE INDEX IF NOT EXISTS idx_attempts_card ON attempts(card_id, session_id)",
+)
+
+
+# ✅ tabelas de resumo (clinic.summary) + backfill do histórico já existente.
+# Única definição das tabelas; o backfill fica congelado como era nesta versão:
+# clinic.summary.rebuild pode evoluir (colunas de migrações posteriores) sem
+# quebrar a atualização de bancos antigos.
+_add_summary_tables = sql(
+    """
+    CREATE TABLE IF NOT EXISTS summary_client (
+        client_id INTEGER PRIMARY KEY,
+        n_attempts INTEGER NOT NULL DEFAULT 0,
+        sum_total INTEGER NOT NULL DEFAULT 0,
+        sum_hint_level INTEGER NOT NULL DEFAULT 0,
+        sum_prompts_red INTEGER NOT NULL DEFAULT 0,
+        n_alt_valid INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS summary_card (
+        client_id INTEGER NOT NULL,
+        card_id INTEGER NOT NULL,
+        n_attempts INTEGER NOT NULL DEFAULT 0,
+        sum_total INTEGER NOT NULL DEFAULT 0,
+        min_total INTEGER,
+        max_total INTEGER,
+        PRIMARY KEY (client_id, card_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS summary_domain (
+        client_id INTEGER NOT NULL,
+        domain TEXT NOT NULL,
+        n INTEGER NOT NULL DEFAULT 0,
+        sum_score INTEGER NOT NULL DEFAULT 0,
+        min_score INTEGER,
+        max_score INTEGER,
+        PRIMARY KEY (client_id, domain)
+    ) WITHOUT ROWID
+    """,
+    "DELETE FROM summary_client",
+    "DELETE FROM summary_card",
+    "DELETE FROM summary_domain",
+    """
+    INSERT INTO summary_client (client_id, n_attempts, sum_total, sum_hint_level, sum_prompts_red, n_alt_valid)
+    SELECT s.client_id, COUNT(*), SUM(a.total), SUM(a.hint_level),
+           SUM(COALESCE(a.prompts_red, 0)), SUM(a.response_class = 'Alternativa válida')
+    FROM attempts a JOIN sessions s ON s.id = a.session_id
+    GROUP BY s.client_id
+    """,
+    """
+    INSERT INTO summary_card (client_id, card_id, n_attempts, sum_total, min_total, max_total)
+    SELECT s.client_id, a.card_id, COUNT(*), SUM(a.total), MIN(a.total), MAX(a.total)
+    FROM attempts a JOIN sessions s ON s.id = a.session_id
+    GROUP BY s.client_id, a.card_id
+    """,
+    *(f"""
+    INSERT INTO summary_domain (client_id, domain, n, sum_score, min_score, max_score)
+    SELECT s.client_id, '{domain}', COUNT(*), SUM(a.{domain}), MIN(a.{domain}), MAX(a.{domain})
+    FROM attempts a JOIN sessions s ON s.id = a.session_id
+    GROUP BY s.client_id
+    """ for domain in ("detection", "clues", "cog_empathy", "action", "communication", "safety")),
+)
+
+
+# ✅ exportação da clínica por período (ordem cronológica sem sort temporário)
+_add_sessions_created_index = sql(
+    "CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions(created_at)",
+)
+
+
+# ✅ busca do seletor de pacientes por prefixo do apelido (sem diferenciar maiúsculas)
+_add_clients_nickname_index = sql(
+    "CREATE INDEX IF NOT EXISTS idx_clients_nickname ON clients(nickname COLLATE NOCASE, id)",
+)
+
+
+# ✅ rascunho da sessão gravado a cada tentativa/contador (clinic.drafts).
+# Sessões já existentes são finais; só linhas 'draft' entram no índice parcial.
+def _add_session_journal(conn):
+    ensure_columns(conn, "sessions", {"status": "TEXT NOT NULL DEFAULT 'final'"})
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS session_journal (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            card_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY(session_id) REFERENCES sessions(id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_journal_session ON session_journal(session_id, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_draft ON sessions(client_id, id) WHERE status = 'draft'")
+
+
+# ✅ chave de invalidação do cache de relatórios (clinic.report_cache)
+_add_client_versions = sql(
+    """
+    CREATE TABLE IF NOT EXISTS client_versions (
+        client_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+)
+
+
+# ✅ dificuldade/discriminação empíricas por carta (clinic.calibration): só estatísticas
+# somáveis + marca d'água, então cada rodada lê apenas as tentativas novas.
+# Sem backfill aqui: o job recupera o histórico em lotes, fora da inicialização.
+_add_card_calibration = sql(
+    """
+    CREATE TABLE IF NOT EXISTS card_calibration (
+        card_id INTEGER PRIMARY KEY,
+        n INTEGER NOT NULL,
+        mean_score REAL NOT NULL,
+        difficulty REAL,
+        discrimination REAL,
+        hint_effect REAL,
+        prompt_effect REAL,
+        stats BLOB NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS calibration_ability (
+        client_id INTEGER PRIMARY KEY,
+        n INTEGER NOT NULL,
+        sum_score REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS calibration_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        last_attempt_id INTEGER NOT NULL,
+        updated_at TEXT
+    )
+    """,
+)
+
+
+# ✅ identidade aleatória do banco: separa a cópia em disco do cache de relatórios
+# de um banco recriado no mesmo caminho (as versões recomeçam do zero)
+_add_db_identity = sql(
+    """
+    CREATE TABLE IF NOT EXISTS db_identity (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        uuid TEXT NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO db_identity (id, uuid) VALUES (1, lower(hex(randomblob(16))))",
+)
+
+
+MIGRATIONS = [
+    _create_base_tables,          # 1
+    _add_attempt_meta_columns,    # 2
+    _add_report_indexes,          # 3
+    _add_summary_tables,          # 4
+    _add_sessions_created_index,  # 5
+    _add_clients_nickname_index,  # 6
+    _add_session_journal,         # 7
+    _add_client_versions,         # 8
+    _add_card_calibration,        # 9
+    _add_db_identity,             # 10
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn) -> int:
+    """
+    Aplica os passos pendentes numa única transação e grava a nova versão.
+    Se o banco já está na versão atual, custa só a leitura do user_version.
+    Retorna a versão final.
+    """
+    version = get_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # relê dentro do lock: outro processo pode ter migrado antes
+        version = get_version(conn)
+        for step in MIGRATIONS[version:]:
+            step(conn)
+        if version < SCHEMA_VERSION:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return get_version(conn)
@@ -0,0 +1,115 @@
+"""
+Pré-carregamento em segundo plano com LRU limitado.
+
+A página Sessão pede a carta atual com get() e, em seguida, manda aquecer as
+vizinhas (próxima/anterior do baralho) com prefetch(); quando o terapeuta
+navega, a carta já está em memória. Os loaders rodam em threads do pool,
+então não podem chamar nada do Streamlit (st.*).
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class Prefetcher:
+    """
+    get(key, load) devolve do cache, espera um carregamento já em andamento
+    ou chama load() na hora; prefetch({key: load}) agenda as chaves que faltam.
+    O loader vem a cada chamada para sempre enxergar o estado do rerun atual.
+    """
+
+    def __init__(self, max_items: int = 32, workers: int = 2):
+        self.cache = LRUCache(max_items)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+
+    def _load(self, key, load, future: Future):
+        try:
+            value = load()
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            self.cache.put(key, value)
+            future.set_result(value)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _claim(self, key):
+        """(future, dono) — dono=True se esta chamada deve disparar o carregamento."""
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future, False
+            if key in self.cache:  # terminou entre a consulta ao cache e aqui
+                future = Future()
+                future.set_result(self.cache.get(key))
+                return future, False
+            future = self._pending[key] = Future()
+            return future, True
+
+    def get(self, key, load):
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        future, owner = self._claim(key)
+        if owner:
+            self._load(key, load, future)
+        return future.result()
+
+    def prefetch(self, loads: dict):
+        for key, load in loads.items():
+            if key in self.cache:
+                continue
+            future, owner = self._claim(key)
+            if owner:
+                self._executor.submit(self._load, key, load, future)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def neighbours(ids: list, idx: int, radius: int = 1) -> list:
+    """IDs ao redor da posição `idx`, na ordem provável de navegação (próxima antes da anterior)."""
+    out = []
+    for step in range(1, radius + 1):
+        for j in (idx + step, idx - step):
+            if 0 <= j < len(ids) and ids[j] not in out:
+                out.append(ids[j])
+    return out
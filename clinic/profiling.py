@@ -0,0 +1,72 @@
+"""
+Cronometragem por etapa de um rerun (painel DEV_MODE em ui/devtools.py).
+
+    with stage("sql: tentativas"):
+        ...
+
+stage() só registra quando há um Trace ativo no contexto atual (start());
+fora disso é um no-op barato, então o código instrumentado fica igual em
+produção. O Trace vive numa ContextVar: cada sessão do Streamlit roda o
+script na própria thread, e as threads do prefetcher não herdam o trace.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+_current: ContextVar["Trace | None"] = ContextVar("clinic_trace", default=None)
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    start: float      # segundos desde o início do rerun
+    duration: float
+    depth: int        # aninhamento (stage dentro de stage)
+
+
+@dataclass(slots=True)
+class Trace:
+    label: str
+    t0: float = field(default_factory=time.perf_counter)
+    t1: float | None = None
+    spans: list = field(default_factory=list)
+    depth: int = 0
+
+    @property
+    def total(self) -> float:
+        return (self.t1 or time.perf_counter()) - self.t0
+
+    def ordered(self) -> list[Span]:
+        """Etapas na ordem em que começaram (são registradas ao terminar)."""
+        return sorted(self.spans, key=lambda s: (s.start, s.depth))
+
+
+def start(label: str) -> Trace:
+    trace = Trace(label)
+    _current.set(trace)
+    return trace
+
+
+def finish(trace: Trace) -> Trace:
+    trace.t1 = time.perf_counter()
+    if _current.get() is trace:
+        _current.set(None)
+    return trace
+
+
+@contextmanager
+def stage(name: str):
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    depth = trace.depth
+    trace.depth += 1
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        trace.depth = depth
+        trace.spans.append(Span(name, t - trace.t0, end - t, depth))
@@ -0,0 +1,173 @@
+"""
+SQL das páginas. Centralizado aqui para que tools/check_query_plans.py
+verifique exatamente as mesmas consultas que o app executa.
+"""
+
+CLIENT_NICKNAME = "SELECT nickname FROM clients WHERE id = ?"
+
+# ✅ diretório de pacientes (clinic.directory): uma página por vez, nunca a tabela inteira
+CLIENT_ROW = "SELECT id, nickname, age_group FROM clients WHERE id = ?"
+CLIENTS_PAGE = "SELECT id, nickname, age_group FROM clients ORDER BY id DESC LIMIT ? OFFSET ?"
+# prefixo como faixa [lo, hi) em idx_clients_nickname (LIKE não usaria o índice NOCASE)
+CLIENTS_PREFIX_PAGE = """
+SELECT id, nickname, age_group FROM clients
+WHERE nickname >= ? COLLATE NOCASE AND nickname < ? COLLATE NOCASE
+ORDER BY nickname COLLATE NOCASE, id
+LIMIT ? OFFSET ?
+"""
+
+INSERT_CLIENT = "INSERT INTO clients (nickname, age_group, notes, created_at) VALUES (?,?,?,?)"
+
+INSERT_SESSION = "INSERT INTO sessions (client_id, created_at, mode, session_notes) VALUES (?,?,?,?)"
+
+INSERT_ATTEMPT = """
+    INSERT INTO attempts
+    (session_id, card_id, hint_level, detection, clues, cog_empathy, action, communication, safety, total, notes,
+     prompts_green, prompts_yellow, prompts_red, reformulations, response_class, alt_logic, alt_diff)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+"""
+
+# ✅ rascunho da sessão (clinic.drafts): linha em sessions com status 'draft' + diário append-only
+INSERT_DRAFT = "INSERT INTO sessions (client_id, created_at, mode, session_notes, status) VALUES (?,?,?,'','draft')"
+OPEN_DRAFT = """
+SELECT id, created_at, mode FROM sessions
+WHERE client_id = ? AND status = 'draft'
+ORDER BY id DESC LIMIT 1
+"""
+FINALIZE_DRAFT = """
+UPDATE sessions SET status = 'final', mode = ?, session_notes = ?
+WHERE id = ? AND status = 'draft'
+"""
+DISCARD_DRAFT = "UPDATE sessions SET status = 'discarded' WHERE id = ? AND status = 'draft'"
+DRAFT_CLIENT = "SELECT client_id FROM sessions WHERE id = ?"
+INSERT_JOURNAL = "INSERT INTO session_journal (session_id, card_id, kind, payload, created_at) VALUES (?,?,?,?,?)"
+DRAFT_JOURNAL = """
+SELECT id, card_id, kind, payload, created_at FROM session_journal
+WHERE session_id = ?
+ORDER BY id
+"""
+
+# ✅ versão dos dados por paciente (clinic.report_cache): +1 a cada gravação de tentativas
+CLIENT_VERSION = "SELECT version FROM client_versions WHERE client_id = ?"
+BUMP_CLIENT_VERSION = """
+INSERT INTO client_versions (client_id, version) VALUES (?, 1)
+ON CONFLICT(client_id) DO UPDATE SET version = version + 1
+"""
+
+# ✅ cabeçalho "Resumo" dos Relatórios (clinic.summary): uma linha por paciente / por domínio
+SUMMARY_CLIENT = """
+SELECT n_attempts, sum_total, sum_hint_level, sum_prompts_red, n_alt_valid
+FROM summary_client WHERE client_id = ?
+"""
+SUMMARY_DOMAINS = "SELECT domain, n, sum_score, min_score, max_score FROM summary_domain WHERE client_id = ?"
+
+DB_IDENTITY = "SELECT uuid FROM db_identity WHERE id = 1"
+ROTATE_DB_IDENTITY = "UPDATE db_identity SET uuid = lower(hex(randomblob(16))) WHERE id = 1"
+
+CLIENT_ATTEMPTS = """
+    SELECT s.id as session_id, s.created_at, s.mode,
+           a.card_id, a.hint_level, a.detection, a.clues, a.cog_empathy,
+           a.action, a.communication, a.safety, a.total, a.notes,
+           a.prompts_green, a.prompts_yellow, a.prompts_red, a.reformulations,
+           a.response_class, a.alt_logic, a.alt_diff
+    FROM attempts a
+    JOIN sessions s ON s.id = a.session_id
+    WHERE s.client_id = ?
+    ORDER BY s.id DESC, a.id DESC
+"""
+
+# ✅ visão da clínica (clinic.cohort): agregado no SQLite, só uma linha por grupo/mês sai do banco.
+# {dim} e {where} são montados em clinic.cohort (dimensão fixa + filtros parametrizados).
+_COHORT_FROM = """
+    FROM attempts a
+    JOIN sessions s ON s.id = a.session_id
+    JOIN clients c ON c.id = s.client_id
+    {where}
+"""
+_PROMPTED = "(COALESCE(a.prompts_green, 0) + COALESCE(a.prompts_yellow, 0) + COALESCE(a.prompts_red, 0) > 0)"
+
+COHORT_GROUPS = """
+    SELECT {dim} AS grupo,
+           COUNT(DISTINCT s.client_id) AS pacientes,
+           COUNT(DISTINCT a.session_id) AS sessoes,
+           COUNT(*) AS tentativas,
+           100.0 * COUNT(*) / SUM(COUNT(*)) OVER () AS pct_tentativas,
+           AVG(a.total) AS media_total,
+           AVG(a.detection) AS detection, AVG(a.clues) AS clues, AVG(a.cog_empathy) AS cog_empathy,
+           AVG(a.action) AS action, AVG(a.communication) AS communication, AVG(a.safety) AS safety,
+           AVG(a.hint_level) AS media_dicas,
+           100.0 * AVG(""" + _PROMPTED + """) AS pct_conducao,
+           100.0 * AVG(a.response_class = 'Alternativa válida') AS pct_alt_valida
+""" + _COHORT_FROM + """
+    GROUP BY grupo
+    ORDER BY grupo
+"""
+
+# série mensal + médias móveis de 3 meses e acumulado (funções de janela sobre os meses)
+COHORT_MONTHS = """
+    WITH m AS (
+        SELECT substr(s.created_at, 1, 7) AS mes,
+               COUNT(DISTINCT s.client_id) AS pacientes,
+               COUNT(*) AS tentativas,
+               AVG(a.total) AS media_total,
+               100.0 * AVG(""" + _PROMPTED + """) AS pct_conducao
+""" + _COHORT_FROM + """
+        GROUP BY mes
+    )
+    SELECT mes, pacientes, tentativas, media_total,
+           AVG(media_total) OVER w3 AS media_total_movel,
+           pct_conducao,
+           AVG(pct_conducao) OVER w3 AS pct_conducao_movel,
+           SUM(tentativas) OVER (ORDER BY mes) AS tentativas_acumuladas
+    FROM m
+    WINDOW w3 AS (ORDER BY mes ROWS BETWEEN 2 PRECEDING AND CURRENT ROW)
+    ORDER BY mes
+"""
+
+# exportação da clínica inteira; {where} é montado em clinic.export (filtro de período)
+CLINIC_ATTEMPTS = """
+    SELECT s.client_id, c.age_group,
+           s.id as session_id, s.created_at, s.mode,
+           a.card_id, a.hint_level, a.detection, a.clues, a.cog_empathy,
+           a.action, a.communication, a.safety, a.total, a.notes,
+           a.prompts_green, a.prompts_yellow, a.prompts_red, a.reformulations,
+           a.response_class, a.alt_logic, a.alt_diff
+    FROM attempts a
+    JOIN sessions s ON s.id = a.session_id
+    JOIN clients c ON c.id = s.client_id
+    {where}
+    ORDER BY s.created_at, s.id, a.id
+"""
+
+# ✅ calibração das cartas (clinic.calibration): só tentativas depois da marca d'água, pela rowid
+CALIBRATION_STATE = "SELECT last_attempt_id FROM calibration_state WHERE id = 1"
+SET_CALIBRATION_STATE = """
+INSERT INTO calibration_state (id, last_attempt_id, updated_at) VALUES (1, ?, ?)
+ON CONFLICT(id) DO UPDATE SET last_attempt_id = excluded.last_attempt_id, updated_at = excluded.updated_at
+"""
+CALIBRATION_NEW_ATTEMPTS = """
+    SELECT a.id, s.client_id, a.card_id, a.total, a.hint_level,
+           COALESCE(a.prompts_green, 0) + COALESCE(a.prompts_yellow, 0) + COALESCE(a.prompts_red, 0)
+    FROM attempts a
+    JOIN sessions s ON s.id = a.session_id
+    WHERE a.id > ?
+    ORDER BY a.id
+    LIMIT ?
+"""
+# {marks} = "?,?,…" (um por paciente do lote, em blocos)
+CALIBRATION_ABILITY = "SELECT client_id, n, sum_score FROM calibration_ability WHERE client_id IN ({marks})"
+UPSERT_CALIBRATION_ABILITY = """
+INSERT INTO calibration_ability (client_id, n, sum_score) VALUES (?,?,?)
+ON CONFLICT(client_id) DO UPDATE SET n = n + excluded.n, sum_score = sum_score + excluded.sum_score
+"""
+CALIBRATION_STATS = "SELECT card_id, stats FROM card_calibration"
+REPLACE_CARD_CALIBRATION = """
+INSERT OR REPLACE INTO card_calibration
+    (card_id, n, mean_score, difficulty, discrimination, hint_effect, prompt_effect, stats, updated_at)
+VALUES (?,?,?,?,?,?,?,?,?)
+"""
+CARD_CALIBRATION = """
+    SELECT card_id, n, mean_score, difficulty, discrimination, hint_effect, prompt_effect, updated_at
+    FROM card_calibration
+    ORDER BY card_id
+"""
@@ -0,0 +1,157 @@
+"""
+Cache dos DataFrames de relatório por (client_id, data_version).
+
+Cada paciente tem um contador em `client_versions`, incrementado na MESMA
+transação que grava tentativas dele (writer._insert, drafts.finalize), e a
+linha CLINIC sobe a cada gravação de qualquer paciente (visão da clínica). A
+chave do cache inclui a versão lida do banco, então uma gravação invalida
+sozinha: a próxima leitura pede uma chave nova e a antiga sai por LRU.
+A versão é lida antes dos dados, então no pior caso (gravação no meio) a
+chave v guarda dados mais novos que v — nunca mais velhos.
+
+ReportCache é um LRU em memória limitado por bytes (memory_usage(deep)),
+opcionalmente com cópia em disco (pickle) que sobrevive a reinícios. A pasta
+em disco leva a identidade aleatória do banco (db_identity): um banco
+recriado no mesmo caminho recomeça as versões sem achar pickles do antigo.
+Backup restaurado por cima traz a identidade da época — troque-a com
+rotate_db_identity() (tools/rebuild_summaries.py --new-identity).
+Os DataFrames devolvidos são compartilhados entre sessões: não modificar.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from clinic import queries as q
+
+
+# =========================
+# Versão dos dados por paciente (sem commit: transação de quem chama)
+# =========================
+# linha 0 = clínica inteira (ids de pacientes começam em 1): sobe junto com qualquer paciente
+CLINIC = 0
+
+
+def bump_versions(conn, client_ids):
+    ids = {int(cid) for cid in client_ids}
+    if ids:
+        conn.executemany(q.BUMP_CLIENT_VERSION, [(cid,) for cid in sorted(ids | {CLINIC})])
+
+
+def get_version(conn, client_id: int) -> int:
+    row = conn.execute(q.CLIENT_VERSION, (client_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def get_db_identity(conn) -> str:
+    return conn.execute(q.DB_IDENTITY).fetchone()[0]
+
+
+def rotate_db_identity(conn):
+    """Nova identidade: invalida toda a cópia em disco deste banco."""
+    conn.execute(q.ROTATE_DB_IDENTITY)
+
+
+# =========================
+# LRU por tamanho (+ disco opcional)
+# =========================
+def _nbytes(df) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+class ReportCache:
+    def __init__(self, max_bytes: int = 64 * 2**20, disk_dir: str | None = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._items = OrderedDict()   # key -> (df, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # estatísticas (painel DEV_MODE / benchmarks)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_or_load(self, name: str, client_id: int, version: int, load):
+        """DataFrame de `name` para o paciente nesta versão; `load()` só no miss."""
+        key = (name, client_id, version)
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+
+        df = self._read_disk(key)
+        if df is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            df = load()
+            self._write_disk(key, df)
+        self._put(key, df)
+        return df
+
+    def _put(self, key, df):
+        size = _nbytes(df)
+        if size > self.max_bytes:
+            return   # maior que o cache inteiro: não expulsa todo o resto por ele
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            # versões antigas do mesmo relatório/paciente nunca mais serão pedidas
+            for stale in [k for k in self._items if k[:2] == key[:2]]:
+                self._bytes -= self._items.pop(stale)[1]
+            self._items[key] = (df, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    # =========================
+    # Disco: {disk_dir}/{name}_{client}_{version}.pkl
+    # =========================
+    def _path(self, key) -> str:
+        name, client_id, version = key
+        return os.path.join(self.disk_dir, f"{name}_{client_id}_{version}.pkl")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        import pandas as pd
+
+        try:
+            return pd.read_pickle(path)
+        except Exception:
+            return None   # arquivo truncado/incompatível: recarrega do banco
+
+    def _write_disk(self, key, df):
+        if not self.disk_dir:
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_pickle(tmp)
+        os.replace(tmp, path)
+        name, client_id, version = key
+        prefix = f"{name}_{client_id}_"
+        for fname in os.listdir(self.disk_dir):
+            if fname.startswith(prefix) and fname.endswith(".pkl") and fname != os.path.basename(path):
+                try:
+                    os.remove(os.path.join(self.disk_dir, fname))
+                except OSError:
+                    pass
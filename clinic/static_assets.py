@@ -0,0 +1,142 @@
+"""
+Arquivos estáticos com nome pelo hash do conteúdo (logo, derivados das cartas).
+
+Cada asset é publicado em STATIC_DIR como `{nome}.{hash}{ext}` e servido
+pelo próprio Streamlit em `app/static/` (server.enableStaticServing em
+.streamlit/config.toml). A URL leva `?v={hash}`: com esse parâmetro o
+handler estático (tornado) responde com Cache-Control de 10 anos, então o
+navegador baixa cada arquivo uma vez por versão e nunca mais revalida.
+Conteúdo novo → hash novo → URL nova.
+
+manifest.json (em STATIC_DIR) guarda chave lógica → arquivo publicado, hash,
+bytes e o (mtime, tamanho) da origem: no rerun basta um stat da origem para
+saber se o arquivo publicado ainda vale — sem reler nem re-hashear nada.
+tools/build_static.py publica tudo no build; o que faltar é publicado no
+primeiro acesso.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+
+from clinic import images
+
+# o Streamlit serve a pasta "static" ao lado do app.py
+STATIC_DIR = os.getenv("STATIC_DIR", "static")
+URL_PREFIX = "app/static"
+MANIFEST_NAME = "manifest.json"
+# logo da sidebar (ui.sidebar); aqui para as ferramentas de build não importarem o Streamlit
+LOGO_PATH = os.path.join("assets", "branding", "logo.png")
+LOGO_KEY = "branding/logo"
+# largura (px) em que a carta aparece na coluna principal da Sessão; escolhe a variante 480/960/1536
+CARD_IMAGE_WIDTH = int(os.getenv("CARD_IMAGE_WIDTH", "960"))
+
+
+@dataclass(frozen=True, slots=True)
+class Asset:
+    file: str            # nome em STATIC_DIR
+    hash: str
+    bytes: int
+    src_mtime_ns: int    # origem da publicação (detecta troca do arquivo)
+    src_size: int
+
+    @property
+    def url(self) -> str:
+        return f"{URL_PREFIX}/{self.file}?v={self.hash}"
+
+
+class Manifest:
+    """Chave lógica → Asset publicado. Thread-safe (prefetcher das cartas)."""
+
+    def __init__(self, static_dir: str = STATIC_DIR):
+        self.static_dir = static_dir
+        self.path = os.path.join(static_dir, MANIFEST_NAME)
+        self._assets = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._assets = {k: Asset(**v) for k, v in json.load(f).items()}
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def items(self):
+        with self._lock:
+            return sorted(self._assets.items())
+
+    def get(self, key: str, src: str, build=None) -> Asset | None:
+        """
+        Asset de `src` publicado sob `key`; None se a origem não existe.
+        build(src) -> caminho do arquivo a publicar (ex.: derivado JPEG);
+        sem build, publica a própria origem.
+        """
+        try:
+            st = os.stat(src)
+        except OSError:
+            return None
+        asset = self._assets.get(key)
+        if asset is not None and asset.src_mtime_ns == st.st_mtime_ns and asset.src_size == st.st_size \
+                and os.path.exists(os.path.join(self.static_dir, asset.file)):
+            return asset
+
+        asset = self._publish(build(src) if build else src, src, st)
+        with self._lock:
+            self._assets[key] = asset
+            self.save()
+        return asset
+
+    def _publish(self, path: str, src: str, src_stat) -> Asset:
+        """Copia `path` para STATIC_DIR como "{nome da origem}.{hash}{ext}"."""
+        h = images.content_hash(path)
+        stem = os.path.splitext(os.path.basename(src))[0]
+        name = f"{stem}.{h}{os.path.splitext(path)[1]}"
+        out = os.path.join(self.static_dir, name)
+        if not os.path.exists(out):
+            os.makedirs(self.static_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.static_dir, suffix=".part")
+            os.close(fd)
+            try:
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, out)
+            except BaseException:
+                os.remove(tmp)
+                raise
+        return Asset(name, h, os.path.getsize(out), src_stat.st_mtime_ns, src_stat.st_size)
+
+    def save(self):
+        """Grava o manifest (troca atômica; chamado com o lock)."""
+        os.makedirs(self.static_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.static_dir, suffix=".part")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({k: asdict(a) for k, a in sorted(self._assets.items())}, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def prune(self) -> list[str]:
+        """Remove de STATIC_DIR os arquivos que o manifest não referencia mais."""
+        with self._lock:
+            keep = {a.file for a in self._assets.values()} | {MANIFEST_NAME}
+        removed = []
+        for name in os.listdir(self.static_dir):
+            if name not in keep:
+                os.remove(os.path.join(self.static_dir, name))
+                removed.append(name)
+        return removed
+
+
+def card_key(card_id, width: int) -> str:
+    return f"cards/{card_id}@{width}"
+
+
+def logo_asset(manifest: Manifest) -> Asset | None:
+    """O próprio LOGO_PATH, publicado sem derivado."""
+    return manifest.get(LOGO_KEY, LOGO_PATH)
+
+
+def card_asset(manifest: Manifest, card_id, image: str, width: int) -> Asset | None:
+    """Derivado JPEG da carta (clinic.images) publicado em STATIC_DIR."""
+    if not image:
+        return None
+    return manifest.get(card_key(card_id, width), image,
+                        build=lambda src: images.build_variant(src, images.pick_width(width)))
@@ -0,0 +1,143 @@
+"""
+Agregados mantidos incrementalmente (cabeçalho "Resumo" dos Relatórios).
+
+Três tabelas, todas por paciente:
+- summary_client: contagem e somas usadas nas médias do Resumo;
+- summary_card:   contagem/soma/mín/máx do total por carta;
+- summary_domain: contagem/soma/mín/máx por domínio de pontuação.
+
+apply_attempts() roda na MESMA transação do INSERT das tentativas;
+rebuild() recalcula tudo a partir de `attempts` (backfill/reparo).
+Nenhuma das duas faz commit — quem chama controla a transação.
+As tabelas são criadas pela migração 4 (clinic.migrations), única fonte do DDL.
+"""
+
+from clinic import queries as q
+
+DOMAINS = ("detection", "clues", "cog_empathy", "action", "communication", "safety")
+
+ALT_VALID = "Alternativa válida"
+
+_UPSERT_CLIENT = """
+    INSERT INTO summary_client (client_id, n_attempts, sum_total, sum_hint_level, sum_prompts_red, n_alt_valid)
+    VALUES (?,?,?,?,?,?)
+    ON CONFLICT(client_id) DO UPDATE SET
+        n_attempts = n_attempts + excluded.n_attempts,
+        sum_total = sum_total + excluded.sum_total,
+        sum_hint_level = sum_hint_level + excluded.sum_hint_level,
+        sum_prompts_red = sum_prompts_red + excluded.sum_prompts_red,
+        n_alt_valid = n_alt_valid + excluded.n_alt_valid
+"""
+
+_UPSERT_CARD = """
+    INSERT INTO summary_card (client_id, card_id, n_attempts, sum_total, min_total, max_total)
+    VALUES (?,?,?,?,?,?)
+    ON CONFLICT(client_id, card_id) DO UPDATE SET
+        n_attempts = n_attempts + excluded.n_attempts,
+        sum_total = sum_total + excluded.sum_total,
+        min_total = MIN(min_total, excluded.min_total),
+        max_total = MAX(max_total, excluded.max_total)
+"""
+
+_UPSERT_DOMAIN = """
+    INSERT INTO summary_domain (client_id, domain, n, sum_score, min_score, max_score)
+    VALUES (?,?,?,?,?,?)
+    ON CONFLICT(client_id, domain) DO UPDATE SET
+        n = n + excluded.n,
+        sum_score = sum_score + excluded.sum_score,
+        min_score = MIN(min_score, excluded.min_score),
+        max_score = MAX(max_score, excluded.max_score)
+"""
+
+
+def apply_attempts(conn, client_id: int, attempts):
+    """Soma as tentativas recém-inseridas (clinic.writer.AttemptRecord) aos agregados."""
+    attempts = list(attempts)
+    if not attempts:
+        return
+
+    conn.execute(_UPSERT_CLIENT, (
+        client_id,
+        len(attempts),
+        sum(a.total for a in attempts),
+        sum(a.hint_level for a in attempts),
+        sum(a.prompts_red for a in attempts),
+        sum(1 for a in attempts if a.response_class == ALT_VALID),
+    ))
+
+    by_card = {}
+    for a in attempts:
+        by_card.setdefault(a.card_id, []).append(a.total)
+    conn.executemany(_UPSERT_CARD, [
+        (client_id, card_id, len(totals), sum(totals), min(totals), max(totals))
+        for card_id, totals in by_card.items()
+    ])
+
+    rows = []
+    for domain in DOMAINS:
+        scores = [getattr(a, domain) for a in attempts]
+        rows.append((client_id, domain, len(scores), sum(scores), min(scores), max(scores)))
+    conn.executemany(_UPSERT_DOMAIN, rows)
+
+
+def rebuild(conn, client_id: int | None = None):
+    """Recalcula os agregados a partir de `attempts` (todos os pacientes ou só um)."""
+    where = "WHERE s.client_id = ?" if client_id is not None else ""
+    params = (client_id,) if client_id is not None else ()
+    for table in ("summary_client", "summary_card", "summary_domain"):
+        if client_id is None:
+            conn.execute(f"DELETE FROM {table}")
+        else:
+            conn.execute(f"DELETE FROM {table} WHERE client_id = ?", params)
+
+    conn.execute(f"""
+        INSERT INTO summary_client (client_id, n_attempts, sum_total, sum_hint_level, sum_prompts_red, n_alt_valid)
+        SELECT s.client_id, COUNT(*), SUM(a.total), SUM(a.hint_level),
+               SUM(COALESCE(a.prompts_red, 0)), SUM(a.response_class = '{ALT_VALID}')
+        FROM attempts a JOIN sessions s ON s.id = a.session_id
+        {where}
+        GROUP BY s.client_id
+    """, params)
+
+    conn.execute(f"""
+        INSERT INTO summary_card (client_id, card_id, n_attempts, sum_total, min_total, max_total)
+        SELECT s.client_id, a.card_id, COUNT(*), SUM(a.total), MIN(a.total), MAX(a.total)
+        FROM attempts a JOIN sessions s ON s.id = a.session_id
+        {where}
+        GROUP BY s.client_id, a.card_id
+    """, params)
+
+    for domain in DOMAINS:
+        conn.execute(f"""
+            INSERT INTO summary_domain (client_id, domain, n, sum_score, min_score, max_score)
+            SELECT s.client_id, '{domain}', COUNT(*), SUM(a.{domain}), MIN(a.{domain}), MAX(a.{domain})
+            FROM attempts a JOIN sessions s ON s.id = a.session_id
+            {where}
+            GROUP BY s.client_id
+        """, params)
+
+
+# =========================
+# Leitura (uma linha por paciente / por domínio)
+# =========================
+def get_client_summary(conn, client_id: int) -> dict | None:
+    row = conn.execute(q.SUMMARY_CLIENT, (client_id,)).fetchone()
+    if row is None or row[0] == 0:
+        return None
+    n, sum_total, sum_hint, sum_red, n_alt = row
+    return {
+        "n_attempts": n,
+        "mean_total": sum_total / n,
+        "mean_hint_level": sum_hint / n,
+        "mean_prompts_red": sum_red / n,
+        "pct_alt_valid": n_alt / n * 100,
+    }
+
+
+def get_domain_summary(conn, client_id: int) -> list[dict]:
+    rows = conn.execute(q.SUMMARY_DOMAINS, (client_id,)).fetchall()
+    order = {d: i for i, d in enumerate(DOMAINS)}
+    return [
+        {"domain": d, "mean": s / n if n else 0.0, "min": lo, "max": hi}
+        for d, n, s, lo, hi in sorted(rows, key=lambda r: order.get(r[0], len(order)))
+    ]
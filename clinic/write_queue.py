@@ -0,0 +1,169 @@
+"""
+Escritor único em segundo plano para o clinic.db.
+
+Todas as gravações do app viram jobs `job(conn) -> resultado` numa fila; uma
+thread dona da única conexão de escrita pega o que estiver na fila (até
+max_batch), roda cada job num SAVEPOINT e faz UM commit para o lote inteiro
+(group commit). submit() devolve um Future: quem chama decide se espera a
+confirmação ou segue em frente.
+
+Como só esta thread escreve, sessões do Streamlit nunca disputam o lock de
+escrita entre si; leituras continuam no pool (WAL: não bloqueiam o escritor).
+Um job que falha desfaz só o próprio SAVEPOINT; os outros do lote seguem.
+Jobs não fazem commit nem abrem transação (use writer.insert_*).
+
+PeriodicJob repõe um job na fila de tempos em tempos (ex.: calibração das
+cartas), em pedaços: as gravações das sessões entram entre um e outro.
+"""
+import queue
+import threading
+from concurrent.futures import Future
+
+from clinic.db import connect
+from clinic.profiling import stage
+
+_STOP = object()
+# etapa do profiling (clinic.profiling) de quem espera em write(): fila + lote + commit
+WAIT_STAGE = "fila: espera da confirmação do escritor"
+
+
+class WriteQueue:
+    def __init__(self, path: str, max_batch: int = 64, linger: float = 0.002):
+        """
+        linger: depois do 1º job, espera até esse tempo (s) por mais jobs para
+        o mesmo commit. Sob carga a fila já enche durante o commit anterior.
+        """
+        self.max_batch = max_batch
+        self.linger = linger
+        self._conn = connect(path)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="clinic-writer", daemon=True)
+        self._thread.start()
+        # estatísticas (lidas pelos benchmarks)
+        self.batches = 0
+        self.jobs = 0
+
+    def submit(self, job) -> Future:
+        """Agenda `job(conn)`; o Future resolve com o retorno do job após o commit."""
+        future = Future()
+        self._queue.put((job, future))
+        return future
+
+    def write(self, job, timeout: float | None = None):
+        """
+        submit() + espera a confirmação (ou a exceção do job). Estourar o
+        timeout não cancela o job: ele ainda grava depois.
+        """
+        future = self.submit(job)
+        with stage(WAIT_STAGE):
+            return future.result(timeout)
+
+    def close(self, timeout: float | None = None):
+        """Grava o que já está na fila e encerra a thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._conn.close()
+
+    # =========================
+    # Thread do escritor
+    # =========================
+    def _next_batch(self) -> tuple[list, bool]:
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=self.linger) if self.linger else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if batch:
+                self._commit(batch)
+
+    def _commit(self, batch: list):
+        conn = self._conn
+        done = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for job, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT job")
+                try:
+                    result = job(conn)
+                except BaseException as e:
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    done.append((future, None, e))
+                else:
+                    conn.execute("RELEASE job")
+                    done.append((future, result, None))
+            conn.commit()
+        except BaseException as e:
+            # BEGIN/commit falhou (ex.: outro processo segurando o lock além do busy_timeout)
+            if conn.in_transaction:
+                conn.rollback()
+            for _, future in batch:
+                if future.running() or (not future.done() and future.set_running_or_notify_cancel()):
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.jobs += len(done)
+        for future, result, error in done:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+class PeriodicJob:
+    """
+    Thread que, `delay` s depois de iniciar e então a cada `interval` s, agenda
+    `job(conn)` na fila e o repete enquanto ele devolver True ("ainda há mais").
+    Um erro só fica em last_error; a próxima rodada tenta de novo.
+    """
+
+    def __init__(self, writer: WriteQueue, job, interval: float, delay: float = 0.0,
+                 name: str = "clinic-periodic"):
+        self.writer = writer
+        self.job = job
+        self.interval = interval
+        self.delay = delay
+        self._stop = threading.Event()
+        # estatísticas (painel DEV_MODE / benchmarks)
+        self.runs = 0
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def run_once(self):
+        while self.writer.write(self.job):
+            if self._stop.is_set():
+                return
+
+    def _run(self):
+        if self._stop.wait(self.delay):
+            return
+        while True:
+            try:
+                self.run_once()
+                self.last_error = None
+            except Exception as e:   # ex.: banco ocupado por outro processo além do busy_timeout
+                self.last_error = e
+            self.runs += 1
+            if self._stop.wait(self.interval):
+                return
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
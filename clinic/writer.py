@@ -0,0 +1,139 @@
+"""
+Gravação de sessões: registros tipados + uma transação + um executemany.
+
+As strings SQL são constantes (clinic.queries), então cada conexão do pool
+reaproveita o statement já preparado no cache do sqlite3 entre chamadas.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+from clinic import queries as q
+from clinic import report_cache
+from clinic import summary
+from clinic.db import transaction
+
+# faixa válida de cada campo pontuado (ver Manual, seção 6)
+SCORE_RANGES = {
+    "hint_level": (0, 3),
+    "detection": (0, 2),
+    "clues": (0, 2),
+    "cog_empathy": (0, 2),
+    "action": (0, 3),
+    "communication": (0, 1),
+    "safety": (0, 2),
+}
+
+RESPONSE_CLASSES = ("Alvo", "Parcial", "Alternativa válida", "Inadequada")
+
+
+@dataclass(frozen=True, slots=True)
+class AttemptRecord:
+    card_id: int
+    hint_level: int
+    detection: int
+    clues: int
+    cog_empathy: int
+    action: int
+    communication: int
+    safety: int
+    total: int
+    notes: str = ""
+    prompts_green: int = 0
+    prompts_yellow: int = 0
+    prompts_red: int = 0
+    reformulations: int = 0
+    response_class: str = "Alvo"
+    alt_logic: str = ""
+    alt_diff: str = ""
+
+    def __post_init__(self):
+        for field, (lo, hi) in SCORE_RANGES.items():
+            v = getattr(self, field)
+            if not lo <= v <= hi:
+                raise ValueError(f"carta {self.card_id}: {field}={v} fora de {lo}–{hi}")
+        expected = sum(getattr(self, d) for d in summary.DOMAINS)
+        if self.total != expected:
+            raise ValueError(f"carta {self.card_id}: total={self.total} difere da soma dos domínios ({expected})")
+        if self.response_class not in RESPONSE_CLASSES:
+            raise ValueError(f"carta {self.card_id}: response_class inválida: {self.response_class!r}")
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "AttemptRecord":
+        """Aceita o dict de `st.session_state.session_attempts` (ou uma linha de CSV)."""
+        scores = {k: int(d[k]) for k in summary.DOMAINS}
+        total = d.get("total")
+        return cls(
+            card_id=int(d["card_id"]),
+            hint_level=int(d["hint_level"]),
+            total=int(total) if total not in (None, "") else sum(scores.values()),
+            notes=(d.get("notes") or "").strip(),
+            prompts_green=int(d.get("prompts_green") or 0),
+            prompts_yellow=int(d.get("prompts_yellow") or 0),
+            prompts_red=int(d.get("prompts_red") or 0),
+            reformulations=int(d.get("reformulations") or 0),
+            response_class=d.get("response_class") or "Alvo",
+            alt_logic=d.get("alt_logic") or "",
+            alt_diff=d.get("alt_diff") or "",
+            **scores,
+        )
+
+    def row(self, session_id: int) -> tuple:
+        """Tupla na ordem de q.INSERT_ATTEMPT."""
+        return (
+            session_id, self.card_id, self.hint_level,
+            self.detection, self.clues, self.cog_empathy, self.action, self.communication, self.safety,
+            self.total, self.notes,
+            self.prompts_green, self.prompts_yellow, self.prompts_red, self.reformulations,
+            self.response_class, self.alt_logic, self.alt_diff,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SessionRecord:
+    client_id: int
+    mode: str
+    attempts: tuple[AttemptRecord, ...]
+    session_notes: str = ""
+    created_at: str = ""   # ISO; vazio = agora
+
+    def __post_init__(self):
+        if not self.attempts:
+            raise ValueError("sessão sem tentativas")
+
+
+# =========================
+# insert_*: só os INSERTs, dentro da transação de quem chama (jobs da
+# clinic.write_queue); só bulk_import, fora do app, abre a própria transação.
+# =========================
+def insert_client(conn, nickname: str, age_group: str, notes: str = "") -> int:
+    cur = conn.execute(q.INSERT_CLIENT, (nickname.strip(), age_group, notes.strip(), datetime.now().isoformat()))
+    return cur.lastrowid
+
+
+def _insert(conn, sessions) -> list[int]:
+    """Insere dentro da transação corrente. Retorna os IDs das sessões."""
+    session_ids, attempt_rows, client_ids = [], [], set()
+    for s in sessions:   # pode ser um gerador (tools.import_sessions): uma passada só
+        cur = conn.execute(q.INSERT_SESSION, (
+            s.client_id, s.created_at or datetime.now().isoformat(), s.mode, s.session_notes.strip()
+        ))
+        session_ids.append(cur.lastrowid)
+        attempt_rows.extend(a.row(cur.lastrowid) for a in s.attempts)
+        summary.apply_attempts(conn, s.client_id, s.attempts)
+        client_ids.add(s.client_id)
+    conn.executemany(q.INSERT_ATTEMPT, attempt_rows)
+    report_cache.bump_versions(conn, client_ids)
+    return session_ids
+
+
+def insert_session(conn, session: SessionRecord) -> int:
+    return _insert(conn, [session])[0]
+
+
+def bulk_import(conn, sessions) -> list[int]:
+    """
+    Importa muitas sessões (ex.: digitalização de prontuários em papel) numa
+    transação só: ou entram todas, ou nenhuma.
+    """
+    with transaction(conn):
+        return _insert(conn, sessions)
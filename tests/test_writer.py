@@ -0,0 +1,61 @@
+from clinic import report_cache
+from clinic.db import open_pool, transaction
+from clinic.writer import AttemptRecord, SessionRecord, bulk_import, insert_client, insert_session
+
+
+def _attempt(card_id: int) -> AttemptRecord:
+    return AttemptRecord(card_id=card_id, hint_level=0, detection=1, clues=1, cog_empathy=1,
+                         action=1, communication=1, safety=1, total=6)
+
+
+def _session(client_id: int) -> SessionRecord:
+    return SessionRecord(client_id=client_id, mode="avaliacao", attempts=(_attempt(1), _attempt(2)),
+                         created_at="2020-01-01T10:00:00")
+
+
+def _pool(tmp_path):
+    pool = open_pool(str(tmp_path / "clinic.db"), size=1)
+    with pool.connection() as conn, transaction(conn):
+        ids = [insert_client(conn, f"P{i}", "adulto") for i in range(3)]
+    return pool, ids
+
+
+def _versions(conn, ids):
+    return [report_cache.get_version(conn, cid) for cid in (report_cache.CLINIC, *ids)]
+
+
+def test_bump_versions_dedupes_and_bumps_clinic(tmp_path):
+    pool, (a, b, c) = _pool(tmp_path)
+    with pool.connection() as conn, transaction(conn):
+        report_cache.bump_versions(conn, [a, a, b])
+    with pool.connection() as conn:
+        assert _versions(conn, (a, b, c)) == [1, 1, 1, 0]
+    pool.close()
+
+
+def test_bump_versions_without_clients_is_a_no_op(tmp_path):
+    pool, ids = _pool(tmp_path)
+    with pool.connection() as conn, transaction(conn):
+        report_cache.bump_versions(conn, [])
+    with pool.connection() as conn:
+        assert _versions(conn, ids) == [0, 0, 0, 0]
+    pool.close()
+
+
+def test_insert_session_bumps_its_client(tmp_path):
+    pool, (a, b, c) = _pool(tmp_path)
+    with pool.connection() as conn, transaction(conn):
+        insert_session(conn, _session(a))
+    with pool.connection() as conn:
+        assert _versions(conn, (a, b, c)) == [1, 1, 0, 0]
+    pool.close()
+
+
+def test_bulk_import_from_a_generator_bumps_versions(tmp_path):
+    # tools.import_sessions passa um gerador: _insert só pode percorrê-lo uma vez
+    pool, (a, b, c) = _pool(tmp_path)
+    with pool.connection() as conn:
+        ids = bulk_import(conn, (_session(cid) for cid in (a, b, a)))
+        assert len(ids) == 3
+        assert _versions(conn, (a, b, c)) == [1, 1, 1, 0]
+    pool.close()
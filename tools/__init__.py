@@ -0,0 +1 @@
+"""Ferramentas de linha de comando (benchmarks, verificações, manutenção do banco)."""
@@ -0,0 +1,93 @@
+"""
+Tempo da seção "Evolução" dos Relatórios (clinic.analytics) para pacientes
+com milhares de tentativas: cálculo a frio (sem cache) no próprio processo e
+o rerun da página inteira (AppTest, cache quente) via tools.rerun_bench.
+
+    python -m tools.analytics_bench
+    python -m tools.analytics_bench --attempts 2000 20000 --budget-ms 100
+
+Sai com 1 se o cálculo a frio ou o p95 do rerun passar de --budget-ms.
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from clinic import analytics
+from clinic import queries as q
+from tools.rerun_bench import DATA_DIR, measure
+from tools.synth import build_synthetic_db
+
+DEFAULT_BUDGET_MS = 100
+ATTEMPTS_PER_SESSION = 10
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000)
+    return statistics.median(times)
+
+
+def compute_ms(df: pd.DataFrame, repeat: int) -> dict:
+    """Mediana (ms) de cada passo sem cache, na ordem em que a página chama."""
+    trends = analytics.session_trends(df)
+    return {
+        "session_trends": _median_ms(lambda: analytics.session_trends(df), repeat),
+        "prompt_dependence": _median_ms(lambda: analytics.prompt_dependence(df), repeat),
+        "domain_slopes": _median_ms(lambda: analytics.domain_slopes(trends), repeat),
+        "trend_chart": _median_ms(lambda: analytics.trend_chart(trends), repeat),
+    }
+
+
+def prepare(n_attempts: int, data_dir: str) -> str:
+    """Banco com 2 pacientes de n_attempts tentativas cada (paciente 1 é o medido)."""
+    sessions = max(1, n_attempts // ATTEMPTS_PER_SESSION)
+    path = os.path.join(data_dir, f"analytics_{n_attempts}.db")
+    if not os.path.exists(path):
+        build_synthetic_db(path, 2, sessions, ATTEMPTS_PER_SESSION).close()
+    return path
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--attempts", type=int, nargs="+", default=[1_000, 5_000, 10_000],
+                    help="tentativas do paciente medido")
+    ap.add_argument("--repeat", type=int, default=7, help="repetições do cálculo a frio")
+    ap.add_argument("--runs", type=int, default=15, help="reruns medidos da página")
+    ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    ap.add_argument("--no-page", action="store_true", help="só o cálculo (sem AppTest)")
+    ap.add_argument("--data-dir", default=DATA_DIR)
+    args = ap.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    over = []
+    print(f"{'tentativas':>10}{'sessões':>9}{'cálculo ms':>12}{'rerun p95':>11}{'1º rerun':>10}")
+    for n in args.attempts:
+        db = prepare(n, args.data_dir)
+        conn = sqlite3.connect(db)
+        df = pd.read_sql_query(q.CLIENT_ATTEMPTS, conn, params=(1,))
+        conn.close()
+        steps = compute_ms(df, args.repeat)
+        cold = sum(steps.values())
+        page = {} if args.no_page else measure("relatorios", db, None, args.runs)
+        p95 = page.get("p95_ms", 0.0)
+        print(f"{len(df):>10}{df['session_id'].nunique():>9}{cold:>12.1f}"
+              f"{p95:>11.1f}{page.get('first_ms', 0.0):>10.0f}")
+        print("           " + " · ".join(f"{k} {v:.1f}" for k, v in steps.items()))
+        if cold > args.budget_ms or p95 > args.budget_ms:
+            over.append(n)
+
+    for n in over:
+        print(f"ACIMA DO ORÇAMENTO ({args.budget_ms:.0f} ms): paciente com {n} tentativas")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
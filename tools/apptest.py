@@ -0,0 +1,41 @@
+"""
+AppTest (Streamlit 1.36) para o app multipágina com st.navigation.
+
+No 1.36 o AppTest não tem cache de scripts — st.Page("views/x.py") executaria
+um script vazio — e switch_page() calcula o hash da página pelo caminho do
+arquivo, enquanto o st.navigation usa o url_path. Os dois ajustes ficam aqui,
+isolados, para os benchmarks em tools/.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ("pacientes", "sessao", "relatorios", "clinica", "manual")   # url_path de cada st.Page
+
+
+def _page_bytecode(self, script_path: str):
+    with open(script_path, "r", encoding="utf-8") as f:
+        return compile(f.read(), script_path, "exec")
+
+
+def switch_page(at, page: str):
+    """Próximo at.run() renderiza `page` (url_path, ex.: "sessao")."""
+    from streamlit.util import calc_md5
+
+    at._page_hash = calc_md5(page)
+    return at
+
+
+def app_test(page: str = "pacientes", timeout: float = 60, **session_state):
+    """AppTest do app.py já apontado para `page`; kwargs viram st.session_state."""
+    from streamlit.runtime.pages_manager import PagesManager
+    from streamlit.testing.v1 import AppTest
+
+    PagesManager.get_page_script_byte_code = _page_bytecode
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=timeout)
+    for key, value in session_state.items():
+        at.session_state[key] = value
+    return switch_page(at, page)
@@ -0,0 +1,43 @@
+"""
+Pré-gera os derivados de todas as cartas (clinic.images) — útil no build do
+container para que nenhum terapeuta pague a conversão no primeiro acesso.
+
+    python -m tools.build_card_images
+"""
+import argparse
+import json
+import os
+import time
+
+from clinic import images
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cards", default=os.path.join("data", "cards.json"))
+    args = ap.parse_args()
+
+    with open(args.cards, "r", encoding="utf-8") as f:
+        cards = json.load(f)
+
+    t0 = time.perf_counter()
+    src_bytes = out_bytes = built = 0
+    for card in cards:
+        path = card.get("image", "")
+        if not path or not os.path.exists(path):
+            print(f"carta {card.get('id')}: imagem ausente ({path})")
+            continue
+        src_bytes += os.path.getsize(path)
+        for width in images.VARIANT_WIDTHS:
+            out = images.build_variant(path, width)
+            out_bytes += os.path.getsize(out) if width == images.pick_width(960) else 0
+            built += 1
+
+    print(
+        f"{built} derivados em {images.CACHE_DIR} ({time.perf_counter() - t0:.1f}s); "
+        f"originais {src_bytes / 1e6:.1f} MB → variante 960px {out_bytes / 1e6:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
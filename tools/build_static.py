@@ -0,0 +1,49 @@
+"""
+Publica em static/ (clinic.static_assets) o logo e o derivado de cada carta
+na largura de exibição, grava o manifest.json e remove arquivos de versões
+anteriores. Rodar no build/release, depois de atualizar cards.json ou imagens.
+Sai com 1 se faltar alguma imagem de origem (logo ou carta).
+
+    python -m tools.build_static
+    CARD_IMAGE_WIDTH=480 python -m tools.build_static --no-prune
+"""
+import argparse
+import json
+import sys
+import time
+
+from clinic import static_assets
+from clinic.catalog import CARDS_PATH, build_catalog
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cards", default=CARDS_PATH)
+    ap.add_argument("--width", type=int, default=static_assets.CARD_IMAGE_WIDTH, help="largura de exibição das cartas")
+    ap.add_argument("--no-prune", action="store_true", help="mantém arquivos que o manifest não usa mais")
+    args = ap.parse_args()
+
+    with open(args.cards, "r", encoding="utf-8") as f:
+        catalog = build_catalog(json.load(f))
+
+    t0 = time.perf_counter()
+    manifest = static_assets.Manifest()
+    missing = []
+    if not static_assets.logo_asset(manifest):
+        missing.append(static_assets.LOGO_PATH)
+    for cid in catalog.ids:
+        card = catalog.get(cid)
+        if not static_assets.card_asset(manifest, cid, card.image, args.width):
+            missing.append(f"carta {cid}: {card.image or '—'}")
+
+    removed = [] if args.no_prune else manifest.prune()
+    files = {a.file: a.bytes for _, a in manifest.items()}
+    print(f"{len(manifest)} assets → {len(files)} arquivos ({sum(files.values()) / 1e6:.1f} MB) em "
+          f"{static_assets.STATIC_DIR} ({time.perf_counter() - t0:.1f}s); {len(removed)} removidos")
+    for m in missing:
+        print(f"  ausente: {m}")
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Calibração empírica das cartas (clinic.calibration) fora do app — cron ou
+manutenção. Só lê as tentativas novas desde a última rodada; um lote por
+transação.
+
+    python -m tools.calibrate_cards                    # db/clinic.db
+    python -m tools.calibrate_cards --db outro.db --batch 100000
+    python -m tools.calibrate_cards --rebuild          # zera e refaz do início (reparo)
+"""
+import argparse
+import os
+import time
+
+from clinic import calibration
+from clinic.db import open_pool, transaction
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--db", default=os.path.join("db", "clinic.db"))
+    ap.add_argument("--batch", type=int, default=calibration.BATCH, help="tentativas por transação")
+    ap.add_argument("--rebuild", action="store_true", help="descarta a calibração atual antes de rodar")
+    args = ap.parse_args()
+
+    pool = open_pool(args.db, size=1)
+    with pool.connection() as conn:
+        if args.rebuild:
+            with transaction(conn):
+                calibration.rebuild(conn)
+
+        t = time.perf_counter()
+        total = batches = 0
+        while True:
+            with transaction(conn):
+                n = calibration.calibrate(conn, args.batch)
+            total += n
+            batches += 1
+            if n < args.batch:
+                break
+        elapsed = time.perf_counter() - t
+        cards = conn.execute("SELECT COUNT(*) FROM card_calibration").fetchone()[0]
+        watermark = calibration.get_watermark(conn)
+    pool.close()
+    print(f"{total} tentativas novas em {batches} lote(s), {elapsed:.2f}s — "
+          f"{cards} cartas calibradas, marca d'água = tentativa {watermark}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Inventário das imagens do repositório: hash do conteúdo, hash perceptual,
+dimensões e bytes de cada arquivo, gravados em assets/manifest.json.
+
+Falha (exit 1) se:
+- uma carta do cards.json aponta para imagem que não está no manifest;
+- há imagem órfã (nenhuma carta nem o logo usam);
+- há duplicatas exatas (mesmo sha256) ou quase-duplicatas (dHash 16×16 a
+  até --near bits de distância: reexportação, redimensionamento, JPEG).
+
+    python -m tools.check_assets            # reescreve o manifest e confere
+    python -m tools.check_assets --check    # CI: também falha se o manifest estiver desatualizado
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+
+from clinic.static_assets import LOGO_PATH
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+# gerados/ignorados pelo git: não fazem parte do conjunto publicado
+SKIP_DIRS = {".git", ".cache", "static", "db", "__pycache__", ".venv", "venv"}
+MANIFEST = os.path.join("assets", "manifest.json")
+
+HASH_SIZE = 16          # dHash 16×16 = 256 bits
+NEAR_BITS = 10          # cartas diferentes do baralho ficam a ≥ 25 bits; reexportações a ≤ 2
+
+
+# =========================
+# Hashes
+# =========================
+def sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dhash(path: str, size: int = HASH_SIZE) -> tuple[str, int, int]:
+    """(dHash em hex, largura, altura): gradiente horizontal da miniatura em cinza."""
+    from PIL import Image
+
+    with Image.open(path) as im:
+        width, height = im.size
+        im.draft("L", (size * 4, size * 4))   # JPEG decodifica já reduzido
+        px = list(im.convert("L").resize((size + 1, size), Image.LANCZOS).getdata())
+    bits = 0
+    for r in range(size):
+        row = px[r * (size + 1):(r + 1) * (size + 1)]
+        for c in range(size):
+            bits = bits << 1 | (row[c] > row[c + 1])
+    return f"{bits:0{size * size // 4}x}", width, height
+
+
+def distance(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+# =========================
+# Inventário
+# =========================
+def find_images(root: str) -> list[str]:
+    """Caminhos relativos (com "/") de todas as imagens fora de SKIP_DIRS."""
+    out = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if name.lower().endswith(IMAGE_EXTS):
+                out.append(os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/"))
+    return out
+
+
+def build_manifest(root: str, previous: dict) -> dict:
+    """path → {sha256, dhash, width, height, bytes}; reaproveita o dHash se o sha256 não mudou."""
+    manifest = {}
+    for rel in find_images(root):
+        path = os.path.join(root, rel)
+        digest = sha256(path)
+        old = previous.get(rel)
+        if old and old["sha256"] == digest:
+            manifest[rel] = old
+            continue
+        ph, width, height = dhash(path)
+        manifest[rel] = {"sha256": digest, "dhash": ph, "width": width, "height": height,
+                         "bytes": os.path.getsize(path)}
+    return manifest
+
+
+def problems(manifest: dict, referenced: dict, near_bits: int) -> dict:
+    """{tipo: [mensagens]} — ausentes, órfãs, duplicatas exatas e quase-duplicatas."""
+    out = {"ausentes": [], "órfãs": [], "duplicatas": [], "quase-duplicatas": []}
+    for path, users in sorted(referenced.items()):
+        if path not in manifest:
+            out["ausentes"].append(f"{path} (usada por {', '.join(users)})")
+    for path, info in manifest.items():
+        if path not in referenced:
+            out["órfãs"].append(f"{path} ({info['bytes'] / 1e6:.1f} MB)")
+
+    by_sha = {}
+    for path, info in manifest.items():
+        by_sha.setdefault(info["sha256"], []).append(path)
+    for paths in by_sha.values():
+        if len(paths) > 1:
+            out["duplicatas"].append(" = ".join(sorted(paths)))
+
+    # um representante por conteúdo: duplicatas exatas já foram listadas acima
+    reps = sorted(paths[0] for paths in by_sha.values())
+    for a, b in itertools.combinations(reps, 2):
+        d = distance(manifest[a]["dhash"], manifest[b]["dhash"])
+        if d <= near_bits:
+            out["quase-duplicatas"].append(f"{a} ~ {b} ({d} bits)")
+    return out
+
+
+def referenced_images(cards_path: str) -> dict:
+    """path → [quem usa]: o campo image de cada carta e o logo da sidebar."""
+    refs = {LOGO_PATH.replace(os.sep, "/"): ["logo da sidebar"]}
+    with open(cards_path, "r", encoding="utf-8") as f:
+        for card in json.load(f):
+            image = (card.get("image") or "").replace("\\", "/")
+            if image:
+                refs.setdefault(os.path.normpath(image).replace(os.sep, "/"), []).append(f"carta {card.get('id')}")
+    return refs
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cards", default=os.path.join("data", "cards.json"))
+    ap.add_argument("--manifest", default=MANIFEST)
+    ap.add_argument("--near", type=int, default=NEAR_BITS, help="distância máx. (bits) para quase-duplicata")
+    ap.add_argument("--check", action="store_true", help="não grava; falha se o manifest estiver desatualizado")
+    args = ap.parse_args()
+
+    os.chdir(ROOT)
+    previous = {}
+    if os.path.exists(args.manifest):
+        with open(args.manifest, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    manifest = build_manifest(".", previous)
+    total = sum(i["bytes"] for i in manifest.values())
+    print(f"{len(manifest)} imagens, {total / 1e6:.1f} MB")
+
+    found = problems(manifest, referenced_images(args.cards), args.near)
+    stale = manifest != previous
+    if args.check:
+        if stale:
+            print(f"manifest desatualizado: rode python -m tools.check_assets ({args.manifest})")
+    elif stale:
+        with open(args.manifest, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"manifest gravado: {args.manifest}")
+
+    for kind, msgs in found.items():
+        if msgs:
+            print(f"{kind}: {len(msgs)}")
+            for m in msgs:
+                print(f"  {m}")
+    failed = any(found.values()) or (args.check and stale)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Regressão de planos de consulta: monta um banco sintético (padrão: 1M de
+tentativas), roda EXPLAIN QUERY PLAN em cada consulta de página e falha
+(exit 1) se alguma delas fizer varredura completa de tabela.
+
+Consultas que leem a tabela inteira de propósito ficam em FULL_SCAN_QUERIES,
+cada uma com a única tabela que pode ser percorrida e o motivo; qualquer
+outra varredura nelas (ex.: um SCAN por linha dentro do laço) ainda falha.
+
+    python -m tools.check_query_plans
+    python -m tools.check_query_plans --clients 200 --sessions 10 --attempts 10   # rápido
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from clinic import queries as q
+from clinic.directory import PAGE_SIZE, prefix_bounds
+from tools.synth import build_synthetic_db
+
+# nome -> (sql, params): nenhuma varredura completa
+PAGE_QUERIES = {
+    # cabeçalhos das páginas: Sessão (apelido), seletor (paciente ativo fora da página), Relatórios
+    "client_nickname": (q.CLIENT_NICKNAME, (1,)),
+    "client_row": (q.CLIENT_ROW, (1,)),
+    "client_version": (q.CLIENT_VERSION, (1,)),
+    "db_identity": (q.DB_IDENTITY, ()),
+    "summary_client": (q.SUMMARY_CLIENT, (1,)),
+    "summary_domains": (q.SUMMARY_DOMAINS, (1,)),
+    # directory.find_clients pede PAGE_SIZE + 1 linhas (a extra só indica se há próxima página)
+    "clients_prefix_page": (q.CLIENTS_PREFIX_PAGE, (*prefix_bounds("p0001"), PAGE_SIZE + 1, 0)),
+    "client_attempts": (q.CLIENT_ATTEMPTS, (1,)),
+    "clinic_attempts_range": (
+        q.CLINIC_ATTEMPTS.format(where="WHERE s.created_at >= ? AND s.created_at < ?"),
+        ("2020-03-01", "2020-04-01"),
+    ),
+    # visão da clínica com período (idx_sessions_created) e com cartas (idx_attempts_card)
+    "cohort_groups_range": (
+        q.COHORT_GROUPS.format(dim="c.age_group", where="WHERE s.created_at >= ? AND s.created_at < ?"),
+        ("2020-03-01", "2020-04-01"),
+    ),
+    "cohort_months_cards": (
+        q.COHORT_MONTHS.format(where="WHERE a.card_id IN (?, ?)"),
+        (3, 7),
+    ),
+    # rascunho da sessão (idx_sessions_draft parcial / idx_journal_session)
+    "open_draft": (q.OPEN_DRAFT, (1,)),
+    "draft_journal": (q.DRAFT_JOURNAL, (1,)),
+    "draft_client": (q.DRAFT_CLIENT, (1,)),
+    # calibração das cartas: marca d'água (a Sessão lê a cada rerun) e só as tentativas depois dela
+    "calibration_state": (q.CALIBRATION_STATE, ()),
+    "calibration_new_attempts": (q.CALIBRATION_NEW_ATTEMPTS, (1000, 50_000)),
+    "calibration_ability": (q.CALIBRATION_ABILITY.format(marks="?,?"), (1, 2)),
+}
+
+# nome -> (sql, params, alias que pode ser percorrido, motivo). As demais tabelas
+# precisam entrar por busca em índice a partir dele.
+_CLINIC_WIDE = "sem filtro a página/exportação agrega todas as tentativas: cada linha é lida uma vez"
+_LOW_CARD = "filtro de baixa cardinalidade: percorre a tabela filtrada uma vez, o resto por índice"
+FULL_SCAN_QUERIES = {
+    "clients_page": (
+        q.CLIENTS_PAGE, (PAGE_SIZE + 1, 0), "clients",
+        "lista sem busca: percorre a PK em ordem e para no LIMIT",
+    ),
+    "cohort_groups_all": (q.COHORT_GROUPS.format(dim="c.age_group", where=""), (), "c", _CLINIC_WIDE),
+    "cohort_groups_all_cards": (
+        q.COHORT_GROUPS.format(dim="a.card_id", where=""), (), "a",
+        "agrupado por carta: percorre idx_attempts_card já na ordem do GROUP BY; sessões e pacientes pela PK",
+    ),
+    "cohort_months_all": (q.COHORT_MONTHS.format(where=""), (), "c", _CLINIC_WIDE),
+    # filtros de baixa cardinalidade (3 valores cada): um índice leria quase tudo de qualquer jeito
+    "cohort_groups_mode": (
+        q.COHORT_GROUPS.format(dim="c.age_group", where="WHERE s.mode IN (?)"), ("avaliacao",), "s", _LOW_CARD,
+    ),
+    "cohort_months_mode": (q.COHORT_MONTHS.format(where="WHERE s.mode IN (?)"), ("avaliacao",), "s", _LOW_CARD),
+    "cohort_groups_age": (
+        q.COHORT_GROUPS.format(dim="s.mode", where="WHERE c.age_group IN (?)"), ("adulto",), "c", _LOW_CARD,
+    ),
+    "cohort_months_age": (q.COHORT_MONTHS.format(where="WHERE c.age_group IN (?)"), ("adulto",), "c", _LOW_CARD),
+    # calibração das cartas: uma linha por carta, lida inteira de propósito
+    "calibration_stats": (
+        q.CALIBRATION_STATS, (), "card_calibration", "o job carrega as estatísticas de todas as cartas",
+    ),
+    "card_calibration": (
+        q.CARD_CALIBRATION, (), "card_calibration", "uma linha por carta, relida só quando o job move a marca d'água",
+    ),
+    "clinic_attempts_all": (
+        q.CLINIC_ATTEMPTS.format(where=""), (), "s",
+        "exportação da clínica inteira: sessões em ordem por idx_sessions_created, sem sort temporário",
+    ),
+}
+
+
+def full_scans(conn, sql: str, params) -> list[str]:
+    """
+    Linhas do plano que varrem uma tabela inteira ("SCAN x" sem índice de busca).
+    "SCAN (subquery-N)" / "SCAN <cte>" percorrem o resultado já agregado (janelas,
+    CTEs), não uma tabela do banco: não contam.
+    """
+    plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+    derived = {line.split(maxsplit=1)[1] for line in plan if line.startswith(("CO-ROUTINE ", "MATERIALIZE "))}
+    return [line for line in plan
+            if line.startswith("SCAN ") and "CONSTANT ROW" not in line and line[5:] not in derived]
+
+
+def check(conn, queries: dict) -> dict:
+    """Retorna {nome: [linhas ofensoras]} apenas para as consultas que falharam."""
+    failures = {}
+    for name, (sql, params) in queries.items():
+        scans = full_scans(conn, sql, params)
+        if scans:
+            failures[name] = scans
+    return failures
+
+
+def check_allowed(conn, queries: dict) -> dict:
+    """Como check(), mas cada consulta pode percorrer só o alias declarado em FULL_SCAN_QUERIES."""
+    failures = {}
+    for name, (sql, params, alias, _reason) in queries.items():
+        scans = [line for line in full_scans(conn, sql, params) if line.split()[1] != alias]
+        if scans:
+            failures[name] = scans
+    return failures
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--clients", type=int, default=2000)
+    ap.add_argument("--sessions", type=int, default=50, help="sessões por paciente")
+    ap.add_argument("--attempts", type=int, default=10, help="tentativas por sessão")
+    ap.add_argument("--db", help="reutiliza/cria o banco neste caminho em vez de um temporário")
+    args = ap.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "plans.db")
+    t0 = time.perf_counter()
+    conn = build_synthetic_db(path, args.clients, args.sessions, args.attempts)
+    n = conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0]
+    print(f"banco sintético: {n} tentativas ({time.perf_counter() - t0:.1f}s)")
+
+    failures = check(conn, PAGE_QUERIES)
+    for name in PAGE_QUERIES:
+        print(f"{'FALHOU' if name in failures else 'ok':>6}  {name}")
+        for line in failures.get(name, []):
+            print(f"        {line}")
+
+    allowed = check_allowed(conn, FULL_SCAN_QUERIES)
+    for name, (_sql, _params, alias, reason) in FULL_SCAN_QUERIES.items():
+        print(f"{'FALHOU' if name in allowed else 'ok':>6}  {name} — varre só {alias}: {reason}")
+        for line in allowed.get(name, []):
+            print(f"        {line}")
+    failures.update(allowed)
+    conn.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Exporta tentativas em streaming (memória constante), por paciente ou da clínica inteira.
+
+    python -m tools.export -o paciente42.csv --client 42
+    python -m tools.export -o clinica_2024.parquet --from 2024-01-01 --to 2024-12-31
+"""
+import argparse
+import os
+from datetime import date
+
+from clinic import export
+from clinic.db import open_pool
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-o", "--output", required=True, help="arquivo de saída (.csv ou .parquet)")
+    ap.add_argument("--db", default=os.path.join("db", "clinic.db"))
+    ap.add_argument("--client", type=int, help="só este paciente (padrão: todos)")
+    ap.add_argument("--from", dest="date_from", type=date.fromisoformat, help="AAAA-MM-DD (inclusive)")
+    ap.add_argument("--to", dest="date_to", type=date.fromisoformat, help="AAAA-MM-DD (inclusive)")
+    ap.add_argument("--chunk-size", type=int, default=export.CHUNK_SIZE)
+    args = ap.parse_args()
+
+    fmt = os.path.splitext(args.output)[1].lstrip(".").lower() or "csv"
+    if args.client is not None and (args.date_from or args.date_to):
+        ap.error("--client não combina com --from/--to")
+
+    pool = open_pool(args.db, size=1)
+    with pool.connection() as conn:
+        if args.client is not None:
+            columns, chunks = export.client_attempts(conn, args.client, args.chunk_size)
+        else:
+            columns, chunks = export.clinic_attempts(conn, args.date_from, args.date_to, args.chunk_size)
+        n = export.write_file(columns, chunks, args.output, fmt)
+    pool.close()
+    print(f"{n} tentativas exportadas para {args.output}")
+
+
+if __name__ == "__main__":
+    main()
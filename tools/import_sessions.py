@@ -0,0 +1,63 @@
+"""
+Importa sessões históricas de um CSV numa única transação (tudo ou nada).
+
+O CSV usa as mesmas colunas da exportação da clínica (tools.export):
+client_id, session_id, created_at, mode, card_id, hint_level, detection, clues,
+cog_empathy, action, communication, safety[, total, notes, prompts_*, ...].
+`session_id` só agrupa as linhas de uma mesma sessão (novos IDs são gerados);
+as linhas de cada sessão devem estar contíguas.
+
+    python -m tools.import_sessions prontuarios.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from itertools import groupby
+
+from clinic.db import open_pool
+from clinic.writer import AttemptRecord, SessionRecord, bulk_import
+
+
+def read_sessions(rows, known_clients: set):
+    seen = set()
+    for (client_id, key), group in groupby(rows, key=lambda r: (r["client_id"], r["session_id"])):
+        if (client_id, key) in seen:
+            raise ValueError(f"linhas da sessão {key} (paciente {client_id}) não estão contíguas")
+        seen.add((client_id, key))
+        if int(client_id) not in known_clients:
+            raise ValueError(f"paciente {client_id} não existe")
+
+        group = list(group)
+        first = group[0]
+        yield SessionRecord(
+            client_id=int(client_id),
+            mode=first["mode"],
+            created_at=first.get("created_at") or "",
+            session_notes=first.get("session_notes") or "",
+            attempts=tuple(AttemptRecord.from_dict(r) for r in group),
+        )
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("csv_path")
+    ap.add_argument("--db", default=os.path.join("db", "clinic.db"))
+    args = ap.parse_args()
+
+    pool = open_pool(args.db, size=1)
+    t0 = time.perf_counter()
+    try:
+        with pool.connection() as conn, open(args.csv_path, encoding="utf-8", newline="") as f:
+            known = {row[0] for row in conn.execute("SELECT id FROM clients")}
+            ids = bulk_import(conn, read_sessions(csv.DictReader(f), known))
+    except (ValueError, KeyError) as e:
+        sys.exit(f"importação cancelada (nada foi gravado): {e}")
+    finally:
+        pool.close()
+    print(f"{len(ids)} sessões importadas em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Simulação de carga: N terapeutas usando o mesmo clinic.db ao mesmo tempo,
+pelo mesmo código de acesso a dados do app (clinic.db/writer/directory/summary).
+
+Cada terapeuta repete, até acabar o tempo, uma mistura de operações:
+- create: Criar paciente (writer.insert_client)
+- save:   Salvar sessão com várias tentativas (writer.insert_session)
+- report: Relatórios (seletor paginado + tentativas + resumo)
+
+Modo "threads" = várias sessões num mesmo servidor Streamlit (um pool
+compartilhado); "processes" = vários servidores/réplicas no mesmo arquivo.
+Com --write-queue as gravações passam pela clinic.write_queue (escritor único
+com group commit, como no app) em vez de cada terapeuta abrir a própria
+transação; aí a espera de quem grava sai nas colunas "fila" (o lock de
+escrita fica com o escritor). Ao final confere se o banco tem exatamente o que as operações
+bem-sucedidas gravaram e se os resumos batem com as tentativas.
+
+    python -m tools.load_sim --therapists 8 --seconds 10
+    python -m tools.load_sim --therapists 8 --seconds 10 --write-queue
+    python -m tools.load_sim --mode processes --therapists 16 --mix create=1,save=5,report=4 --think-ms 50
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from clinic import directory
+from clinic import profiling
+from clinic import queries as q
+from clinic import summary
+from clinic.db import open_pool, transaction
+from clinic.write_queue import WAIT_STAGE, WriteQueue
+from clinic.writer import AttemptRecord, SessionRecord, insert_client, insert_session
+from tools.synth import AGE_GROUPS, MODES, N_CARDS, build_synthetic_db
+
+OPS = ("create", "save", "report")
+LOCK_STAGE = "db: espera do lock de escrita"
+
+
+def _random_attempt(rng) -> AttemptRecord:
+    scores = {"detection": rng.randint(0, 2), "clues": rng.randint(0, 2), "cog_empathy": rng.randint(0, 2),
+              "action": rng.randint(0, 3), "communication": rng.randint(0, 1), "safety": rng.randint(0, 2)}
+    return AttemptRecord(card_id=rng.randint(1, N_CARDS), hint_level=rng.randint(0, 3),
+                         total=sum(scores.values()), prompts_red=rng.randint(0, 2), **scores)
+
+
+# =========================
+# Operações (uma conexão emprestada do pool por operação, como numa página).
+# write(conn, job) grava direto numa transação ou pela fila do escritor.
+# =========================
+def write_direct(conn, job):
+    with transaction(conn):
+        return job(conn)
+
+
+def op_create(conn, rng, n_clients, write):
+    nickname, age_group = f"SIM{rng.randrange(10**6):06d}", rng.choice(AGE_GROUPS)
+    return write(conn, lambda c: insert_client(c, nickname, age_group))
+
+
+def op_save(conn, rng, n_clients, write):
+    record = SessionRecord(
+        client_id=rng.randint(1, n_clients),
+        mode=rng.choice(MODES),
+        attempts=tuple(_random_attempt(rng) for _ in range(rng.randint(5, 15))),
+    )
+    write(conn, lambda c: insert_session(c, record))
+    return len(record.attempts)
+
+
+def op_report(conn, rng, n_clients, write):
+    client_id = rng.randint(1, n_clients)
+    directory.find_clients(conn, "", rng.randint(0, 3))
+    rows = conn.execute(q.CLIENT_ATTEMPTS, (client_id,)).fetchall()
+    summary.get_client_summary(conn, client_id)
+    summary.get_domain_summary(conn, client_id)
+    return len(rows)
+
+
+def therapist(pool, seed: int, mix: list, seconds: float, think_ms: float, n_clients: int,
+              write=write_direct) -> list:
+    """
+    Loop de um terapeuta; devolve [(op, latência s, espera do lock s, erro|None,
+    resultado, espera na fila do escritor s)].
+    """
+    rng = random.Random(seed)
+    ops = {"create": op_create, "save": op_save, "report": op_report}
+    out = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        name = rng.choice(mix)
+        trace = profiling.start(name)
+        t = time.perf_counter()
+        error = result = None
+        try:
+            with pool.connection() as conn:
+                result = ops[name](conn, rng, n_clients, write)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        latency = time.perf_counter() - t
+        profiling.finish(trace)
+        lock_wait = sum(s.duration for s in trace.spans if s.name == LOCK_STAGE)
+        queue_wait = sum(s.duration for s in trace.spans if s.name == WAIT_STAGE)
+        out.append((name, latency, lock_wait, error, result, queue_wait))
+        if think_ms:
+            time.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+    return out
+
+
+def _queued(wq: WriteQueue):
+    return lambda conn, job: wq.write(job)
+
+
+def _process_worker(path, pool_size, seed, mix, seconds, think_ms, n_clients, use_queue, results):
+    # um escritor por processo: entre processos ainda há disputa pelo lock do arquivo
+    pool = open_pool(path, size=pool_size)
+    wq = WriteQueue(path) if use_queue else None
+    try:
+        results.put(therapist(pool, seed, mix, seconds, think_ms, n_clients,
+                              _queued(wq) if wq else write_direct))
+    finally:
+        if wq:
+            wq.close()
+        pool.close()
+
+
+# =========================
+# Execução + relatório
+# =========================
+def run(path: str, mode: str, therapists: int, mix: list, seconds: float, think_ms: float,
+        pool_size: int, n_clients: int, use_queue: bool = False) -> list:
+    if mode == "threads":
+        pool = open_pool(path, size=pool_size)
+        wq = WriteQueue(path) if use_queue else None
+        write = _queued(wq) if wq else write_direct
+        results = [None] * therapists
+
+        def worker(i):
+            results[i] = therapist(pool, i, mix, seconds, think_ms, n_clients, write)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(therapists)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        if wq:
+            print(f"fila do escritor: {wq.jobs} jobs em {wq.batches} commits")
+            wq.close()
+        pool.close()
+        return [r for rs in results for r in rs]
+
+    open_pool(path, size=1).close()   # migra antes de disparar os processos
+    queue = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=_process_worker,
+                                args=(path, pool_size, i, mix, seconds, think_ms, n_clients, use_queue, queue))
+        for i in range(therapists)
+    ]
+    for p in procs:
+        p.start()
+    records = [r for _ in procs for r in queue.get()]
+    for p in procs:
+        p.join()
+    return records
+
+
+def _pct(values, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, round(p * (len(values) - 1)))]
+
+
+def report(records: list, seconds: float) -> dict:
+    # com --write-queue o lock fica com o escritor: a espera de quem grava aparece em "fila"
+    print(f"{'op':<8}{'n':>7}{'ops/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'lock p95':>10}{'lock tot s':>11}{'fila p95':>10}{'fila tot s':>11}{'erros':>8}")
+    errors = {}
+    for name in OPS:
+        rs = [r for r in records if r[0] == name]
+        if not rs:
+            continue
+        lat = [r[1] * 1000 for r in rs]
+        locks = [r[2] * 1000 for r in rs if r[2]]
+        waits = [r[5] * 1000 for r in rs if r[5]]
+        n_err = sum(1 for r in rs if r[3])
+        print(f"{name:<8}{len(rs):>7}{len(rs) / seconds:>8.1f}{statistics.median(lat):>9.1f}"
+              f"{_pct(lat, .95):>9.1f}{_pct(lat, .99):>9.1f}{_pct(locks, .95):>10.1f}"
+              f"{sum(locks) / 1000:>11.2f}{_pct(waits, .95):>10.1f}{sum(waits) / 1000:>11.2f}{n_err:>8}")
+        for r in rs:
+            if r[3]:
+                errors[r[3]] = errors.get(r[3], 0) + 1
+
+    total = len(records)
+    n_err = sum(errors.values())
+    print(f"total: {total} operações, {total / seconds:.1f} ops/s, "
+          f"taxa de erro {n_err / max(total, 1):.2%}")
+    for msg, n in sorted(errors.items(), key=lambda kv: -kv[1]):
+        print(f"  {n:>6} × {msg}")
+    return errors
+
+
+def check_consistency(path: str, before: dict, records: list) -> list[str]:
+    """O banco tem exatamente o que as operações bem-sucedidas gravaram?"""
+    import sqlite3
+
+    ok = [r for r in records if not r[3]]
+    expected = {
+        "clients": before["clients"] + sum(1 for r in ok if r[0] == "create"),
+        "sessions": before["sessions"] + sum(1 for r in ok if r[0] == "save"),
+        "attempts": before["attempts"] + sum(r[4] for r in ok if r[0] == "save"),
+    }
+    conn = sqlite3.connect(path)
+    problems = []
+    for table, n in expected.items():
+        got = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        if got != n:
+            problems.append(f"{table}: {got} linhas, esperado {n}")
+    drift = conn.execute("""
+        SELECT COUNT(*) FROM summary_client sc
+        JOIN (SELECT s.client_id, COUNT(*) AS n FROM attempts a JOIN sessions s ON s.id = a.session_id
+              GROUP BY s.client_id) t ON t.client_id = sc.client_id
+        WHERE sc.n_attempts != t.n
+    """).fetchone()[0]
+    if drift:
+        problems.append(f"summary_client divergente de attempts em {drift} pacientes")
+    conn.close()
+    return problems
+
+
+def _counts(path: str) -> dict:
+    import sqlite3
+
+    conn = sqlite3.connect(path)
+    out = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("clients", "sessions", "attempts")}
+    conn.close()
+    return out
+
+
+def parse_mix(spec: str) -> list:
+    """"create=1,save=3,report=6" → lista ponderada para random.choice."""
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPS:
+            raise argparse.ArgumentTypeError(f"operação desconhecida: {name}")
+        mix += [name] * int(weight or 1)
+    return mix
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--therapists", type=int, default=8)
+    ap.add_argument("--mode", choices=("threads", "processes"), default="threads")
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("--mix", type=parse_mix, default=parse_mix("create=1,save=3,report=6"))
+    ap.add_argument("--think-ms", type=float, default=0, help="pausa média entre operações (0 = estresse)")
+    ap.add_argument("--pool-size", type=int, default=8, help="conexões por pool (por processo no modo processes)")
+    ap.add_argument("--clients", type=int, default=200, help="pacientes no banco sintético")
+    ap.add_argument("--db", help="copia este banco em vez de gerar um sintético")
+    ap.add_argument("--write-queue", action="store_true", help="gravações pela clinic.write_queue")
+    ap.add_argument("--max-error-rate", type=float, default=0.0, help="acima disso sai com 1")
+    args = ap.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "load.db")
+    if args.db:
+        import sqlite3
+
+        # backup online: inclui o que ainda está só no -wal (copyfile levaria só o arquivo principal)
+        src, dst = sqlite3.connect(args.db), sqlite3.connect(path)
+        src.backup(dst)
+        dst.close()
+        src.close()
+    else:
+        build_synthetic_db(path, args.clients, 5, 10).close()
+    before = _counts(path)
+    n_clients = before["clients"]
+
+    writes = "fila do escritor" if args.write_queue else "transação por terapeuta"
+    print(f"{args.therapists} terapeutas ({args.mode}, {writes}), {args.seconds:.0f}s, banco {path}")
+    records = run(path, args.mode, args.therapists, args.mix, args.seconds, args.think_ms,
+                  args.pool_size, n_clients, args.write_queue)
+    errors = report(records, args.seconds)
+    problems = check_consistency(path, before, records)
+    for p in problems:
+        print(f"INCONSISTÊNCIA: {p}")
+
+    error_rate = sum(errors.values()) / max(len(records), 1)
+    sys.exit(1 if problems or error_rate > args.max_error_rate else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Recalcula as tabelas de resumo (clinic.summary) a partir de `attempts`.
+
+    python -m tools.rebuild_summaries                     # db/clinic.db, todos os pacientes
+    python -m tools.rebuild_summaries --client 42
+    python -m tools.rebuild_summaries --db outro.db
+    python -m tools.rebuild_summaries --new-identity      # depois de restaurar um backup por cima
+"""
+import argparse
+import os
+
+from clinic import report_cache
+from clinic import summary
+from clinic.db import open_pool
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--db", default=os.path.join("db", "clinic.db"))
+    ap.add_argument("--client", type=int, help="recalcula só este paciente")
+    ap.add_argument("--new-identity", action="store_true",
+                    help="troca a identidade do banco (descarta a cópia em disco do cache de relatórios)")
+    args = ap.parse_args()
+
+    pool = open_pool(args.db, size=1)
+    with pool.connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        summary.rebuild(conn, args.client)
+        if args.new_identity:
+            report_cache.rotate_db_identity(conn)
+        conn.commit()
+        n = conn.execute("SELECT COUNT(*) FROM summary_client").fetchone()[0]
+    pool.close()
+    print(f"resumos recalculados ({n} pacientes com tentativas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Latência de rerun das páginas, sem navegador (AppTest), sobre bancos e
+baralhos sintéticos. Para cada combinação banco × baralho × cenário, um
+processo novo mede p50/p95 dos reruns (depois do primeiro, medido à parte)
+e o pico de RSS, e compara com o baseline em JSON.
+
+    python -m tools.rerun_bench                          # 10 e 1k pacientes, baralho real
+    python -m tools.rerun_bench --datasets 50k --decks real gen1k --runs 30
+    python -m tools.rerun_bench --update-baseline        # grava os números atuais como baseline
+    python -m tools.rerun_bench --check                  # CI: sem baseline também é falha
+
+Sai com 1 se algum p95 ou pico de RSS piorar além da tolerância. O baseline
+depende da máquina: gere-o na mesma máquina/CI em que a verificação roda.
+Sem --check, a falta de baseline só gera um aviso; com --check, falta do
+arquivo ou de alguma combinação medida nele sai com 1.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from tools.apptest import ROOT
+from tools.synth import build_synthetic_db, build_synthetic_deck
+
+# nome -> (pacientes, sessões por paciente, tentativas por sessão)
+DATASETS = {
+    "10": (10, 5, 10),            # 500 tentativas
+    "1k": (1_000, 20, 10),        # 200 mil
+    "50k": (50_000, 2, 10),       # 1 milhão
+}
+# nome -> nº de cartas (None = data/cards.json)
+DECKS = {"real": None, "gen1k": 1_000}
+SCENARIOS = ("pacientes", "sessao_nav", "salvar_sessao", "relatorios")
+
+BASELINE = os.path.join("benchmarks", "rerun_baseline.json")
+DATA_DIR = os.path.join(tempfile.gettempdir(), "detective-ajuda-bench")
+
+
+# =========================
+# Cenários (rodam no processo filho)
+# =========================
+def _button(at, label: str):
+    for b in at.button:
+        if b.label == label:
+            return b
+    raise LookupError(f"botão não encontrado: {label}")
+
+
+def _timed(step) -> float:
+    t = time.perf_counter()
+    at = step()
+    ms = (time.perf_counter() - t) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return ms
+
+
+def scenario_pacientes(app_test, runs: int) -> tuple[float, list]:
+    at = app_test("pacientes")
+    first = _timed(at.run)
+    return first, [_timed(at.run) for _ in range(runs)]
+
+
+def scenario_sessao_nav(app_test, runs: int) -> tuple[float, list]:
+    at = app_test("sessao", active_client_id=1)
+    first = _timed(at.run)
+    out = []
+    for i in range(runs):
+        # 4 para frente, 4 para trás: fica dentro do baralho padrão (10 cartas)
+        label = "➡️ Próxima" if (i // 4) % 2 == 0 else "⬅️ Anterior"
+        out.append(_timed(_button(at, label).click().run))
+    return first, out
+
+
+def scenario_salvar_sessao(app_test, runs: int) -> tuple[float, list]:
+    at = app_test("sessao", active_client_id=1)
+    first = _timed(at.run)
+    out = []
+    for _ in range(runs):
+        _timed(_button(at, "Salvar tentativa desta carta").click().run)
+        out.append(_timed(_button(at, "✅ Salvar sessão").click().run))
+    return first, out
+
+
+def scenario_relatorios(app_test, runs: int) -> tuple[float, list]:
+    at = app_test("relatorios", active_client_id=1)
+    first = _timed(at.run)
+    return first, [_timed(at.run) for _ in range(runs)]
+
+
+def run_scenario(name: str, runs: int) -> dict:
+    from tools.apptest import app_test
+
+    first, times = globals()[f"scenario_{name}"](app_test, runs)
+    times.sort()
+    return {
+        "first_ms": first,
+        "p50_ms": statistics.median(times),
+        "p95_ms": times[min(len(times) - 1, round(0.95 * (len(times) - 1)))],
+        # Linux: ru_maxrss em KB
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+# =========================
+# Orquestração (processo pai)
+# =========================
+def prepare_dataset(name: str, data_dir: str) -> str:
+    clients, sessions, attempts = DATASETS[name]
+    path = os.path.join(data_dir, f"db_{name}_{clients}_{sessions}_{attempts}.db")
+    if not os.path.exists(path):
+        t0 = time.perf_counter()
+        build_synthetic_db(path, clients, sessions, attempts).close()
+        print(f"banco {name}: gerado em {time.perf_counter() - t0:.1f}s")
+    return path
+
+
+def prepare_deck(name: str, data_dir: str) -> str | None:
+    n = DECKS[name]
+    if n is None:
+        return None
+    path = os.path.join(data_dir, f"cards_{n}.json")
+    if not os.path.exists(path):
+        build_synthetic_deck(path, n)
+    return path
+
+
+def measure(scenario: str, db: str, deck: str | None, runs: int) -> dict:
+    env = {**os.environ, "CLINIC_DB": db}
+    if deck:
+        env["CARDS_JSON"] = deck
+    cmd = [sys.executable, "-m", "tools.rerun_bench", "--child", scenario, "--runs", str(runs)]
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, check=False)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"{scenario}: processo falhou\n{proc.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def compare(results: dict, baseline: dict, tolerance: float, rss_tolerance: float) -> list[str]:
+    """Chaves que pioraram além da tolerância (p95 ou pico de RSS)."""
+    worse = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if r["p95_ms"] > base["p95_ms"] * (1 + tolerance) or \
+                r["peak_rss_mb"] > base["peak_rss_mb"] * (1 + rss_tolerance):
+            worse.append(key)
+    return worse
+
+
+def _delta(value: float, base: dict | None, field: str) -> str:
+    if not base:
+        return ""
+    return f" ({(value / base[field] - 1) * 100:+.0f}%)"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--datasets", nargs="+", default=["10", "1k"], choices=DATASETS)
+    ap.add_argument("--decks", nargs="+", default=["real"], choices=DECKS)
+    ap.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    ap.add_argument("--runs", type=int, default=20, help="reruns medidos por cenário")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--update-baseline", action="store_true", help="grava os resultados como novo baseline")
+    ap.add_argument("--check", action="store_true", help="falha se não houver baseline para o que foi medido")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="piora aceita no p95 (0.25 = +25%%)")
+    ap.add_argument("--rss-tolerance", type=float, default=0.15, help="piora aceita no pico de RSS")
+    ap.add_argument("--data-dir", default=DATA_DIR, help="cache dos bancos/baralhos sintéticos")
+    ap.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args.runs)))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'banco/baralho/cenário':<34}{'1º':>8}{'p50':>9}{'p95':>16}{'RSS MB':>16}")
+    for ds in args.datasets:
+        db = prepare_dataset(ds, args.data_dir)
+        for deck_name in args.decks:
+            deck = prepare_deck(deck_name, args.data_dir)
+            for scenario in args.scenarios:
+                # Salvar sessão grava no banco: roda numa cópia para não mudar o dataset
+                work_db = db
+                if scenario == "salvar_sessao":
+                    work_db = os.path.join(tempfile.mkdtemp(dir=args.data_dir), "work.db")
+                    shutil.copyfile(db, work_db)
+                try:
+                    r = measure(scenario, work_db, deck, args.runs)
+                finally:
+                    if work_db != db:
+                        shutil.rmtree(os.path.dirname(work_db), ignore_errors=True)
+
+                key = f"{ds}/{deck_name}/{scenario}"
+                results[key] = r
+                base = baseline.get(key)
+                print(f"{key:<34}{r['first_ms']:>8.0f}{r['p50_ms']:>9.1f}"
+                      f"{r['p95_ms']:>9.1f}{_delta(r['p95_ms'], base, 'p95_ms'):>7}"
+                      f"{r['peak_rss_mb']:>9.0f}{_delta(r['peak_rss_mb'], base, 'peak_rss_mb'):>7}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"baseline atualizado: {args.baseline}")
+        return
+
+    missing = [key for key in results if key not in baseline]
+    if not baseline:
+        print(f"sem baseline em {args.baseline} (use --update-baseline)")
+    elif missing:
+        print(f"sem baseline para: {', '.join(missing)}")
+    worse = compare(results, baseline, args.tolerance, args.rss_tolerance)
+    for key in worse:
+        print(f"REGRESSÃO: {key}")
+    sys.exit(1 if worse or (args.check and missing) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Partida a frio: para cada página, um processo Python novo importa o Streamlit
+e renderiza a página uma vez (AppTest) — como a primeira visita a um container
+recém-criado pelo autoscaler. Mostra os pacotes mais caros de importar
+(`python -X importtime`) e falha (exit 1) se alguma página passar do orçamento.
+
+    python -m tools.startup_bench
+    python -m tools.startup_bench --budget-ms 2500 --top 10 --pages sessao manual
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from tools.apptest import PAGES, ROOT
+from tools.synth import build_synthetic_db
+
+DEFAULT_BUDGET_MS = 1500
+
+# roda no processo filho: `python -c CHILD <página>`
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+from tools.apptest import app_test
+at = app_test(sys.argv[1], active_client_id=1)
+t1 = time.perf_counter()
+at.run()
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "render_ms": (t2 - t1) * 1000,
+    "errors": [e.value for e in at.exception],
+}))
+"""
+
+
+def run_child(page: str, env: dict, importtime: bool = False) -> subprocess.CompletedProcess:
+    cmd = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", CHILD, page]
+    return subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, check=False)
+
+
+def cold_start(page: str, env: dict) -> dict:
+    """Tempos de uma partida a frio: processo inteiro, imports iniciais e 1ª renderização."""
+    t0 = time.perf_counter()
+    proc = run_child(page, env)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"página {page}: processo falhou\n{proc.stderr[-2000:]}")
+    result = json.loads(lines[-1])
+    result["wall_ms"] = wall_ms
+    return result
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """Linhas "import time: self | cumulative | módulo" → [(self_us, cum_us, módulo)]."""
+    out = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        out.append((int(self_us), int(cum_us), name.strip()))
+    return out
+
+
+def package_totals(entries) -> list[tuple[str, int]]:
+    """Tempo próprio somado por pacote de topo (pandas, PIL, streamlit...), em ordem decrescente."""
+    totals = {}
+    for self_us, _, name in entries:
+        pkg = name.split(".", 1)[0]
+        totals[pkg] = totals.get(pkg, 0) + self_us
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", nargs="+", default=list(PAGES), choices=PAGES)
+    ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                    help="limite para o processo inteiro (partida + 1ª renderização) de cada página")
+    ap.add_argument("--runs", type=int, default=3, help="partidas por página (vale a mediana)")
+    ap.add_argument("--top", type=int, default=8, help="pacotes mais caros listados por página (0 = nenhum)")
+    ap.add_argument("--db", help="banco existente; padrão: sintético pequeno em diretório temporário")
+    args = ap.parse_args()
+
+    db = args.db
+    if not db:
+        db = os.path.join(tempfile.mkdtemp(), "startup.db")
+        build_synthetic_db(db, clients=20, sessions_per_client=5, attempts_per_session=10).close()
+    env = {**os.environ, "CLINIC_DB": db}
+
+    over = []
+    print(f"{'página':<12}{'processo':>10}{'imports':>10}{'render':>10}   (ms, mediana de {args.runs})")
+    for page in args.pages:
+        runs = sorted((cold_start(page, env) for _ in range(args.runs)), key=lambda r: r["wall_ms"])
+        r = runs[len(runs) // 2]
+        flag = "  ACIMA DO ORÇAMENTO" if r["wall_ms"] > args.budget_ms else ""
+        print(f"{page:<12}{r['wall_ms']:>10.0f}{r['import_ms']:>10.0f}{r['render_ms']:>10.0f}{flag}")
+        for err in r["errors"]:
+            print(f"    erro na página: {err}")
+        if flag or r["errors"]:
+            over.append(page)
+
+        if args.top:
+            entries = parse_importtime(run_child(page, env, importtime=True).stderr)
+            for pkg, us in package_totals(entries)[:args.top]:
+                print(f"    {us / 1000:>8.1f} ms  {pkg}")
+
+    print(f"orçamento: {args.budget_ms:.0f} ms por página")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Gera bancos sintéticos com o schema real (clinic.migrations) para
+benchmarks e verificações de plano de consulta, e baralhos sintéticos
+(cards.json maiores, reaproveitando as imagens reais).
+
+    python -m tools.synth db/synth.db --clients 2000 --sessions 50 --attempts 10
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from clinic import queries as q
+from clinic import summary
+from clinic.migrations import migrate
+
+AGE_GROUPS = ["crianca", "adolescente", "adulto"]
+MODES = ["treino_guiado", "treino_independente", "avaliacao"]
+RESPONSE_CLASSES = ["Alvo", "Parcial", "Alternativa válida", "Inadequada"]
+N_CARDS = 50
+
+
+def _attempt_row(rng, session_id):
+    detection, clues, cog = rng.randint(0, 2), rng.randint(0, 2), rng.randint(0, 2)
+    action, comm, safety = rng.randint(0, 3), rng.randint(0, 1), rng.randint(0, 2)
+    return (
+        session_id, rng.randint(1, N_CARDS), rng.randint(0, 3),
+        detection, clues, cog, action, comm, safety,
+        detection + clues + cog + action + comm + safety, "",
+        rng.randint(0, 3), rng.randint(0, 2), rng.randint(0, 1), rng.randint(0, 1),
+        rng.choice(RESPONSE_CLASSES), "", "",
+    )
+
+
+def build_synthetic_db(path: str, clients: int, sessions_per_client: int,
+                       attempts_per_session: int, seed: int = 42) -> sqlite3.Connection:
+    """Cria (ou recria) `path` e devolve uma conexão aberta."""
+    if os.path.exists(path):
+        os.remove(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    migrate(conn)
+
+    start = datetime(2020, 1, 1)
+    conn.executemany(
+        "INSERT INTO clients (id, nickname, age_group, notes, created_at) VALUES (?,?,?,?,?)",
+        ((i, f"P{i:06d}", rng.choice(AGE_GROUPS), "", start.isoformat()) for i in range(1, clients + 1)),
+    )
+
+    # sessões intercaladas entre pacientes, como numa clínica real
+    sessions = []
+    for k in range(sessions_per_client):
+        for client_id in range(1, clients + 1):
+            when = start + timedelta(days=k * 7, minutes=client_id)
+            sessions.append((client_id, when.isoformat(), rng.choice(MODES), ""))
+    conn.executemany(q.INSERT_SESSION, sessions)
+
+    n_sessions = len(sessions)
+    conn.executemany(
+        q.INSERT_ATTEMPT,
+        (_attempt_row(rng, sid) for sid in range(1, n_sessions + 1) for _ in range(attempts_per_session)),
+    )
+    summary.rebuild(conn)
+    conn.commit()
+    conn.execute("ANALYZE")
+    return conn
+
+
+def build_synthetic_deck(path: str, n_cards: int, source: str = os.path.join("data", "cards.json")) -> str:
+    """Grava em `path` um cards.json com `n_cards` cartas, repetindo as reais com ids novos."""
+    with open(source, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    cards = []
+    for i in range(n_cards):
+        card = dict(base[i % len(base)])
+        card["id"] = 10_000 + i   # fora da faixa de CARD_SUPPORT: usa as pistas do JSON
+        card["title"] = f"{card.get('title') or 'Carta'} #{i}"
+        cards.append(card)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cards, f, ensure_ascii=False)
+    return path
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("path")
+    ap.add_argument("--clients", type=int, default=100)
+    ap.add_argument("--sessions", type=int, default=10, help="sessões por paciente")
+    ap.add_argument("--attempts", type=int, default=8, help="tentativas por sessão")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    conn = build_synthetic_db(args.path, args.clients, args.sessions, args.attempts, args.seed)
+    total = conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0]
+    conn.close()
+    print(f"{args.path}: {args.clients} pacientes, {total} tentativas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Camada Streamlit compartilhada pelas páginas (views/).
+
+services: pool do DB em cache por processo; cards: catálogo, índice do
+baralho e prefetcher de imagens. Cada página importa só o que usa, então a
+Manual não abre o banco e Relatórios não compila o catálogo.
+"""
@@ -0,0 +1,23 @@
+"""
+Logo e imagens das cartas servidos como arquivos estáticos (clinic.static_assets)
+em vez de bytes/base64 enviados a cada rerun.
+"""
+import html
+
+import streamlit as st
+
+from clinic.static_assets import Manifest
+
+@st.cache_resource(show_spinner=False)
+def get_static_manifest():
+    # um por processo; lê static/manifest.json (tools/build_static.py) se existir
+    return Manifest()
+
+def img_html(url: str, alt: str, style: str = "width:100%; height:auto;") -> str:
+    return f'<img src="{html.escape(url)}" alt="{html.escape(alt)}" style="{style}" />'
+
+def preload_html(urls) -> str:
+    """<img> ocultas: o navegador já baixa (e guarda em cache) as próximas imagens."""
+    return "".join(
+        f'<img src="{html.escape(u)}" alt="" aria-hidden="true" style="display:none" />' for u in urls
+    )
@@ -0,0 +1,85 @@
+"""
+Catálogo de cartas, índice do baralho e imagens (st.cache_resource).
+
+Só a página Sessão importa este módulo; Relatórios e Manual não pagam
+pela compilação do catálogo nem pelo Pillow.
+"""
+import json
+import os
+
+import streamlit as st
+
+from clinic import queries as q
+from clinic.catalog import CARDS_PATH, CatalogError, build_catalog
+from clinic.deck_index import DeckIndex
+from clinic.prefetch import Prefetcher
+from clinic.profiling import stage
+from clinic.static_assets import CARD_IMAGE_WIDTH, card_asset
+from ui.services import get_conn
+
+# =========================
+# Catálogo de cartas
+# =========================
+def cards_mtime() -> float:
+    with stage("cards_mtime"):
+        try:
+            return os.path.getmtime(CARDS_PATH)
+        except OSError:
+            return 0.0
+
+@st.cache_resource(show_spinner=False)
+def load_catalog(mtime: float):
+    # ✅ compilado uma vez por versão do cards.json; registros imutáveis, compartilhados.
+    # (sem "_" no parâmetro: o Streamlit não inclui argumentos "_x" na chave do cache)
+    with open(CARDS_PATH, "r", encoding="utf-8") as f:
+        return build_catalog(json.load(f))
+
+def require_catalog(mtime: float):
+    """Catálogo da versão atual; cards.json inválido interrompe a página com o erro."""
+    try:
+        with stage("load_catalog"):
+            return load_catalog(mtime)
+    except CatalogError as e:
+        st.error(str(e))
+        st.stop()
+
+@st.cache_resource(show_spinner=False)
+def load_deck_index(mtime: float):
+    return DeckIndex(load_catalog(mtime))
+
+# =========================
+# ✅ Imagens das cartas + pré-carregamento das vizinhas (Sessão)
+# =========================
+@st.cache_resource(show_spinner=False)
+def get_card_prefetcher():
+    # compartilhado entre sessões; guarda só URLs — o aquecimento é gerar/publicar o derivado
+    return Prefetcher(max_items=256, workers=2)
+
+def card_image_url(card, manifest) -> str | None:
+    """
+    URL estática do derivado JPEG da carta (~100 KB), publicado em static/ na
+    primeira vez. Roda em thread do prefetcher: nada de st.* aqui (o manifest
+    vem de get_static_manifest() no rerun).
+    """
+    asset = card_asset(manifest, card.id, card.image, CARD_IMAGE_WIDTH)
+    return asset.url if asset else None
+
+def card_image_key(card, mtime: float) -> tuple:
+    return (mtime, CARD_IMAGE_WIDTH, card.id)
+
+# =========================
+# ✅ Calibração empírica das cartas (gravada pelo job de clinic.calibration)
+# =========================
+def get_calibration() -> dict:
+    """card_id -> linha de card_calibration; relida só quando o job move a marca d'água."""
+    with get_conn() as conn, stage("sql: calibração"):
+        row = conn.execute(q.CALIBRATION_STATE).fetchone()
+    return load_calibration(row[0] if row else 0)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_calibration(version: int) -> dict:
+    # dicts compartilhados entre sessões: só leitura. Sem pandas/NumPy no rerun da Sessão.
+    with get_conn() as conn:
+        cur = conn.execute(q.CARD_CALIBRATION)
+        cols = [d[0] for d in cur.description]
+        return {row[0]: dict(zip(cols, row)) for row in cur}
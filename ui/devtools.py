@@ -0,0 +1,166 @@
+"""
+Painel de instrumentação (só com DEV_MODE=1).
+
+Cada rerun completo vira um waterfall na sidebar com as etapas marcadas por
+clinic.profiling.stage(). Opcionalmente (caixas no próprio painel) guarda
+cProfile e/ou tracemalloc dos últimos DEV_PROFILE_KEEP reruns da sessão.
+Reruns só de fragmento não passam pelo app.py e não aparecem aqui.
+O tracemalloc é do processo inteiro: fica ligado enquanto alguma sessão
+estiver com a caixa marcada (ou ainda aberta), e os números incluem o que as
+outras sessões alocarem no mesmo intervalo.
+"""
+import html
+import io
+import os
+import threading
+import weakref
+from collections import deque
+
+import streamlit as st
+
+from clinic import profiling
+from ui.sidebar import DEV_MODE
+
+KEEP = int(os.getenv("DEV_PROFILE_KEEP", "5"))
+PROFILE_LINES = 25
+MEMORY_LINES = 15
+
+class _TracerToken:
+    """Uma por sessão com tracemalloc marcado; some junto com o session_state dela."""
+
+_tracers = weakref.WeakSet()
+_tracers_lock = threading.Lock()
+
+def _want_tracemalloc(on: bool):
+    """Liga/desliga a parte desta sessão; tracemalloc.stop() só quando nenhuma outra quer."""
+    import tracemalloc
+
+    with _tracers_lock:
+        token = st.session_state.get("_dev_tracer")
+        if on:
+            if token is None:
+                token = st.session_state["_dev_tracer"] = _TracerToken()
+            _tracers.add(token)
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        else:
+            if token is not None:
+                _tracers.discard(token)
+            if not _tracers and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+class RerunCapture:
+    """Trace do rerun + (se ligados) cProfile e snapshot inicial do tracemalloc."""
+
+    def __init__(self, label: str, cprofile: bool, memory: bool):
+        import tracemalloc
+
+        self.profiler = self.mem_before = None
+        _want_tracemalloc(memory)
+        if memory:
+            self.mem_before = tracemalloc.take_snapshot()
+        if cprofile:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.trace = profiling.start(label)
+
+    def finish(self) -> dict:
+        profiling.finish(self.trace)
+        record = {
+            "label": self.trace.label,
+            "total_ms": self.trace.total * 1000,
+            "spans": self.trace.ordered(),
+            "profile": None,
+            "memory": None,
+        }
+        if self.profiler is not None:
+            self.profiler.disable()
+            record["profile"] = _profile_text(self.profiler)
+        if self.mem_before is not None:
+            record["memory"] = _memory_text(self.mem_before)
+        return record
+
+def _profile_text(profiler) -> str:
+    import pstats
+
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+    return out.getvalue()
+
+def _memory_text(before) -> str:
+    import tracemalloc
+
+    after = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    diff = after.compare_to(before, "lineno")[:MEMORY_LINES]
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [f"atual {current / 1e6:.1f} MB • pico {peak / 1e6:.1f} MB (desde o início do tracemalloc)"]
+    lines += [str(d) for d in diff]
+    return "\n".join(lines)
+
+# =========================
+# Início/fim do rerun (chamados pelo app.py)
+# =========================
+def begin_rerun() -> RerunCapture | None:
+    if not DEV_MODE:
+        return None
+    return RerunCapture(
+        "rerun",
+        cprofile=st.session_state.get("dev_cprofile", False),
+        memory=st.session_state.get("dev_tracemalloc", False),
+    )
+
+def end_rerun(capture: RerunCapture | None, label: str = ""):
+    if capture is None:
+        return
+    capture.trace.label = label or capture.trace.label
+    record = capture.finish()
+    history = st.session_state.setdefault("dev_reruns", deque(maxlen=KEEP))
+    history.append(record)
+    render_panel(record, history)
+
+# =========================
+# Painel
+# =========================
+def _waterfall_html(record: dict) -> str:
+    total = max(record["total_ms"], 1e-6)
+    rows = []
+    for span in record["spans"]:
+        ms = span.duration * 1000
+        left = span.start * 1000 / total * 100
+        width = max(ms / total * 100, 0.5)
+        rows.append(
+            "<div style='font-size:12px; margin:3px 0;'>"
+            "<div style='display:flex; justify-content:space-between;'>"
+            f"<span style='padding-left:{span.depth * 10}px'>{html.escape(span.name)}</span>"
+            f"<span>{ms:.1f} ms</span></div>"
+            "<div style='background:rgba(128,128,128,.15); height:6px; position:relative;'>"
+            f"<div style='position:absolute; left:{left:.2f}%; width:{width:.2f}%; height:6px; background:#4c8bf5;'></div>"
+            "</div></div>"
+        )
+    return "".join(rows)
+
+def render_panel(record: dict, history):
+    with st.sidebar.expander(f"⏱ {record['label']}: {record['total_ms']:.0f} ms", expanded=True):
+        st.markdown(_waterfall_html(record), unsafe_allow_html=True)
+        if len(history) > 1:
+            st.caption("Últimos reruns (ms): " + " · ".join(f"{r['total_ms']:.0f}" for r in history))
+
+        st.checkbox("cProfile nos próximos reruns", key="dev_cprofile")
+        st.checkbox("tracemalloc nos próximos reruns", key="dev_tracemalloc")
+
+        captured = [r for r in history if r["profile"] or r["memory"]]
+        if captured:
+            pos = st.selectbox(
+                "Captura", range(len(captured)), index=len(captured) - 1,
+                format_func=lambda i: f"{captured[i]['label']} — {captured[i]['total_ms']:.0f} ms",
+                key="dev_capture",
+            )
+            if captured[pos]["profile"]:
+                st.code(captured[pos]["profile"], language=None)
+            if captured[pos]["memory"]:
+                st.code(captured[pos]["memory"], language=None)
@@ -0,0 +1,73 @@
+"""
+Seletor de pacientes: busca por início do apelido + páginas de PAGE_SIZE,
+sobre clinic.directory. Usado em Pacientes e Relatórios.
+"""
+import streamlit as st
+
+from clinic import directory
+from clinic.profiling import stage
+from ui.services import get_conn
+
+def _reset_page(key: str):
+    # nova busca volta para a primeira página
+    st.session_state[f"{key}_page"] = 1
+
+def _step_page(key: str, delta: int):
+    page_key = f"{key}_page"
+    st.session_state[page_key] = max(1, st.session_state.get(page_key, 1) + delta)
+
+def patient_picker(label: str, key: str, default_id: int | None = None) -> int | None:
+    """
+    Renderiza busca + página de resultados e devolve o id escolhido.
+    `default_id` (ex.: paciente ativo) continua selecionável mesmo fora da página.
+    Devolve None (já com o aviso na tela) se não há paciente para escolher.
+    """
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        prefix = st.text_input("Buscar pelo início do apelido/código", key=f"{key}_q",
+                               on_change=_reset_page, args=(key,))
+
+    page_key = f"{key}_page"
+    page = st.session_state.get(page_key, 1)
+    with get_conn() as conn, stage("sql: diretório de pacientes"):
+        clients, has_next = directory.find_clients(conn, prefix, page - 1)
+        # página pode ter ficado além do fim (busca/lista encolheu): volta para a primeira
+        if page > 1 and not clients:
+            page = st.session_state[page_key] = 1
+            clients, has_next = directory.find_clients(conn, prefix, 0)
+        current = None
+        if default_id is not None and default_id not in clients:
+            current = directory.get_client(conn, default_id)
+
+    with c2:
+        # sem total de páginas (não há COUNT): só anterior/próxima
+        if page > 1 or has_next:
+            b1, b2 = st.columns(2)
+            b1.button("◀", key=f"{key}_prev", help="Página anterior", disabled=page <= 1,
+                      on_click=_step_page, args=(key, -1), use_container_width=True)
+            b2.button("▶", key=f"{key}_next", help="Próxima página", disabled=not has_next,
+                      on_click=_step_page, args=(key, 1), use_container_width=True)
+
+    first = (page - 1) * directory.PAGE_SIZE + 1
+    shown = len(clients)
+    if current is not None:
+        clients = {current.id: current, **clients}
+    if not clients:
+        if prefix.strip():
+            st.caption(f"Nenhum paciente começa com “{prefix.strip()}”.")
+        else:
+            st.info("Nenhum paciente cadastrado ainda.")
+        return None
+
+    options = list(clients)
+    if shown:
+        st.caption(f"Pacientes {first}–{first + shown - 1}"
+                   + (f" começando com “{prefix.strip()}”" if prefix.strip() else "")
+                   + (" · há mais na próxima página" if has_next else ""))
+    return st.selectbox(
+        label,
+        options,
+        index=options.index(default_id) if default_id in clients else 0,
+        format_func=lambda cid: clients[cid].label,
+        key=f"{key}_select",
+    )
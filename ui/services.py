@@ -0,0 +1,53 @@
+"""
+Recursos compartilhados entre páginas e sessões (st.cache_resource).
+
+Criados sob demanda na primeira página que pede: abrir o Manual não
+conecta ao banco. O catálogo de cartas e as imagens ficam em ui.cards.
+"""
+import os
+from contextlib import contextmanager
+
+import streamlit as st
+
+from clinic.db import open_pool
+from clinic.profiling import stage
+from clinic.report_cache import ReportCache, get_db_identity
+
+# =========================
+# Paths e DB
+# =========================
+# CLINIC_DB aponta para outro banco (ex.: bancos sintéticos dos benchmarks em tools/)
+DB_PATH = os.getenv("CLINIC_DB", os.path.join("db", "clinic.db"))
+
+@st.cache_resource(show_spinner=False)
+def get_pool():
+    # ✅ um pool por processo: connect + pragmas + migrações só na primeira execução
+    return open_pool(DB_PATH)
+
+@contextmanager
+def get_conn():
+    """Empresta uma conexão do pool: `with get_conn() as conn: ...`"""
+    with stage("get_conn"):
+        pool = get_pool()
+        conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+# =========================
+# Cache de relatórios (clinic.report_cache)
+# =========================
+# REPORT_CACHE_MB: teto em memória (por processo); REPORT_CACHE_DIR: cópia em disco (opcional)
+REPORT_CACHE_MB = float(os.getenv("REPORT_CACHE_MB", "64"))
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR")
+
+@st.cache_resource(show_spinner=False)
+def get_report_cache():
+    disk_dir = None
+    if REPORT_CACHE_DIR:
+        # um subdiretório por identidade do banco (não pelo caminho): banco recriado
+        # ou trocado no mesmo lugar não reaproveita pickles de outro
+        with get_conn() as conn:
+            disk_dir = os.path.join(REPORT_CACHE_DIR, get_db_identity(conn))
+    return ReportCache(int(REPORT_CACHE_MB * 2**20), disk_dir)
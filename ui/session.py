@@ -0,0 +1,460 @@
+"""
+Blocos da página Sessão: contadores por carta, montagem do baralho por
+filtros, os fragmentos (caixa do terapeuta / pontuação) que reexecutam
+só o próprio bloco a cada clique e o rascunho gravado no banco a cada passo.
+"""
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import streamlit as st
+
+from clinic import drafts
+from clinic.deck_index import FACETS, DeckIndex
+from clinic.profiling import stage
+from clinic.writer import AttemptRecord
+from ui.services import get_conn
+from ui.writes import WRITE_WAIT_S, get_writer, settle_pending_writes, submit_background, submit_write
+
+def total_score(detection, clues, cog_empathy, action, communication, safety):
+    return int(detection + clues + cog_empathy + action + communication + safety)
+
+# =========================
+# ✅ Meta por carta (contadores / alternativa válida)
+# =========================
+def _default_meta():
+    return {
+        "prompts_green": 0,
+        "prompts_yellow": 0,
+        "prompts_red": 0,
+        "reformulations": 0,
+        "response_class": "Alvo",
+        "alt_logic": "",
+        "alt_diff": "",
+        "red_unlocked": False
+    }
+
+def init_attempt_meta(card_id: int):
+    key = f"meta_{card_id}"
+    if key not in st.session_state:
+        st.session_state[key] = _default_meta()
+    return st.session_state[key]
+
+# =========================
+# ✅ Rascunho no banco (clinic.drafts): cada tentativa e cada contador
+# vão para o diário; "Salvar sessão" só finaliza o rascunho
+# =========================
+def _discard_when_opened(future, writer):
+    # rascunho que ainda abria quando a tela desistiu dele: descarta assim que o commit chegar
+    if not future.cancelled() and future.exception() is None:
+        session_id = future.result()
+        writer.submit(lambda conn: drafts.discard(conn, session_id))
+
+def reset_draft_state():
+    """Limpa a sessão local (tentativas, posição, metas, rascunho)."""
+    st.session_state.session_attempts = {}
+    st.session_state.session_idx = 0
+    for k in list(st.session_state.keys()):
+        if str(k).startswith("meta_"):
+            del st.session_state[k]
+    st.session_state.pop("draft_session_id", None)
+    st.session_state.pop("draft_client_id", None)
+    _drop_draft_opening()
+
+def _drop_draft_opening():
+    opening = st.session_state.pop("draft_opening", None)
+    if opening is not None:
+        writer = get_writer()
+        opening[0].add_done_callback(lambda f: _discard_when_opened(f, writer))
+
+def draft_session_id() -> int | None:
+    """
+    Id do rascunho desta sessão; abre um no 1º uso. None enquanto o rascunho
+    não está confirmado: a abertura espera só WRITE_WAIT_S e, se o commit
+    demorar, o Future fica em session_state e é adotado num clique seguinte
+    (nunca abre um segundo rascunho por cima). Tentativas feitas antes disso
+    entram no diário na finalização (drafts.reconcile).
+    """
+    session_id = st.session_state.get("draft_session_id")
+    if session_id is not None:
+        return session_id
+    client_id = int(st.session_state.active_client_id)
+    opening = st.session_state.get("draft_opening")
+    if opening is not None and opening[1] != client_id:
+        _drop_draft_opening()   # abria para outro paciente: descartado quando chegar
+        opening = None
+    wait = 0
+    if opening is None:
+        mode = st.session_state.get("session_mode", "treino_guiado")
+        future = get_writer().submit(lambda conn: drafts.open_draft(conn, client_id, mode))
+        opening = st.session_state.draft_opening = (future, client_id)
+        wait = WRITE_WAIT_S
+    future = opening[0]
+    try:
+        error = future.exception(timeout=wait)
+    except FutureTimeout:
+        return None
+    del st.session_state["draft_opening"]
+    if error is not None:
+        st.toast(f"Rascunho não gravado (tentativas só nesta sessão): {error}", icon="⚠️")
+        return None
+    st.session_state.draft_session_id = session_id = future.result()
+    st.session_state.draft_client_id = client_id
+    return session_id
+
+def _journal_meta(card_id: int):
+    session_id = draft_session_id()
+    if session_id is not None:
+        meta = dict(init_attempt_meta(card_id))
+        submit_background(lambda conn: drafts.record_meta(conn, session_id, card_id, meta),
+                          failure="Falha ao gravar o rascunho")
+
+def _resume_draft(client_id: int, draft: drafts.Draft, card_ids: list):
+    reset_draft_state()
+    st.session_state.session_attempts = dict(draft.attempts)
+    for card_id, meta in draft.metas.items():
+        st.session_state[f"meta_{card_id}"] = {**_default_meta(), **meta}
+    st.session_state.draft_session_id = draft.session_id
+    st.session_state.draft_client_id = client_id
+    # cartas já pontuadas voltam para o baralho
+    deck = list(st.session_state.get("deck_ids") or card_ids[:10])
+    known = set(card_ids)
+    deck += [cid for cid in draft.attempts if cid in known and cid not in deck]
+    st.session_state.deck_ids = deck
+    st.session_state.session_mode = draft.mode
+
+def _discard_draft(client_id: int, session_id: int):
+    submit_background(lambda conn: drafts.discard(conn, session_id), failure="Falha ao descartar o rascunho")
+    st.session_state.draft_checked = client_id
+
+def render_draft_recovery(client_id: int, card_ids: list, modes: list):
+    """
+    Uma vez por paciente nesta sessão do navegador: se há rascunho aberto no
+    banco (queda, aba fechada), pergunta se retoma ou descarta antes de seguir.
+    """
+    opening = st.session_state.get("draft_opening")
+    owner = st.session_state.get("draft_client_id") or (opening[1] if opening else None)
+    if owner not in (None, client_id):
+        reset_draft_state()   # trocou de paciente: o rascunho do outro fica no banco
+    if st.session_state.get("draft_session_id") is not None or st.session_state.get("draft_checked") == client_id:
+        return
+
+    with get_conn() as conn, stage("sql: rascunho aberto"):
+        draft = drafts.find_draft(conn, client_id)
+    if draft is None:
+        st.session_state.draft_checked = client_id
+        return
+    if draft.mode not in modes:
+        draft = drafts.Draft(draft.session_id, draft.created_at, modes[0], draft.attempts, draft.metas,
+                             draft.updated_at)
+
+    st.warning(
+        f"Há uma sessão não finalizada deste paciente (início {draft.created_at[:16].replace('T', ' ')}, "
+        f"{len(draft.attempts)} tentativa(s) salva(s), última alteração {draft.updated_at[:16].replace('T', ' ')})."
+    )
+    c1, c2 = st.columns(2)
+    c1.button("Retomar rascunho", on_click=_resume_draft, args=(client_id, draft, card_ids))
+    c2.button("Descartar rascunho", on_click=_discard_draft, args=(client_id, draft.session_id))
+    st.stop()
+
+def get_default_micro_script():
+    return [
+        "O que está acontecendo?",
+        "O que você faria primeiro?",
+        "Por quê? / O que pode acontecer se…?"
+    ]
+
+# ✅ “Prompt” -> “Pergunta de condução”
+def get_default_conduction_questions():
+    return {
+        "green": [
+            "Olhe com calma a cena.",
+            "O que está acontecendo aqui?",
+            "O que você percebe no rosto, no corpo ou na situação?"
+        ],
+        "yellow": [
+            "Qual seria o primeiro passo?",
+            "Tem mais de uma forma de agir?",
+            "O que dá para fazer agora, em um passo?"
+        ]
+    }
+
+# =========================
+# ✅ Montagem do baralho por filtros
+# =========================
+def facet_label(value) -> str:
+    if isinstance(value, bool):
+        return "Sim" if value else "Não"
+    return str(value)
+
+def empirical_difficulty(card_id, calib: dict) -> float | None:
+    """Dificuldade empírica (0–1) de ui.cards.get_calibration(); None = poucos dados."""
+    row = calib.get(card_id)
+    return row["difficulty"] if row else None
+
+def calibration_caption(card, calib: dict) -> str:
+    text = f"Dificuldade (catálogo): {card.difficulty if card.difficulty is not None else '—'}"
+    difficulty = empirical_difficulty(card.id, calib)
+    if difficulty is not None:
+        text += f" · empírica: {difficulty:.0%} ({calib[card.id]['n']} tentativas na clínica)"
+    return text
+
+def _pct(v):
+    return None if v is None else round(v * 100, 1) + 0.0
+
+def calibration_rows(catalog, calib: dict, ids: list) -> list[dict]:
+    """Dificuldade do cards.json ao lado da empírica e dos efeitos, para st.dataframe."""
+    rows = []
+    for cid in ids:
+        c = calib.get(cid) or {}
+        disc = c.get("discrimination")
+        rows.append({
+            "ID": cid,
+            "Título": catalog.get(cid).title,
+            "Dificuldade": catalog.get(cid).difficulty,
+            "Dificuldade empírica (%)": _pct(c.get("difficulty")),
+            "Discriminação": None if disc is None else round(disc, 2) + 0.0,   # sem "-0.0"
+            "Dicas (pp por nível)": _pct(c.get("hint_effect")),
+            "Condução (pp por pergunta)": _pct(c.get("prompt_effect")),
+            "Tentativas": c.get("n", 0),
+        })
+    return rows
+
+def render_deck_builder(deck_index: DeckIndex, catalog, calib: dict):
+    """
+    Filtros por faceta + busca; "Usar como baralho" substitui as cartas da sessão.
+    Mostra a dificuldade empírica das cartas encontradas (clinic.calibration).
+    """
+    # valores atuais dos filtros (do rerun anterior) para calcular as contagens
+    current = {f: st.session_state.get(f"deck_f_{f}", []) for f in FACETS}
+    text = st.text_input("Buscar em títulos e pistas", key="deck_q")
+
+    cols = st.columns(len(FACETS))
+    for col, (facet, label) in zip(cols, FACETS.items()):
+        counts = deck_index.counts(facet, current, text)
+        with col:
+            st.multiselect(
+                label,
+                options=sorted(counts),
+                format_func=lambda v, counts=counts: f"{facet_label(v)} ({counts.get(v, 0)})",
+                key=f"deck_f_{facet}",
+            )
+
+    filters = {f: st.session_state.get(f"deck_f_{f}", []) for f in FACETS}
+    matches = deck_index.search(filters, text)
+    sort_col, table_col = st.columns(2)
+    if sort_col.toggle("Ordenar por dificuldade empírica", key="deck_sort_empirical"):
+        # sem calibração (poucos dados) vão para o fim, na ordem do catálogo
+        difficulty = {cid: empirical_difficulty(cid, calib) for cid in matches}
+        matches = sorted(matches, key=lambda cid: (difficulty[cid] is None, difficulty[cid] or 0.0))
+
+    def label(cid):
+        d = empirical_difficulty(cid, calib)
+        return f"{cid} ({d:.0%})" if d is not None else str(cid)
+
+    st.caption(f"{len(matches)} cartas encontradas (dificuldade empírica): "
+               + (", ".join(map(label, matches[:30])) or "—") + (" …" if len(matches) > 30 else ""))
+
+    # a tabela carrega o pandas (st.dataframe): só quando pedida
+    if matches and table_col.toggle("Ver calibração das cartas", key="deck_calibration_table"):
+        st.dataframe(calibration_rows(catalog, calib, matches), hide_index=True, use_container_width=True)
+        st.caption(
+            "Dificuldade empírica = 100% − nota esperada de um paciente de habilidade média, "
+            "sem dicas nem perguntas de condução (todas as tentativas da clínica). "
+            "Discriminação: quanto a nota acompanha a habilidade do paciente. "
+            "Dicas/condução: variação da nota, em pontos percentuais, por nível de dica / pergunta. "
+            "Cartas com poucas tentativas ficam em branco."
+        )
+
+    if st.button("Usar como baralho da sessão", disabled=not matches):
+        st.session_state.deck_ids = matches
+        st.session_state.session_idx = 0
+
+# =========================
+# ✅ Fragmentos da Sessão: cliques reexecutam só o próprio bloco
+# =========================
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+def _register_use(card_id: int, field: str, message: str):
+    # callback (roda antes do rerun): o contador já aparece atualizado na mesma renderização
+    init_attempt_meta(card_id)[field] += 1
+    _journal_meta(card_id)
+    st.toast(message)
+
+def _unlock_red(card_id: int):
+    init_attempt_meta(card_id)["red_unlocked"] = True
+    _journal_meta(card_id)
+    st.toast("Modelagem breve 🔴 liberada (Avaliação)")
+
+@fragment
+def render_therapist_box(card, is_eval: bool):
+    """Caixa do terapeuta com semáforo + tags + alternativa válida."""
+    settle_pending_writes()   # rerun do fragmento não passa pelo app.py: confere o diário dos cliques
+    card_id = card.id
+    meta = init_attempt_meta(card_id)
+    if not is_eval:
+        meta["red_unlocked"] = True
+
+    with st.expander("Caixa do terapeuta — apoio clínico"):
+        tags = card.categories
+        if tags:
+            st.caption("Tags: " + " • ".join(tags))
+
+        st.caption("Foco de observação: atenção social, iniciativa, empatia cognitiva, ação funcional, comunicação e segurança.")
+
+        st.write("Roteiro curto (3 passos):")
+        for i, line in enumerate(get_default_micro_script(), start=1):
+            st.write(f"{i}. {line}")
+
+        st.caption("Regra prática: 1 pergunta + esperar; se necessário, 1 reformulação; depois perguntas de condução graduadas.")
+
+        st.write("Quando o paciente travar (sequência):")
+        st.write("1. Repetir a pergunta (uma vez) • 2. 1 pergunta de condução 🟢 • 3. 1 pergunta de condução 🟡 • 4. se necessário, liberar 🔴 (registrar)")
+
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("🟢 Perguntas de condução (neutras)", meta["prompts_green"])
+        c2.metric("🟡 Perguntas de condução (direcionadoras)", meta["prompts_yellow"])
+        c3.metric("🔴 Modelagem breve", meta["prompts_red"])
+        c4.metric("Reformulação", f"{meta['reformulations']}/1")
+
+        st.divider()
+
+        eval_clues = card.eval_clues
+        int_clues = card.intervention_clues
+
+        st.write("Pistas neutras (Avaliação):")
+        st.write(" • ".join(eval_clues) if eval_clues else "—")
+
+        st.write("Pistas para Intervenção (se aplicável):")
+        st.write(" • ".join(int_clues) if int_clues else "—")
+
+        questions = get_default_conduction_questions()
+        green = questions["green"]
+        yellow = questions["yellow"]
+
+        colg, coly, colr = st.columns(3)
+
+        with colg:
+            st.write("🟢 Pergunta de condução neutra")
+            st.selectbox("Selecionar", green, key=f"sel_g_{card_id}")
+            st.button("Registrar uso 🟢", key=f"btn_g_{card_id}", on_click=_register_use,
+                      args=(card_id, "prompts_green", "Pergunta de condução 🟢 registrada"))
+
+        with coly:
+            st.write("🟡 Pergunta de condução direcionadora")
+            st.selectbox("Selecionar", yellow, key=f"sel_y_{card_id}")
+            st.button("Registrar uso 🟡", key=f"btn_y_{card_id}", on_click=_register_use,
+                      args=(card_id, "prompts_yellow", "Pergunta de condução 🟡 registrada"))
+
+        with colr:
+            st.write("🔴 Modelagem breve (estrutura/resposta-modelo)")
+            action_text = card.action
+            phrase_text = card.phrase
+
+            if is_eval and not meta["red_unlocked"]:
+                st.caption("Modo Avaliação: itens de modelagem ficam recolhidos por padrão.")
+                st.button("Liberar modelagem breve 🔴 (registrar uso)", key=f"unlock_red_{card_id}",
+                          on_click=_unlock_red, args=(card_id,))
+
+            if (not is_eval) or meta["red_unlocked"]:
+                st.write("Ação sugerida (para intervenção):")
+                st.write(action_text if action_text else "—")
+
+                st.write("Formulação sugerida (para intervenção):")
+                st.write(phrase_text if phrase_text else "—")
+
+                # (um abaixo do outro: colunas dentro de colunas dentro de colunas não são permitidas)
+                st.button("Registrar uso: ação 🔴", key=f"btn_red_action_{card_id}", on_click=_register_use,
+                          args=(card_id, "prompts_red", "Uso de modelagem (ação) 🔴 registrado"))
+                st.button("Registrar uso: formulação 🔴", key=f"btn_red_phrase_{card_id}", on_click=_register_use,
+                          args=(card_id, "prompts_red", "Uso de modelagem (formulação) 🔴 registrado"))
+
+        st.divider()
+
+        st.write("Reformulação (limite 1):")
+        if meta["reformulations"] < 1:
+            st.button("Registrar 1 reformulação", key=f"btn_ref_{card_id}", on_click=_register_use,
+                      args=(card_id, "reformulations", "Reformulação registrada"))
+        else:
+            st.caption("Limite atingido. Siga com perguntas de condução graduadas.")
+
+        st.divider()
+
+        st.write("Classificação da resposta do paciente:")
+        meta["response_class"] = st.radio(
+            "Marcar como:",
+            ["Alvo", "Parcial", "Alternativa válida", "Inadequada"],
+            index=["Alvo", "Parcial", "Alternativa válida", "Inadequada"].index(meta.get("response_class", "Alvo")),
+            key=f"resp_class_{card_id}"
+        )
+
+        if meta["response_class"] == "Alternativa válida":
+            meta["alt_logic"] = st.text_input(
+                "Qual foi a lógica? (curto)",
+                value=meta.get("alt_logic", ""),
+                key=f"alt_logic_{card_id}"
+            )
+            meta["alt_diff"] = st.text_input(
+                "Em que difere do alvo? (curto)",
+                value=meta.get("alt_diff", ""),
+                key=f"alt_diff_{card_id}"
+            )
+
+        if card.needs_adult:
+            st.warning(f"Encaminhamento sugerido: {card.adult_type or 'adulto responsável'}")
+
+@fragment
+def render_scoring(card_id: int, hint_level: int):
+    """Sliders de pontuação + "Salvar tentativa desta carta"."""
+    settle_pending_writes()   # idem: tentativas que passaram de WRITE_WAIT_S em cliques anteriores
+    st.subheader("Pontuação")
+    detection = st.slider("Detecção (0–2)", 0, 2, 0)
+    clues_score = st.slider("Pistas (0–2)", 0, 2, 0)
+    cog = st.slider("Empatia cognitiva (0–2)", 0, 2, 0)
+    action = st.slider("Ação (0–3)", 0, 3, 0)
+    comm = st.slider("Comunicação (0–1)", 0, 1, 0)
+    safety = st.slider("Segurança/Encaminhamento (0–2)", 0, 2, 0)
+
+    total = total_score(detection, clues_score, cog, action, comm, safety)
+    st.metric("Total", total)
+
+    note = st.text_area("Observação clínica (opcional)", height=80)
+
+    if st.button("Salvar tentativa desta carta"):
+        meta = init_attempt_meta(card_id)
+
+        attempt = dict(
+            card_id=int(card_id),
+            hint_level=int(hint_level),
+            detection=int(detection),
+            clues=int(clues_score),
+            cog_empathy=int(cog),
+            action=int(action),
+            communication=int(comm),
+            safety=int(safety),
+            total=int(total),
+            notes=note.strip(),
+
+            # ✅ mantém nomes no DB por compatibilidade
+            prompts_green=int(meta["prompts_green"]),
+            prompts_yellow=int(meta["prompts_yellow"]),
+            prompts_red=int(meta["prompts_red"]),
+            reformulations=int(meta["reformulations"]),
+            response_class=meta.get("response_class", "Alvo"),
+            alt_logic=meta.get("alt_logic", ""),
+            alt_diff=meta.get("alt_diff", "")
+        )
+        try:
+            record = AttemptRecord.from_dict(attempt)
+        except ValueError as e:
+            st.error(f"Tentativa inválida: {e}")
+            return
+        st.session_state.session_attempts[card_id] = attempt
+
+        session_id = draft_session_id()
+        if session_id is None:
+            st.success("Tentativa salva (nesta sessão).")
+            return
+        submit_write(
+            lambda conn: drafts.record_attempt(conn, session_id, record),
+            success=lambda _: "Tentativa salva (rascunho gravado).",
+            failure="Falha ao gravar a tentativa no rascunho (mantida nesta sessão)",
+        )
@@ -0,0 +1,47 @@
+import os
+
+import streamlit as st
+
+from clinic import static_assets
+from ui.assets import get_static_manifest, img_html
+
+# =========================
+# Dev mode (oculta ferramentas)
+# =========================
+DEV_MODE = os.getenv("DEV_MODE", "0").strip() == "1"
+
+# =========================
+# Branding (logo na sidebar)
+# =========================
+LOGO_WIDTH = 260  # ajuste aqui (ex.: 240, 260, 280)
+
+def render_sidebar_logo():
+    # 🔒 botão dev escondido (só aparece se DEV_MODE=1)
+    if DEV_MODE:
+        if st.sidebar.button("🔄 Recarregar cartas"):
+            # só o catálogo compilado e o índice do baralho: pool, escritor único e
+            # job de calibração (também cache_resource) continuam os mesmos
+            from ui.cards import load_catalog, load_deck_index
+            load_catalog.clear()
+            load_deck_index.clear()
+            st.rerun()
+
+    st.sidebar.markdown("<div style='height: 6px;'></div>", unsafe_allow_html=True)
+
+    # ✅ URL estática com hash (cache do navegador) em vez de base64 a cada rerun
+    logo = static_assets.logo_asset(get_static_manifest())
+    if logo:
+        img = img_html(logo.url, "Tecnoneuro",
+                       f"width:{LOGO_WIDTH}px; max-width:100%; height:auto; display:inline-block;")
+        st.sidebar.markdown(
+            f'<div style="text-align:center; padding-top:0px; padding-bottom:8px;">{img}</div>',
+            unsafe_allow_html=True
+        )
+
+    st.sidebar.markdown("---")
+
+def render_navigation(pages):
+    """Links das páginas logo abaixo do logo (o menu padrão do st.navigation fica no topo)."""
+    st.sidebar.title("Navegação")
+    for page in pages:
+        st.sidebar.page_link(page)
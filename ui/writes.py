@@ -0,0 +1,120 @@
+"""
+Gravações do app pela fila do escritor único (clinic.write_queue).
+
+submit_write() agenda o job e espera a confirmação só por WRITE_WAIT_S. Se o
+commit demorar mais (fila cheia no fim do dia), a página segue normalmente e
+a confirmação chega depois, por toast, via render_pending_writes() — um
+fragmento que confere as gravações pendentes a cada segundo — ou no próximo
+clique dos fragmentos da Sessão (settle_pending_writes()).
+submit_background() nem espera: para o diário do rascunho (clinic.drafts),
+que só avisa se der erro. get_calibrator() põe a calibração das cartas na
+mesma fila, periodicamente.
+"""
+import os
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Callable
+
+import streamlit as st
+
+from clinic.write_queue import PeriodicJob, WriteQueue
+from ui.services import DB_PATH, get_pool
+
+WRITE_WAIT_S = float(os.getenv("WRITE_WAIT_S", "0.25"))
+
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+@st.cache_resource(show_spinner=False)
+def get_writer():
+    get_pool()  # migrações aplicadas antes do escritor abrir a conexão dele
+    return WriteQueue(DB_PATH)
+
+# CALIBRATION_INTERVAL_S: intervalo do job de calibração das cartas (0 = só via tools/calibrate_cards.py)
+CALIBRATION_INTERVAL_S = float(os.getenv("CALIBRATION_INTERVAL_S", "600"))
+# 1ª rodada só depois disso: não disputa o processo com o primeiro carregamento das páginas
+CALIBRATION_DELAY_S = 30.0
+
+def _calibration_batch(conn) -> bool:
+    # importado aqui, na thread do escritor: o NumPy não entra no rerun das páginas
+    from clinic import calibration
+
+    return calibration.calibrate(conn) == calibration.BATCH
+
+@st.cache_resource(show_spinner=False)
+def get_calibrator():
+    """Calibração das cartas (clinic.calibration) na fila do escritor, um lote por job; uma por processo."""
+    if CALIBRATION_INTERVAL_S <= 0:
+        return None
+    return PeriodicJob(get_writer(), _calibration_batch, CALIBRATION_INTERVAL_S, delay=CALIBRATION_DELAY_S,
+                       name="clinic-calibration")
+
+@dataclass
+class PendingWrite:
+    future: Future
+    success: Callable | None   # resultado do job -> mensagem (None = silencioso)
+    failure: str               # prefixo da mensagem de erro
+    on_failure: Callable | None = None   # exceção -> None (ex.: devolver dados à tela)
+
+def _settle(p: PendingWrite, deferred: bool) -> bool:
+    error = p.future.exception()
+    if error is None:
+        if p.success:
+            msg = p.success(p.future.result())
+            if deferred:
+                st.toast(msg, icon="✅")
+            else:
+                st.success(msg)
+        return True
+    if p.on_failure:
+        p.on_failure(error)
+    msg = f"{p.failure}: {error}"
+    if deferred:
+        st.toast(msg, icon="❌")
+    else:
+        st.error(msg)
+    return False
+
+def submit_write(job, success: Callable, failure: str = "Falha ao gravar", on_failure: Callable | None = None):
+    """
+    Agenda `job(conn)` (ver writer.insert_*). Devolve True (gravado), False
+    (falhou; erro já exibido) ou None (ainda na fila; confirmação por toast).
+    """
+    pending = PendingWrite(get_writer().submit(job), success, failure, on_failure)
+    try:
+        pending.future.exception(timeout=WRITE_WAIT_S)
+    except FutureTimeout:
+        st.session_state.setdefault("pending_writes", []).append(pending)
+        st.info("Gravando em segundo plano… a confirmação aparece em instantes.")
+        return None
+    return _settle(pending, deferred=False)
+
+def submit_background(job, failure: str = "Falha ao gravar"):
+    """Agenda `job(conn)` sem esperar; sucesso é silencioso, erro vira toast."""
+    pending = PendingWrite(get_writer().submit(job), None, failure)
+    st.session_state.setdefault("pending_writes", []).append(pending)
+
+def settle_pending_writes() -> int:
+    """
+    Avisa (toast) as gravações pendentes que já terminaram, sem esperar as
+    demais. Os fragmentos da Sessão chamam no fim: os reruns deles não passam
+    pelo app.py. Retorna quantas continuam na fila.
+    """
+    still = []
+    for p in st.session_state.get("pending_writes", []):
+        if p.future.done():
+            _settle(p, deferred=True)
+        else:
+            still.append(p)
+    st.session_state.pending_writes = still
+    return len(still)
+
+@fragment(run_every=1)
+def _poll_pending_writes():
+    still = settle_pending_writes()
+    if still:
+        st.caption(f"⏳ {still} gravação(ões) na fila")
+
+def render_pending_writes():
+    """Chamado no fim de cada rerun (app.py); só cria o fragmento se há pendências."""
+    if st.session_state.get("pending_writes"):
+        _poll_pending_writes()
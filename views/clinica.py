@@ -0,0 +1,90 @@
+import streamlit as st
+
+from clinic import cohort
+from clinic import report_cache
+from clinic.analytics import DOMAIN_LABELS
+from clinic.profiling import stage
+from ui.cards import cards_mtime, require_catalog
+from ui.services import get_conn, get_report_cache
+
+st.title("Visão da clínica")
+st.caption("Todos os pacientes, agregados no banco: só os totais por grupo e por mês saem do SQLite.")
+
+catalog = require_catalog(cards_mtime())
+
+# =========================
+# Filtros
+# =========================
+f1, f2, f3 = st.columns(3)
+age_groups = f1.multiselect("Faixa etária", cohort.AGE_GROUPS, placeholder="Todas")
+modes = f2.multiselect("Modo", cohort.MODES, placeholder="Todos")
+card_ids = f3.multiselect(
+    "Cartas", catalog.ids, placeholder="Todas",
+    format_func=lambda cid: f"{cid} — {catalog.get(cid).title}",
+)
+d1, d2, d3 = st.columns(3)
+date_from = d1.date_input("De", value=None, format="DD/MM/YYYY", key="coorte_de")
+date_to = d2.date_input("Até", value=None, format="DD/MM/YYYY", key="coorte_ate")
+dim = d3.selectbox("Agrupar por", list(cohort.DIMENSIONS), format_func=lambda d: cohort.DIMENSIONS[d][0])
+
+flt = cohort.CohortFilter(tuple(age_groups), tuple(modes), tuple(card_ids), date_from, date_to)
+
+# ✅ em cache pela versão da clínica: refaz o GROUP BY só depois de uma sessão gravada
+cache = get_report_cache()
+with get_conn() as conn:
+    with stage("sql: versão da clínica"):
+        version = report_cache.get_version(conn, report_cache.CLINIC)
+    with stage("cache: coorte"), st.spinner("Calculando…"):
+        groups = cache.get_or_load(flt.cache_name(dim), report_cache.CLINIC, version,
+                                   lambda: cohort.by_group(conn, dim, flt))
+        months = cache.get_or_load(flt.cache_name("month_series"), report_cache.CLINIC, version,
+                                   lambda: cohort.by_month(conn, flt))
+
+if groups.empty:
+    st.info("Nenhuma tentativa com esses filtros.")
+    st.stop()
+
+# =========================
+# Por grupo
+# =========================
+label = cohort.DIMENSIONS[dim][0]
+table = groups.rename(columns={"grupo": label, **DOMAIN_LABELS})
+if dim == "card_id":
+    table.insert(1, "Título", [getattr(catalog.get(cid), "title", "—") for cid in groups["grupo"]])
+
+st.subheader(f"Por {label.lower()}")
+with stage("render: coorte"):
+    st.dataframe(
+        table.round(2), hide_index=True, use_container_width=True,
+        column_config={
+            "pacientes": "Pacientes", "sessoes": "Sessões", "tentativas": "Tentativas",
+            "pct_tentativas": "% das tentativas", "media_total": "Total médio",
+            "media_dicas": "Dicas (média)", "pct_conducao": "% com condução",
+            "pct_alt_valida": "% Alternativa válida",
+        },
+    )
+    st.bar_chart(groups.set_index(groups["grupo"].astype(str))["media_total"].rename("Total médio"))
+
+# =========================
+# Por mês
+# =========================
+st.subheader("Por mês")
+if len(months) < 2:
+    st.caption("A série mensal aparece a partir do 2º mês com tentativas.")
+else:
+    with stage("render: série mensal"):
+        series = months.set_index("mes")
+        st.caption("Total médio por tentativa — mês a mês e média móvel de 3 meses.")
+        st.line_chart(series[["media_total", "media_total_movel"]].set_axis(["Mensal", "Média móvel (3 meses)"],
+                                                                              axis=1))
+        st.caption("% das tentativas com alguma pergunta de condução — média móvel de 3 meses.")
+        st.line_chart(series["pct_conducao_movel"].rename("% com condução"))
+        st.dataframe(
+            months.round(2), hide_index=True, use_container_width=True,
+            column_config={
+                "mes": "Mês", "pacientes": "Pacientes", "tentativas": "Tentativas",
+                "media_total": "Total médio", "media_total_movel": "Total (média móvel)",
+                "pct_conducao": "% com condução", "pct_conducao_movel": "% com condução (média móvel)",
+                "tentativas_acumuladas": "Tentativas acumuladas",
+            },
+        )
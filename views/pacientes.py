@@ -0,0 +1,35 @@
+import streamlit as st
+
+from clinic.writer import insert_client
+from ui.patients import patient_picker
+from ui.writes import submit_write
+
+st.title("Pacientes")
+
+st.subheader("Criar novo paciente")
+col1, col2 = st.columns(2)
+with col1:
+    nickname = st.text_input("Apelido/código (evite dados sensíveis)")
+    age_group = st.selectbox("Faixa", ["crianca", "adolescente", "adulto"])
+with col2:
+    notes = st.text_area("Observações (opcional)", height=100)
+
+if st.button("Criar paciente"):
+    if nickname.strip():
+        # ✅ pela fila do escritor único (ui/writes.py): sem disputa de lock com outras sessões
+        submit_write(
+            lambda conn: insert_client(conn, nickname, age_group, notes),
+            success=lambda client_id: f"Paciente criado! (#{client_id})",
+            failure="Falha ao criar paciente",
+        )
+    else:
+        st.warning("Digite um apelido/código.")
+
+st.divider()
+st.subheader("Selecionar paciente ativo")
+
+choice = patient_picker("Paciente ativo:", key="pac_picker",
+                        default_id=st.session_state.get("active_client_id"))
+if choice is not None:
+    st.session_state.active_client_id = choice
+    st.write("Paciente ativo:", st.session_state.active_client_id)
@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import weakref
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from clinic import analytics
+from clinic import export
+from clinic import queries as q
+from clinic import report_cache
+from clinic import summary
+from clinic.profiling import stage
+from ui.patients import patient_picker
+from ui.services import get_conn, get_report_cache
+
+EXPORT_ROOT = os.path.join(tempfile.gettempdir(), "detective-ajuda-exports")
+
+class _SessionExportDir:
+    """Pasta só desta sessão do navegador (sobras de um rerun interrompido somem com a sessão)."""
+    def __init__(self):
+        os.makedirs(EXPORT_ROOT, exist_ok=True)
+        self.path = tempfile.mkdtemp(dir=EXPORT_ROOT)
+        weakref.finalize(self, shutil.rmtree, self.path, True)
+
+def render_export(basename: str, source, key: str):
+    """
+    Exporta em streaming para um arquivo temporário desta sessão (memória
+    constante). O download aparece só no rerun de "Preparar arquivo": o
+    st.download_button (1.36) lê o arquivo inteiro a cada rerun em que é
+    desenhado, então ele não fica na tela para ser relido a cada interação —
+    o arquivo é apagado logo depois de entregue ao botão.
+    `source(conn)` devolve (colunas, blocos de linhas).
+    """
+    fmt = st.radio("Formato", list(export.FORMATS), horizontal=True, format_func=str.upper, key=f"{key}_fmt")
+    if not st.button("Preparar arquivo", key=f"{key}_build"):
+        return
+
+    if "export_dir" not in st.session_state:
+        st.session_state.export_dir = _SessionExportDir()
+    path = os.path.join(st.session_state.export_dir.path, f"{key}.{fmt}")
+    try:
+        with get_conn() as conn:
+            columns, chunks = source(conn)
+            n = export.write_file(columns, chunks, path, fmt)
+        st.caption(f"{n} tentativas exportadas. O botão some na próxima interação.")
+        with open(path, "rb") as f:
+            st.download_button(
+                f"Baixar {fmt.upper()} (gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')})", f,
+                file_name=f"{basename}.{fmt}", mime=export.FORMATS[fmt], key=f"{key}_download",
+            )
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+st.title("Relatórios")
+
+with st.expander("Exportação da clínica (todos os pacientes)"):
+    cd1, cd2 = st.columns(2)
+    date_from = cd1.date_input("De", value=None, format="DD/MM/YYYY")
+    date_to = cd2.date_input("Até", value=None, format="DD/MM/YYYY")
+    render_export(
+        f"clinica_{date_from or 'inicio'}_{date_to or 'hoje'}",
+        lambda conn: export.clinic_attempts(conn, date_from, date_to),
+        key="export_clinic",
+    )
+
+client_id = patient_picker("Escolha o paciente", key="rel_picker",
+                           default_id=st.session_state.get("active_client_id"))
+if client_id is None:
+    st.stop()
+
+# ✅ tabela do paciente em cache por (client_id, versão): refaz o JOIN só depois de uma gravação
+with get_conn() as conn:
+    with stage("sql: versão do paciente"):
+        version = report_cache.get_version(conn, client_id)
+    with stage("cache: tentativas do paciente"):
+        df_att = get_report_cache().get_or_load(
+            "client_attempts", client_id, version,
+            lambda: pd.read_sql_query(q.CLIENT_ATTEMPTS, conn, params=(client_id,)),
+        )
+
+if df_att.empty:
+    st.info("Sem tentativas ainda para este paciente.")
+    st.stop()
+
+# ✅ Resumo vem das tabelas agregadas (1 linha por paciente), não do histórico inteiro
+with get_conn() as conn, stage("sql: resumo"):
+    resumo = summary.get_client_summary(conn, client_id)
+    dominios = summary.get_domain_summary(conn, client_id)
+
+st.subheader("Resumo")
+if resumo:
+    st.write("Tentativas:", resumo["n_attempts"])
+    st.write("Média total:", round(resumo["mean_total"], 2))
+    st.write("Média de dicas (nível selecionado):", round(resumo["mean_hint_level"], 2))
+    st.write("Média de modelagem breve (🔴):", round(resumo["mean_prompts_red"], 2))
+    st.write("% Alternativa válida:", round(resumo["pct_alt_valid"], 1), "%")
+if dominios:
+    st.dataframe(pd.DataFrame(dominios).round(2), hide_index=True)
+
+# ✅ evolução por sessão: vetorizado (clinic.analytics) e em cache na mesma versão do df_att
+st.subheader("Evolução")
+cache = get_report_cache()
+with stage("cache: evolução"):
+    trends = cache.get_or_load("session_trends", client_id, version, lambda: analytics.session_trends(df_att))
+    dependence = cache.get_or_load("prompt_dependence", client_id, version,
+                                   lambda: analytics.prompt_dependence(df_att))
+
+if len(trends) < 2:
+    st.caption("A evolução aparece a partir da 2ª sessão salva.")
+else:
+    with stage("render: evolução"):
+        st.caption(f"Domínios em % do máximo — média móvel de {analytics.ROLLING_WINDOW} sessões "
+                   f"({len(trends)} sessões).")
+        st.line_chart(analytics.trend_chart(trends))
+        st.dataframe(analytics.domain_slopes(trends).round(2), hide_index=True,
+                     column_config={"pp_por_sessao": "Tendência (p.p./sessão)"})
+        st.caption("Perguntas de condução × desempenho: total médio (% do máximo) por nº de usos na tentativa.")
+        st.line_chart(dependence)
+        st.caption(f"% das tentativas com alguma pergunta de condução — média móvel de "
+                   f"{analytics.ROLLING_WINDOW} sessões.")
+        st.line_chart(trends["pct_conducao_movel"].rename("% com condução"))
+
+st.subheader("Tabela")
+with stage("render: tabela"):
+    st.dataframe(df_att, use_container_width=True)
+
+st.subheader("Exportar")
+render_export(
+    f"relatorio_tentativas_{client_id}",
+    lambda conn: export.client_attempts(conn, client_id),
+    key="export_client",
+)
@@ -0,0 +1,179 @@
+import streamlit as st
+
+from clinic import drafts
+from clinic import queries as q
+from clinic.prefetch import neighbours
+from clinic.profiling import stage
+from clinic.writer import AttemptRecord, SessionRecord, insert_session
+from ui.cards import (
+    card_image_key, card_image_url, cards_mtime, get_calibration, get_card_prefetcher, load_deck_index,
+    require_catalog,
+)
+from ui.assets import get_static_manifest, img_html, preload_html
+from ui.services import get_conn
+from ui.session import (
+    calibration_caption, render_deck_builder, render_draft_recovery, render_scoring, render_therapist_box,
+    reset_draft_state,
+)
+from ui.writes import get_calibrator, submit_write
+from ui.sidebar import DEV_MODE
+
+st.title("Sessão")
+
+# ✅ só esta página compila o catálogo de cartas
+mtime = cards_mtime()
+catalog = require_catalog(mtime)
+
+if DEV_MODE and catalog.warnings:
+    with st.sidebar.expander(f"⚠ cards.json: {len(catalog.warnings)} avisos"):
+        for w in catalog.warnings:
+            st.caption(w)
+
+if "active_client_id" not in st.session_state:
+    st.warning("Selecione um paciente em 'Pacientes'.")
+    st.stop()
+
+client_id = st.session_state.active_client_id
+with get_conn() as conn, stage("sql: paciente"):
+    client_row = conn.execute(q.CLIENT_NICKNAME, (client_id,)).fetchone()
+if client_row is None:
+    st.warning("Paciente não encontrado.")
+    st.stop()
+
+client_name = client_row[0]
+st.caption(f"Paciente ativo: #{client_id} — {client_name}")
+
+MODES = ["treino_guiado", "treino_independente", "avaliacao"]
+
+# ✅ sessão não finalizada no banco (queda/reconexão): retomar ou descartar
+render_draft_recovery(int(client_id), catalog.ids, MODES)
+
+mode = st.selectbox("Modo", MODES, key="session_mode")
+hint_level = st.selectbox("Nível de dicas usado nesta tentativa", [0, 1, 2, 3], index=0)
+
+st.subheader("Escolher cartas da sessão")
+
+if "deck_ids" not in st.session_state:
+    st.session_state.deck_ids = catalog.ids[:10]
+
+# ✅ calibração empírica das cartas: job em segundo plano (ou tools/calibrate_cards.py);
+# aqui só a tabela pronta. Fica fora do format_func do multiselect "Cartas (IDs)":
+# rótulo novo = widget novo, e o baralho escolhido seria zerado a cada rodada do job.
+get_calibrator()
+calib = get_calibration()
+
+with st.expander("Montar baralho por filtros"):
+    with stage("render_deck_builder"):
+        render_deck_builder(load_deck_index(mtime), catalog, calib)
+
+selected_ids = st.multiselect(
+    "Cartas (IDs)",
+    options=catalog.ids,
+    key="deck_ids"
+)
+
+if not selected_ids:
+    st.info("Selecione pelo menos uma carta.")
+    st.stop()
+
+if "session_idx" not in st.session_state:
+    st.session_state.session_idx = 0
+# baralho pode ter encolhido desde o último rerun
+st.session_state.session_idx = min(st.session_state.session_idx, len(selected_ids) - 1)
+if "session_attempts" not in st.session_state:
+    st.session_state.session_attempts = {}
+
+max_idx = len(selected_ids) - 1
+colA, colB, colC = st.columns([1, 1, 2])
+with colA:
+    if st.button("⬅️ Anterior") and st.session_state.session_idx > 0:
+        st.session_state.session_idx -= 1
+with colB:
+    if st.button("➡️ Próxima") and st.session_state.session_idx < max_idx:
+        st.session_state.session_idx += 1
+with colC:
+    st.write(f"Carta {st.session_state.session_idx + 1} de {len(selected_ids)}")
+
+current_id = selected_ids[st.session_state.session_idx]
+card = catalog.get(current_id)
+
+# ✅ servidor só publica o derivado em static/ (vizinhas em segundo plano);
+# o navegador baixa cada carta uma vez e as vizinhas já publicadas ficam pré-carregadas
+prefetcher = get_card_prefetcher()
+manifest = get_static_manifest()
+with stage("card_image"):
+    card_url = prefetcher.get(card_image_key(card, mtime), lambda: card_image_url(card, manifest))
+near = [catalog.get(cid) for cid in neighbours(selected_ids, st.session_state.session_idx)]
+prefetcher.prefetch({card_image_key(c, mtime): (lambda c=c: card_image_url(c, manifest)) for c in near})
+near_urls = [u for u in (prefetcher.cache.get(card_image_key(c, mtime)) for c in near) if u]
+st.divider()
+
+left, right = st.columns([3, 1])
+
+with left:
+    st.subheader(f"Carta {current_id} — {card.title}")
+    st.caption(calibration_caption(card, calib))
+
+    if card_url:
+        with stage("render: imagem"):
+            st.markdown(img_html(card_url, card.title) + preload_html(near_urls), unsafe_allow_html=True)
+    else:
+        st.warning(f"Imagem não encontrada: {card.image}")
+
+    with stage("render_therapist_box"):
+        render_therapist_box(card, is_eval=(mode == "avaliacao"))
+
+with right:
+    with stage("render_scoring"):
+        render_scoring(int(current_id), int(hint_level))
+
+st.divider()
+st.subheader("Finalizar sessão")
+session_notes = st.text_area("Notas da sessão (opcional)", height=100)
+
+if st.button("✅ Salvar sessão"):
+    if len(st.session_state.session_attempts) == 0:
+        st.warning("Você ainda não salvou nenhuma tentativa.")
+        st.stop()
+
+    saved_attempts = dict(st.session_state.session_attempts)
+    session_id = st.session_state.get("draft_session_id")
+
+    if session_id is not None:
+        # ✅ tentativas já estão no diário: só finaliza o rascunho. As da tela que
+        # não chegaram lá (rascunho aberto depois, gravação que falhou) entram junto.
+        def job(conn):
+            return drafts.finalize(conn, session_id, mode, session_notes, saved_attempts)
+    else:
+        # rascunho não pôde ser aberto: grava tudo de uma vez, a partir da tela
+        try:
+            record = SessionRecord(
+                client_id=int(client_id),
+                mode=mode,
+                session_notes=session_notes,
+                attempts=tuple(AttemptRecord.from_dict(att) for att in saved_attempts.values()),
+            )
+        except ValueError as e:
+            st.error(f"Tentativa inválida: {e}")
+            st.stop()
+
+        def job(conn):
+            return insert_session(conn, record)
+
+    def restore_attempts(error):
+        # gravação falhou depois que a tela já tinha seguido: as tentativas (e o rascunho) voltam
+        st.session_state.session_attempts = {**saved_attempts, **st.session_state.get("session_attempts", {})}
+        if session_id is not None:
+            st.session_state.draft_session_id = session_id
+            st.session_state.draft_client_id = int(client_id)
+
+    status = submit_write(
+        job,
+        success=lambda sid: f"Sessão salva! (ID {sid})",
+        failure="Falha ao salvar a sessão (tentativas mantidas)",
+        on_failure=restore_attempts,
+    )
+    if status is not False:
+        # ✅ limpa metas/rascunho da sessão para não carregar contadores antigos
+        reset_draft_state()
+        st.session_state.draft_checked = int(client_id)